@@ -8,7 +8,9 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from services.deadline import DeadlineExceeded
 from services.llm_client import LLMClient
+from services.metrics import record_fallback
 from services.vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
@@ -37,7 +39,9 @@ class ComplianceSME:
             question: User question
 
         Returns:
-            Dict with 'answer', 'sources', 'confidence', 'disclaimer' keys
+            Dict with 'answer', 'sources', 'confidence', 'disclaimer' keys, plus
+            'degraded' if the request deadline passed before the LLM answered
+            and the answer only lists the relevant documents
         """
         logger.info(f"Processing compliance question: {question[:50]}...")
 
@@ -69,15 +73,19 @@ Question: {question}
 
 Provide a clear, factual answer based only on the provided documents. If the documents don't contain enough information, say so."""
 
-            answer = self.llm_client.generate(
-                prompt=prompt,
-                temperature=0.3,  # Low temperature for factual responses
-                system_prompt="You are a compliance expert assistant. Provide accurate, factual answers based on the provided documents."
-            )
+            try:
+                answer = self.llm_client.generate(
+                    prompt=prompt,
+                    temperature=0.3,  # Low temperature for factual responses
+                    system_prompt="You are a compliance expert assistant. Provide accurate, factual answers based on the provided documents."
+                )
+            except DeadlineExceeded as e:
+                logger.warning(f"No answer before the request deadline, returning sources only: {e}")
+                record_fallback("compliance_sources_only")
+                return self._create_sources_only_response(retrieved_docs)
 
             # Calculate confidence (simple heuristic based on retrieval distance)
-            avg_distance = sum(doc.get("distance", 1.0) for doc in retrieved_docs) / len(retrieved_docs)
-            confidence = "high" if avg_distance < 0.3 else "medium" if avg_distance < 0.6 else "low"
+            confidence = self._confidence(retrieved_docs)
 
             result = {
                 "answer": answer,
@@ -100,6 +108,30 @@ Provide a clear, factual answer based only on the provided documents. If the doc
                 "error": str(e),
             }
 
+    @staticmethod
+    def _confidence(retrieved_docs: List[Dict]) -> str:
+        avg_distance = sum(doc.get("distance", 1.0) for doc in retrieved_docs) / len(retrieved_docs)
+        return "high" if avg_distance < 0.3 else "medium" if avg_distance < 0.6 else "low"
+
+    def _create_sources_only_response(self, retrieved_docs: List[Dict]) -> Dict:
+        """Create a response listing the retrieved passages when there is no time for the LLM."""
+        excerpts = []
+        source_names = []
+        for doc in retrieved_docs:
+            if doc["document_name"] not in source_names:
+                source_names.append(doc["document_name"])
+            text = " ".join(doc["text"].split())
+            excerpts.append(f"- {doc['document_name']}: {text[:300]}{'...' if len(text) > 300 else ''}")
+        return {
+            "answer": "I couldn't prepare a full answer in time. These documents look most relevant:\n\n"
+            + "\n".join(excerpts),
+            "sources": source_names,
+            "confidence": self._confidence(retrieved_docs),
+            "disclaimer": "Internal guidance only. Not legal advice.",
+            "retrieved_count": len(retrieved_docs),
+            "degraded": True,
+        }
+
     def _create_fallback_response(self, question: str) -> Dict:
         """Create fallback response when no documents found."""
         return {
@@ -1,17 +1,28 @@
 """NewsBot agent for daily news summaries."""
 
+import contextvars
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from services import deadline
+from services.article_store import ArticleStore
+from services.digest_history import DigestHistory
 from services.llm_client import LLMClient
+from services.lark_bot import LarkBot
 from services.lark_client import LarkClient
+from services.lark_dispatcher import PRIORITY_NORMAL
 from services.news_fetcher import NewsFetcher
+from services.metrics import NEWSBOT_PROMPT_TOKENS, record_fallback
+from services.prompt_builder import PromptBuilder, story_line, story_sources
+from services.summarizer import MapReduceSummarizer
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -20,7 +31,15 @@ logger = logging.getLogger(__name__)
 class NewsBot:
     """Agent that fetches and summarizes news, then sends to Lark."""
 
-    def __init__(self, llm_client: LLMClient, lark_client: LarkClient, news_fetcher: NewsFetcher = None):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        lark_client: LarkClient,
+        news_fetcher: NewsFetcher = None,
+        lark_bot: Optional[LarkBot] = None,
+        article_store: Optional[ArticleStore] = None,
+        digest_history: Optional[DigestHistory] = None,
+    ):
         """
         Initialize NewsBot.
 
@@ -28,9 +47,17 @@ class NewsBot:
             llm_client: LLM client instance
             lark_client: Lark client instance
             news_fetcher: Optional news fetcher (will create one if not provided)
+            lark_bot: Optional Lark bot, required to broadcast to chat IDs
+            article_store: Optional article store, to summarize only stories new since the last digest
+            digest_history: Optional store that records every prepared digest
         """
         self.llm_client = llm_client
         self.lark_client = lark_client
+        self.lark_bot = lark_bot
+        self.article_store = article_store
+        self.digest_history = digest_history
+        self.summarizer = MapReduceSummarizer(llm_client)
+        self.prompt_builder = PromptBuilder()
         self.news_fetcher = news_fetcher or NewsFetcher(
             newsapi_key=settings.newsapi_key,
             newsdata_key=settings.newsdata_key
@@ -56,12 +83,14 @@ class NewsBot:
             if headlines:
                 logger.info(f"Fetched {len(headlines)} headlines for category: {category}")
                 return headlines
+            record_fallback("news_category")
         
         headlines = self.news_fetcher.fetch_combined(preferred_sources=preferred_sources)
 
         # Fallback to mock data if no real news fetched
         if not headlines:
             logger.warning("No real news fetched, using mock data")
+            record_fallback("news_mock_data")
             headlines = [
                 {
                     "title": "Global Markets Reach New Highs",
@@ -97,17 +126,26 @@ class NewsBot:
         """
         Summarize headlines using LLM.
 
+        Uses the map-reduce summarizer (one short call per category group, run
+        concurrently) unless NEWSBOT_MAP_REDUCE is off, in which case all
+        headlines go into a single long-form prompt.
+
         Args:
-            headlines: List of headline dicts
+            headlines: List of headline dicts, already compacted by the prompt builder
 
         Returns:
             Formatted markdown summary
+
+        Raises:
+            Exception: If the LLM call fails
         """
+        if settings.newsbot_map_reduce:
+            summary = self.summarizer.summarize(headlines)
+            logger.info("Generated news summary")
+            return summary
+
         # Format headlines for prompt
-        headlines_text = "\n".join([
-            f"- {h['title']} ({h['source']})"
-            for h in headlines
-        ])
+        headlines_text = "\n".join(story_line(h) for h in headlines)
 
         prompt = f"""Summarize the following news headlines into a concise daily news summary.
 
@@ -122,59 +160,235 @@ Format the summary as markdown with:
 
 Keep it factual, neutral, and 600-1200 words total."""
 
-        try:
-            summary = self.llm_client.generate(
-                prompt=prompt,
-                temperature=0.3,
-                system_prompt="You are a professional news summarizer. Provide factual, neutral summaries."
-            )
-            logger.info("Generated news summary")
-            return summary
-        except Exception as e:
-            logger.error(f"Error generating summary: {e}", exc_info=True)
-            # Fallback summary
-            return self._create_fallback_summary(headlines)
+        summary = self.llm_client.generate(
+            prompt=prompt,
+            temperature=0.3,
+            system_prompt="You are a professional news summarizer. Provide factual, neutral summaries."
+        )
+        logger.info("Generated news summary")
+        return summary
 
     def _create_fallback_summary(self, headlines: List[Dict[str, str]]) -> str:
         """Create a simple fallback summary if LLM fails."""
         date_str = datetime.now().strftime('%Y-%m-%d')
         summary = f"# Daily News Summary - {date_str}\n\n## Top Headlines\n\n"
         for h in headlines:
-            summary += f"- {h['title']} ({h['source']})\n"
+            summary += f"- {h['title']} ({story_sources(h)})\n"
         summary += "\n## Sources\n\n"
         for h in headlines:
             summary += f"- [{h['title']}]({h['url']}) - {h['source']}\n"
         return summary
 
+    def prepare(self, category: Optional[str] = None) -> Dict:
+        """
+        Fetch and summarize news without sending it.
+
+        Args:
+            category: Optional category filter
+
+        Returns:
+            Dict with 'summary', 'headlines', 'headlines_count', 'category',
+            'prepared_at', 'seen_until', 'degraded' (True if the LLM failed
+            or ran out of time and the fallback summary was used), 'prompt'
+            (token stats from the prompt builder) and 'timings' keys, plus
+            'history_id' if the digest was recorded in the history store
+        """
+        # Under a request deadline, fetching and summarizing leave time to send the result
+        reserve = settings.deadline_send_reserve_seconds
+        start = time.perf_counter()
+        with deadline.deadline(reserve=reserve):
+            headlines = self._fetch_news_headlines(category=category)
+        fetched = time.perf_counter()
+        seen_until = time.time()
+        headlines = self._only_new(headlines, category)
+
+        # Rank and trim stories into the prompt token budget
+        stories, prompt_stats = self.prompt_builder.fit(headlines)
+        NEWSBOT_PROMPT_TOKENS.observe(prompt_stats["input_tokens"])
+
+        degraded = False
+        try:
+            with deadline.deadline(reserve=reserve):
+                summary = self._summarize_headlines(stories)
+        except deadline.DeadlineExceeded as e:
+            logger.warning(f"Summary not ready before the request deadline, sending headlines only: {e}")
+            record_fallback("news_summary_deadline")
+            summary = self._create_fallback_summary(headlines)
+            degraded = True
+        except Exception as e:
+            logger.error(f"Error generating summary: {e}", exc_info=True)
+            record_fallback("news_summary")
+            summary = self._create_fallback_summary(headlines)
+            degraded = True
+
+        prepared = {
+            "summary": summary,
+            "headlines": headlines,
+            "headlines_count": len(headlines),
+            "category": category,
+            "prepared_at": datetime.now().isoformat(),
+            "seen_until": seen_until,
+            "degraded": degraded,
+            "prompt": prompt_stats,
+            "timings": {
+                "fetch_seconds": round(fetched - start, 3),
+                "summarize_seconds": round(time.perf_counter() - fetched, 3),
+            },
+        }
+        self._record_history(prepared)
+        return prepared
+
+    def _record_history(self, prepared: Dict) -> None:
+        """Append a prepared digest to the history store, if there is one."""
+        if not self.digest_history:
+            return
+        try:
+            prepared["history_id"] = self.digest_history.append(prepared, self._scope(prepared["category"]))
+        except Exception as e:
+            logger.error(f"Error recording digest history: {e}", exc_info=True)
+
+    @staticmethod
+    def _scope(category: Optional[str]) -> str:
+        return category or "general"
+
+    def _only_new(self, headlines: List[Dict[str, str]], category: Optional[str]) -> List[Dict[str, str]]:
+        """Keep only headlines first seen after the last scheduled digest for this category."""
+        if not self.article_store or not settings.newsbot_only_new_articles:
+            return headlines
+        try:
+            fresh = self.article_store.new_since_last_digest(headlines, self._scope(category))
+        except Exception as e:
+            logger.error(f"Error filtering seen articles: {e}", exc_info=True)
+            return headlines
+        if not fresh:
+            # Better to repeat stories than to send an empty digest
+            logger.info("No new headlines since the last digest, using all fetched headlines")
+            record_fallback("news_no_new_articles")
+            return headlines
+        logger.info(f"{len(fresh)} of {len(headlines)} headlines are new since the last digest")
+        return fresh
+
+    def _mark_delivered(self, prepared: Dict) -> None:
+        """Record a delivered scheduled digest so its stories are not summarized again."""
+        if not self.article_store or "seen_until" not in prepared:
+            return
+        try:
+            self.article_store.mark_digest(self._scope(prepared.get("category")), prepared["seen_until"])
+            self.article_store.prune()
+        except Exception as e:
+            logger.error(f"Error recording delivered digest: {e}", exc_info=True)
+
+    def deliver(self, prepared: Dict, lark_client: Optional[LarkClient] = None, scheduled: bool = False) -> bool:
+        """
+        Send a prepared summary to Lark.
+
+        Args:
+            prepared: Result of `prepare`
+            lark_client: Webhook client to send with (defaults to the bot's own)
+            scheduled: Whether this is a scheduled digest; only those advance the
+                "only new articles" mark, so ad-hoc runs don't hide stories from the next one
+
+        Returns:
+            True if sent successfully
+        """
+        success = (lark_client or self.lark_client).send_markdown(prepared["summary"], title=self._title(prepared))
+        if success and scheduled:
+            self._mark_delivered(prepared)
+        return success
+
+    @staticmethod
+    def _title(prepared: Dict) -> str:
+        return f"Daily News Summary - {prepared['prepared_at'][:10]}"
+
+    def _webhook_client(self, webhook_url: str) -> LarkClient:
+        if webhook_url == self.lark_client.webhook_url:
+            return self.lark_client
+        # Clients are thin wrappers over the shared pooled HTTP client, so none are kept per URL
+        return LarkClient(webhook_url=webhook_url)
+
+    def broadcast(
+        self,
+        prepared: Dict,
+        chat_ids: Sequence[str] = (),
+        webhook_urls: Sequence[str] = (),
+        max_concurrency: Optional[int] = None,
+        scheduled: bool = False,
+    ) -> List[Dict]:
+        """
+        Send one prepared summary to many chats and webhooks concurrently.
+
+        Sends go through the Lark dispatcher, so per-chat and per-app rate
+        limits still apply; the pool only bounds how many wait at once.
+
+        Args:
+            prepared: Result of `prepare`
+            chat_ids: Lark chat IDs to send to via the bot
+            webhook_urls: Lark group webhooks to send to
+            max_concurrency: Max sends in flight (defaults to settings)
+            scheduled: Whether this is a scheduled digest (see `deliver`)
+
+        Returns:
+            One dict per target with 'target', 'type', 'success', 'latency_ms' keys
+        """
+        if chat_ids and self.lark_bot is None:
+            raise ValueError("Broadcasting to chat IDs requires a Lark bot")
+        card = LarkBot.build_card(prepared["summary"], title=self._title(prepared))
+
+        def send(target_type: str, target: str) -> Dict:
+            start = time.perf_counter()
+            try:
+                if target_type == "chat":
+                    success = self.lark_bot.send_card(card, chat_id=target, priority=PRIORITY_NORMAL) is not None
+                else:
+                    success = self.deliver(prepared, lark_client=self._webhook_client(target))
+            except Exception as e:
+                logger.error(f"Broadcast to {target_type} failed: {e}", exc_info=True)
+                success = False
+            return {
+                "target": target,
+                "type": target_type,
+                "success": success,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+
+        targets = [("chat", chat_id) for chat_id in chat_ids] + [("webhook", url) for url in webhook_urls]
+        if not targets:
+            return []
+        workers = min(len(targets), max_concurrency or settings.broadcast_max_concurrency)
+        # Send in copies of the caller's context so the request deadline and trace apply
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="newsbot-broadcast") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, send, *target) for target in targets]
+            results = [future.result() for future in futures]
+
+        delivered = sum(result["success"] for result in results)
+        if delivered and scheduled:
+            self._mark_delivered(prepared)
+        logger.info(f"Broadcast NewsBot summary to {delivered}/{len(results)} targets")
+        return results
+
     def run(self, category: Optional[str] = None) -> Dict:
         """
         Execute NewsBot workflow.
 
         Returns:
-            Dict with 'success', 'summary', 'headlines_count', 'timestamp' keys
+            Dict with 'success', 'summary', 'headlines_count', 'degraded', 'prompt_tokens', 'timestamp' keys
         """
         start_time = datetime.now()
         logger.info("Starting NewsBot run")
 
         try:
-            # Fetch headlines
-            headlines = self._fetch_news_headlines(category=category)
-
-            # Summarize
-            summary = self._summarize_headlines(headlines)
-
-            # Send to Lark
-            date_str = datetime.now().strftime('%Y-%m-%d')
-            title = f"Daily News Summary - {date_str}"
-            lark_success = self.lark_client.send_markdown(summary, title=title)
+            prepared = self.prepare(category=category)
+            lark_success = self.deliver(prepared)
 
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
 
             result = {
                 "success": lark_success,
-                "summary": summary,
-                "headlines_count": len(headlines),
+                "summary": prepared["summary"],
+                "headlines_count": prepared["headlines_count"],
+                "degraded": prepared["degraded"],
+                "prompt_tokens": prepared["prompt"]["input_tokens"],
                 "timestamp": datetime.now().isoformat(),
                 "duration_seconds": duration,
             }
@@ -0,0 +1,194 @@
+"""Application-scoped dependency container."""
+
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+from fastapi import Depends, Request
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Container:
+    """
+    Holds the application's shared components.
+
+    Each component is built once, on first access, and shared by every
+    endpoint, the Lark webhook and the scheduler. Component modules are
+    imported inside the accessors so that importing the app does not pull
+    in chromadb, the LLM SDKs or APScheduler.
+
+    Each component has its own build lock, so a slow factory (opening the
+    vector store, importing an SDK) only blocks callers of that component
+    and of components that depend on it.
+    """
+
+    def __init__(self):
+        """Initialize an empty container."""
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        logger.info("Initialized Container")
+
+    def _build_lock(self, name: str) -> threading.Lock:
+        with self._locks_lock:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.Lock()
+            return lock
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Return the named component, building it on first use."""
+        instance = self._instances.get(name)
+        if instance is None:
+            # Factories may build their dependencies, taking those components' locks;
+            # the dependency graph has no cycles, so this can't deadlock
+            with self._build_lock(name):
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = factory()
+                    self._instances[name] = instance
+        return instance
+
+    def is_built(self, name: str) -> bool:
+        """Check whether a component has been built yet."""
+        return name in self._instances
+
+    @property
+    def llm_client(self):
+        from services.llm_failover import create_llm_client
+        return self._get("llm_client", create_llm_client)
+
+    @property
+    def lark_client(self):
+        from services.lark_client import LarkClient
+        return self._get("lark_client", LarkClient)
+
+    @property
+    def lark_bot(self):
+        from services.lark_bot import LarkBot
+        return self._get("lark_bot", LarkBot)
+
+    @property
+    def embedding_service(self):
+        from services.embeddings import EmbeddingService
+        return self._get("embedding_service", EmbeddingService)
+
+    @property
+    def vector_store(self):
+        from services.vector_store import VectorStore
+        return self._get("vector_store", lambda: VectorStore(embedding_service=self.embedding_service))
+
+    @property
+    def article_store(self):
+        from services.article_store import ArticleStore
+        return self._get("article_store", ArticleStore)
+
+    @property
+    def digest_history(self):
+        """Digest history store, or None if DIGEST_HISTORY_ENABLED is off."""
+        if not settings.digest_history_enabled:
+            return None
+        from services.digest_history import DigestHistory
+        return self._get("digest_history", DigestHistory)
+
+    @property
+    def news_fetcher(self):
+        from services.news_fetcher import NewsFetcher
+        return self._get(
+            "news_fetcher",
+            lambda: NewsFetcher(
+                newsapi_key=settings.newsapi_key,
+                newsdata_key=settings.newsdata_key,
+                article_store=self.article_store,
+            ),
+        )
+
+    @property
+    def newsbot(self):
+        from agents.newsbot import NewsBot
+        return self._get(
+            "newsbot",
+            lambda: NewsBot(
+                self.llm_client,
+                self.lark_client,
+                self.news_fetcher,
+                lark_bot=self.lark_bot,
+                article_store=self.article_store,
+                digest_history=self.digest_history,
+            ),
+        )
+
+    @property
+    def compliance_sme(self):
+        from agents.compliance_sme import ComplianceSME
+        return self._get("compliance_sme", lambda: ComplianceSME(self.vector_store, self.llm_client))
+
+    @property
+    def router(self):
+        from app.router import Router
+        return self._get("router", lambda: Router(container=self))
+
+    @property
+    def leader_elector(self):
+        from services.leader import LeaderElector
+        return self._get("leader_elector", LeaderElector)
+
+    @property
+    def agent_pools(self):
+        from services.agent_pool import AgentPools
+        return self._get("agent_pools", AgentPools)
+
+    @property
+    def scheduler(self):
+        from services.scheduler import NewsScheduler
+        elector = self.leader_elector if settings.leader_election_enabled else None
+        return self._get("scheduler", lambda: NewsScheduler(self.router, elector=elector))
+
+    def register_breakers(self) -> None:
+        """
+        Create the circuit breakers of every configured dependency.
+
+        Clients otherwise create their breakers when they are first built, so
+        /dependencies/status would leave out dependencies no request has used yet.
+        """
+        from services.embeddings import embeddings_breaker
+        from services.llm_client import llm_breaker
+        from services.news_fetcher import NEWS_PROVIDERS, news_breaker
+
+        llm_breaker(settings.llm_provider.lower())
+        if settings.llm_fallback_provider:
+            llm_breaker(settings.llm_fallback_provider.lower())
+        for provider in NEWS_PROVIDERS:
+            news_breaker(provider)
+        embeddings_breaker()
+
+    def shutdown(self) -> None:
+        """Release components that hold background resources."""
+        if self.is_built("scheduler"):
+            self.scheduler.stop()
+        if self.is_built("lark_bot"):
+            self.lark_bot.close()
+        if self.is_built("agent_pools"):
+            self.agent_pools.shutdown()
+        if self.is_built("llm_client") and hasattr(self.llm_client, "close"):
+            self.llm_client.close()
+        logger.info("Container shut down")
+
+
+def get_container(request: Request) -> Container:
+    """FastAPI dependency returning the app's container."""
+    return request.app.state.container
+
+
+def get_router(container: Container = Depends(get_container)):
+    """FastAPI dependency returning the shared Router."""
+    return container.router
@@ -1,8 +1,9 @@
 """Lark webhook endpoint for bot messages."""
 
+import asyncio
 import logging
-import json
-from fastapi import APIRouter, Request, HTTPException
+from datetime import date
+from fastapi import APIRouter, Depends, Request, HTTPException
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
@@ -10,17 +11,15 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from services.agent_pool import AgentBusyError
 from services.lark_bot import LarkBot
+from app.container import Container, get_container
 from app.router import Router
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Initialize bot and router
-lark_bot = LarkBot()
-news_router = Router()
-
 
 class LarkEvent(BaseModel):
     """Lark event model."""
@@ -30,7 +29,7 @@ class LarkEvent(BaseModel):
 
 
 @router.post("/lark/webhook")
-async def lark_webhook(request: Request):
+async def lark_webhook(request: Request, container: Container = Depends(get_container)):
     """
     Handle incoming Lark bot events.
     
@@ -52,7 +51,8 @@ async def lark_webhook(request: Request):
         event_type = body.get("header", {}).get("event_type")
         
         if event_type == "im.message.receive_v1":
-            await handle_message_event(body)
+            # Sends, card edits and history reads all block, so the whole reply runs off the event loop
+            await asyncio.to_thread(handle_message_event, body, container.lark_bot, container.router)
             return {"code": 0, "msg": "success"}
 
         logger.warning(f"Unhandled event type: {event_type}")
@@ -63,8 +63,15 @@ async def lark_webhook(request: Request):
         return {"code": 1, "msg": str(e)}
 
 
-async def handle_message_event(event_data: Dict[str, Any]):
-    """Handle incoming message event."""
+def handle_message_event(event_data: Dict[str, Any], lark_bot: LarkBot, news_router: Router):
+    """
+    Handle incoming message event (blocking; run it in a worker thread).
+
+    Args:
+        event_data: Lark event payload
+        lark_bot: Shared Lark bot
+        news_router: Shared router
+    """
     try:
         # Parse message
         parsed = lark_bot.parse_message(event_data)
@@ -83,66 +90,75 @@ async def handle_message_event(event_data: Dict[str, Any]):
         
         logger.info(f"Processing news request from user {parsed['user_id']}, category: {category}")
 
-        # Send "processing" message
         message_id = parsed["message_id"]
         chat_id = parsed.get("chat_id")
-        lark_bot.send_reply(
+
+        # A past digest is answered from the history store, with no fetch or LLM call
+        if command_info.get("date"):
+            card = _history_card(news_router, command_info["date"], category)
+            if lark_bot.send_card(card, chat_id=chat_id, message_id=message_id) is not None:
+                logger.info("Sent digest from history to Lark")
+            return
+
+        # Send a placeholder card, then edit it in place with the result
+        placeholder_id = lark_bot.send_card(
+            LarkBot.build_card("Fetching latest news summary..."),
+            chat_id=chat_id,
             message_id=message_id,
-            content="Fetching latest news summary...",
-            msg_type="text",
-            chat_id=chat_id
         )
 
-        # Run NewsBot
+        # Run NewsBot on the NewsBot pool
         try:
-            result = news_router.handle_news_request(category=category)
-            
+            result = news_router.handle_news_request(category)
+
             if result.get("success") and result.get("summary"):
-                # Send full summary as markdown
-                summary = result["summary"]
-                
-                # Format as Lark interactive card
-                card_content = {
-                    "config": {"wide_screen_mode": True},
-                    "header": {
-                        "title": {
-                            "tag": "plain_text",
-                            "content": f"Daily News Summary - {result.get('timestamp', '')[:10]}"
-                        }
-                    },
-                    "elements": [
-                        {
-                            "tag": "markdown",
-                            "content": summary
-                        }
-                    ]
-                }
-                
-                lark_bot.send_reply(
-                    message_id=message_id,
-                    content=json.dumps(card_content),
-                    msg_type="interactive",
-                    chat_id=chat_id
+                card = LarkBot.build_card(
+                    result["summary"],
+                    title=f"Daily News Summary - {result.get('timestamp', '')[:10]}",
                 )
-                logger.info("Successfully sent news summary to Lark")
             else:
-                # Send error message
                 error_msg = result.get("error", "Sorry, couldn't fetch news right now.")
-                lark_bot.send_reply(
-                    message_id=message_id,
-                    content=f"❌ {error_msg}",
-                    msg_type="text",
-                    chat_id=chat_id
-                )
+                card = LarkBot.build_card(f"❌ {error_msg}")
 
+        except AgentBusyError as e:
+            logger.warning(f"NewsBot busy, asking user {parsed['user_id']} to retry: {e}")
+            card = LarkBot.build_card(
+                f"⏳ NewsBot is handling a lot of requests right now. Please try again in about {e.retry_after}s."
+            )
         except Exception as e:
             logger.error(f"Error running NewsBot: {e}", exc_info=True)
-            lark_bot.send_reply(
-                message_id=message_id,
-                content="Sorry, couldn't fetch news right now.",
-                msg_type="text",
-                chat_id=parsed.get("chat_id")
-            )
+            card = LarkBot.build_card("Sorry, couldn't fetch news right now.")
+
+        _finish_reply(lark_bot, card, placeholder_id, message_id, chat_id)
 
     except Exception as e:
         logger.error(f"Error handling message event: {e}", exc_info=True)
+
+
+def _history_card(news_router: Router, on_date: date, category: Optional[str]) -> Dict[str, Any]:
+    """Card with the recorded digest for a date and category, or a note that there isn't one."""
+    try:
+        digest = news_router.latest_digest(on_date, category)
+    except Exception as e:
+        logger.error(f"Error reading digest history: {e}", exc_info=True)
+        return LarkBot.build_card("Sorry, couldn't look up past digests right now.")
+
+    if not digest:
+        return LarkBot.build_card(f"No {category or 'general'} digest recorded for {on_date.isoformat()}.")
+    label = f" ({category})" if category else ""
+    return LarkBot.build_card(digest["summary"], title=f"Daily News Summary{label} - {digest['date']}")
+
+
+def _finish_reply(
+    lark_bot: LarkBot,
+    card: Dict[str, Any],
+    placeholder_id: Optional[str],
+    message_id: str,
+    chat_id: Optional[str],
+) -> None:
+    """Replace the placeholder with the final card, or send the card if that isn't possible."""
+    if placeholder_id and lark_bot.update_card(placeholder_id, card, chat_id=chat_id):
+        logger.info("Updated placeholder with NewsBot reply")
+        return
+    if lark_bot.send_card(card, chat_id=chat_id, message_id=message_id) is not None:
+        logger.info("Sent NewsBot reply to Lark")
@@ -1,18 +1,34 @@
 """FastAPI application entrypoint."""
 
+import asyncio
+import hmac
 import logging
 import sys
+from contextlib import asynccontextmanager
+from datetime import date
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from typing import Callable, Dict
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.container import Container, get_container, get_router
 from app.router import Router
+from app.warmup import Warmup
 from app.lark_webhook import router as lark_webhook_router
 from config.settings import settings
-from services.scheduler import NewsScheduler
+from services.agent_pool import AgentBusyError
+from services.circuit_breaker import breaker_statuses
+from services.digest_history import digest_date
+from services.async_utils import stop_io_loop
+from services.http_client import close_http_client
+from services.lark_client import is_lark_webhook
+from services.lark_dispatcher import close_dispatcher
+from services.metrics import IN_FLIGHT_REQUESTS, render_latest
+from services.tracing import request_trace
 
 # Configure logging
 logging.basicConfig(
@@ -26,24 +42,93 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared component container for the app's lifetime.
+
+    The scheduler and the warmup routine run in a background task so
+    /health is served as soon as the server is listening; /ready reports
+    when warmup has finished.
+    """
+    container = Container()
+    container.register_breakers()
+    warmup = Warmup(container)
+    app.state.container = container
+    app.state.warmup = warmup
+    app.state.startup_task = asyncio.create_task(asyncio.to_thread(_initialize, container, warmup))
+    app.state.startup_task.add_done_callback(_log_startup_failure)
+
+    yield
+
+    app.state.startup_task.cancel()
+    container.shutdown()
+    close_dispatcher()
+    close_http_client()
+    stop_io_loop()
+
+
+def _initialize(container: Container, warmup: Warmup) -> None:
+    """
+    Start the scheduler and run warmup (runs in a worker thread).
+
+    Warmup runs even if the scheduler fails to start (e.g. invalid
+    NEWSBOT_JOBS or an unwritable lease DB), so /ready still turns 200 and
+    the instance keeps serving requests instead of being recycled.
+    """
+    try:
+        container.scheduler.start()
+        next_run = container.scheduler.get_next_run_time()
+        logger.info(f"Scheduler started. Next NewsBot run: {next_run}")
+    except Exception as e:
+        logger.error(f"Failed to start scheduler: {e}", exc_info=True)
+    finally:
+        if settings.warmup_enabled:
+            warmup.run()
+        else:
+            warmup.skip()
+
+
+def _log_startup_failure(task: asyncio.Task) -> None:
+    """Log an exception that escaped the startup task, which nothing else awaits."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Startup task failed", exc_info=task.exception())
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Agent Platform",
     description="MVP AI multi-agent system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Include Lark webhook router
 app.include_router(lark_webhook_router)
 
-# Initialize router
-router = Router()
 
-# Initialize scheduler for automatic NewsBot runs
-news_scheduler = NewsScheduler(router)
+# Request/Response models
+class BroadcastRequest(BaseModel):
+    """Request model for digest broadcasts."""
+    chat_ids: list[str] = []
+    webhook_urls: list[str] = []
+    category: str | None = None
+
+
+class BroadcastResponse(BaseModel):
+    """Response model for digest broadcasts."""
+    success: bool
+    summary: str | None = None
+    headlines_count: int | None = None
+    targets: list[dict]
+    timestamp: str
+    execution_time_seconds: float
+    error: str | None = None
+    timings: dict | None = None
+    profile: str | None = None
 
 
-# Request/Response models
 class ComplianceQueryRequest(BaseModel):
     """Request model for compliance queries."""
     question: str
@@ -55,7 +140,10 @@ class ComplianceQueryResponse(BaseModel):
     sources: list[str]
     confidence: str
     disclaimer: str
+    degraded: bool = False
     execution_time_seconds: float
+    timings: dict | None = None
+    profile: str | None = None
 
 
 class NewsResponse(BaseModel):
@@ -63,9 +151,91 @@ class NewsResponse(BaseModel):
     success: bool
     summary: str | None = None
     headlines_count: int | None = None
+    degraded: bool = False
+    prompt_tokens: int | None = None
     timestamp: str
     execution_time_seconds: float
     error: str | None = None
+    timings: dict | None = None
+    profile: str | None = None
+
+
+class DigestRecord(BaseModel):
+    """A digest from the history store."""
+    id: int
+    category: str
+    date: str
+    prepared_at: str
+    headlines_count: int
+    degraded: bool
+    timings: dict
+    summary: str
+    headlines: list[dict]
+
+
+class NewsHistoryResponse(BaseModel):
+    """Response model for digest history lookups."""
+    enabled: bool
+    digests: list[DigestRecord]
+
+
+@app.middleware("http")
+async def track_in_flight(request: Request, call_next):
+    """Track in-flight requests per endpoint."""
+    # Label by known route paths only, so unknown URLs can't grow the label set
+    path = request.url.path
+    endpoint = path if any(route.path == path for route in app.routes) else "other"
+    gauge = IN_FLIGHT_REQUESTS.labels(endpoint=endpoint)
+    gauge.inc()
+    try:
+        return await call_next(request)
+    finally:
+        gauge.dec()
+
+
+@app.exception_handler(AgentBusyError)
+async def agent_busy(request: Request, exc: AgentBusyError):
+    """Answer 429 with a Retry-After hint when an agent pool is full."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _header_enabled(request: Request, name: str) -> bool:
+    """Check whether a boolean debug header is set."""
+    return request.headers.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _require_admin(http_request: Request, feature: str) -> None:
+    """Reject the request with 403 unless it carries the configured `X-Admin-Token`."""
+    token = http_request.headers.get("x-admin-token", "")
+    if not settings.admin_token or not hmac.compare_digest(token, settings.admin_token):
+        raise HTTPException(status_code=403, detail=f"{feature} requires a valid admin token")
+
+
+def _run_with_debug(http_request: Request, func: Callable[..., Dict], *args) -> Dict:
+    """
+    Run a router handler, adding debug output when requested.
+
+    `X-Debug-Timings: 1` adds a per-stage `timings` breakdown to the response.
+    `X-Debug-Profile: 1` with a matching `X-Admin-Token` also adds a cProfile
+    `profile` of the request.
+    """
+    profile = _header_enabled(http_request, "x-debug-profile")
+    if profile:
+        _require_admin(http_request, "Profiling")
+
+    if not profile and not _header_enabled(http_request, "x-debug-timings"):
+        return func(*args)
+
+    with request_trace(profile=profile) as trace:
+        result = func(*args)
+    result["timings"] = trace.timings()
+    if profile:
+        result["profile"] = trace.profile_text
+    return result
 
 
 # Endpoints
@@ -75,53 +245,113 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """Readiness endpoint: 200 once warmup has finished (or timed out), 503 before."""
+    warmup: Warmup = request.app.state.warmup
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "warmup": warmup.report()})
+    return {"status": "ready", "warmup": warmup.report()}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint."""
+    body, content_type = render_latest()
+    return Response(content=body, headers={"Content-Type": content_type})
+
+
+# Agent endpoints are sync so they wait for their pool on FastAPI's threadpool, not the event loop
 @app.post("/news/run", response_model=NewsResponse)
-async def run_news():
+def run_news(http_request: Request, router: Router = Depends(get_router)):
     """Trigger NewsBot manually."""
     logger.info("Received news run request")
-    result = router.handle_news_request()
+    result = _run_with_debug(http_request, router.handle_news_request)
     return NewsResponse(**result)
 
 
+# Sync endpoints below run on FastAPI's threadpool: they may build components or read SQLite
+@app.get("/news/history", response_model=NewsHistoryResponse)
+def news_history(
+    response: Response,
+    on_date: date | None = Query(default=None, alias="date", description="Digest date (YYYY-MM-DD)"),
+    category: str | None = Query(default=None, description="Category, or 'general' for uncategorized digests"),
+    limit: int = Query(default=10, ge=1, le=100),
+    router: Router = Depends(get_router),
+):
+    """Recorded digests, newest first, served from the history store without refetching or summarizing."""
+    result = router.handle_news_history(on_date, category, limit)
+    # Digests for a past date never change; today's may still gain new ones
+    if on_date is not None and on_date.isoformat() < digest_date():
+        response.headers["Cache-Control"] = f"public, max-age={settings.digest_history_max_age_seconds}"
+    else:
+        response.headers["Cache-Control"] = "public, max-age=60"
+    return NewsHistoryResponse(**result)
+
+
+@app.post("/news/broadcast", response_model=BroadcastResponse)
+def broadcast_news(
+    request: BroadcastRequest,
+    http_request: Request,
+    router: Router = Depends(get_router),
+):
+    """Summarize once and send the digest to many Lark chats and webhooks (admin only)."""
+    _require_admin(http_request, "Broadcasting")
+    if not request.chat_ids and not request.webhook_urls:
+        raise HTTPException(status_code=400, detail="At least one chat ID or webhook URL is required")
+    rejected = [url for url in request.webhook_urls if not is_lark_webhook(url)]
+    if rejected:
+        raise HTTPException(status_code=400, detail=f"Not a Lark bot webhook URL: {', '.join(rejected)}")
+    logger.info(f"Received broadcast request for {len(request.chat_ids) + len(request.webhook_urls)} targets")
+    result = _run_with_debug(
+        http_request, router.handle_broadcast, request.chat_ids, request.webhook_urls, request.category
+    )
+    return BroadcastResponse(**result)
+
+
 @app.post("/compliance/query", response_model=ComplianceQueryResponse)
-async def query_compliance(request: ComplianceQueryRequest):
+def query_compliance(
+    request: ComplianceQueryRequest,
+    http_request: Request,
+    router: Router = Depends(get_router),
+):
     """Handle compliance query."""
     logger.info(f"Received compliance query: {request.question[:50]}...")
     
     if not request.question.strip():
         raise HTTPException(status_code=400, detail="Question cannot be empty")
     
-    result = router.handle_compliance_query(request.question)
+    result = _run_with_debug(http_request, router.handle_compliance_query, request.question)
     return ComplianceQueryResponse(**result)
 
 
+@app.get("/dependencies/status")
+async def dependencies_status():
+    """Circuit breaker state of each upstream dependency (LLM providers, news providers, embeddings)."""
+    return {"breakers": breaker_statuses()}
+
+
+@app.get("/agents/status")
+def agents_status(container: Container = Depends(get_container)):
+    """Capacity, running and queued runs of each agent pool."""
+    pools = container.agent_pools
+    return {"max_concurrency": pools.slots.limit, "pools": pools.statuses()}
+
+
 @app.get("/scheduler/status")
-async def scheduler_status():
+def scheduler_status(container: Container = Depends(get_container)):
     """Get scheduler status and next run time."""
+    news_scheduler = container.scheduler
     next_run = news_scheduler.get_next_run_time()
     return {
         "scheduler_running": news_scheduler.scheduler.running,
         "next_run_time": next_run.isoformat() if next_run else None,
-        "timezone": "Asia/Hong_Kong"
+        "timezone": settings.scheduler_timezone,
+        "leadership": news_scheduler.elector.status() if news_scheduler.elector else None,
+        "jobs": news_scheduler.get_jobs_status(),
     }
 
 
-# Startup and shutdown events
-@app.on_event("startup")
-async def startup_event():
-    """Start scheduler when app starts."""
-    news_scheduler.start()
-    next_run = news_scheduler.get_next_run_time()
-    logger.info(f"Scheduler started. Next NewsBot run: {next_run}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Stop scheduler when app shuts down."""
-    news_scheduler.stop()
-    logger.info("Scheduler stopped")
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
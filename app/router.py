@@ -2,18 +2,20 @@
 
 import logging
 import time
-from typing import Dict
+from datetime import date, datetime
+from typing import Dict, List, Optional
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.llm_client import LLMClient
-from services.lark_client import LarkClient
-from services.vector_store import VectorStore
 from agents.newsbot import NewsBot
 from agents.compliance_sme import ComplianceSME
+from config.settings import settings
+from services.agent_pool import POOL_COMPLIANCE, POOL_NEWSBOT, AgentBusyError, AgentPools
+from services.deadline import deadline
+from services.metrics import record_error
 
 logger = logging.getLogger(__name__)
 
@@ -21,62 +23,187 @@ logger = logging.getLogger(__name__)
 class Router:
     """Main router for handling requests and delegating to agents."""
 
-    def __init__(self):
-        """Initialize router with agent dependencies."""
-        self.llm_client = LLMClient()
-        self.lark_client = LarkClient()
-        self.vector_store = VectorStore()
-        
-        self.newsbot = NewsBot(self.llm_client, self.lark_client)
-        self.compliance_sme = ComplianceSME(self.vector_store, self.llm_client)
-        
+    def __init__(self, container=None):
+        """
+        Initialize router.
+
+        Args:
+            container: Shared component container (a private one is created if not provided)
+        """
+        if container is None:
+            from app.container import Container
+            container = Container()
+        self.container = container
         logger.info("Initialized Router")
 
+    @property
+    def newsbot(self) -> NewsBot:
+        """Shared NewsBot, built on first use."""
+        return self.container.newsbot
+
+    @property
+    def compliance_sme(self) -> ComplianceSME:
+        """Shared ComplianceSME, built on first use."""
+        return self.container.compliance_sme
+
+    @property
+    def agents(self) -> AgentPools:
+        """Worker pools that agent runs execute on."""
+        return self.container.agent_pools
+
     def handle_news_request(self, category: Optional[str] = None) -> Dict:
         """
-        Handle news bot request.
+        Handle news bot request on the NewsBot pool, within the request deadline.
 
         Returns:
             Response dict
+
+        Raises:
+            AgentBusyError: If the NewsBot pool is full
         """
         start_time = time.time()
         logger.info("Handling news request")
 
         try:
-            result = self.newsbot.run(category=category)
+            with deadline(settings.request_deadline_seconds):
+                result = self.agents.run(POOL_NEWSBOT, self.newsbot.run, category=category)
             duration = time.time() - start_time
             result["execution_time_seconds"] = duration
             logger.info(f"News request completed in {duration:.2f}s")
             return result
+        except AgentBusyError:
+            raise
         except Exception as e:
             logger.error(f"Error handling news request: {e}", exc_info=True)
+            record_error("newsbot")
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": datetime.now().isoformat(),
+                "execution_time_seconds": time.time() - start_time,
+            }
+
+    def handle_news_history(
+        self,
+        on_date: Optional[date] = None,
+        category: Optional[str] = None,
+        limit: int = 10,
+    ) -> Dict:
+        """
+        Look up recorded digests; no news fetch or LLM call is made.
+
+        Args:
+            on_date: Only digests from this date (in SCHEDULER_TIMEZONE)
+            category: Only digests for this category ('general' for uncategorized)
+            limit: Max digests returned
+
+        Returns:
+            Response dict with the matching digests, newest first
+        """
+        history = self.container.digest_history
+        if history is None:
+            return {"enabled": False, "digests": []}
+        digests = history.query(on_date=on_date, category=category, limit=limit)
+        logger.info(f"Served {len(digests)} digests from history")
+        return {"enabled": True, "digests": digests}
+
+    def latest_digest(self, on_date: date, category: Optional[str] = None) -> Optional[Dict]:
+        """
+        The last digest recorded for a date, preferring one that isn't degraded.
+
+        Args:
+            on_date: Digest date (in SCHEDULER_TIMEZONE)
+            category: News category (None for the general digest)
+
+        Returns:
+            Digest dict, or None if none was recorded (or history is disabled)
+        """
+        history = self.container.digest_history
+        if history is None:
+            return None
+        return history.latest(on_date, category or "general")
+
+    def handle_broadcast(
+        self,
+        chat_ids: List[str],
+        webhook_urls: List[str],
+        category: Optional[str] = None,
+    ) -> Dict:
+        """
+        Handle a digest broadcast on the NewsBot pool: summarize once, send to every target.
+
+        Args:
+            chat_ids: Lark chat IDs to send to via the bot
+            webhook_urls: Lark group webhooks to send to
+            category: Optional news category
+
+        Returns:
+            Response dict with per-target delivery results
+
+        Raises:
+            AgentBusyError: If the NewsBot pool is full
+        """
+        start_time = time.time()
+        logger.info(f"Handling broadcast to {len(chat_ids)} chats and {len(webhook_urls)} webhooks")
+
+        try:
+            prepared, targets = self.agents.run(POOL_NEWSBOT, self._broadcast, chat_ids, webhook_urls, category)
+            duration = time.time() - start_time
+            logger.info(f"Broadcast completed in {duration:.2f}s")
+            return {
+                "success": all(target["success"] for target in targets),
+                "summary": prepared["summary"],
+                "headlines_count": prepared["headlines_count"],
+                "targets": targets,
+                "timestamp": prepared["prepared_at"],
+                "execution_time_seconds": duration,
+            }
+        except AgentBusyError:
+            raise
+        except Exception as e:
+            logger.error(f"Error handling broadcast: {e}", exc_info=True)
+            record_error("newsbot")
             return {
                 "success": False,
+                "targets": [],
                 "error": str(e),
+                "timestamp": datetime.now().isoformat(),
                 "execution_time_seconds": time.time() - start_time,
             }
 
+    def _broadcast(self, chat_ids: List[str], webhook_urls: List[str], category: Optional[str]) -> tuple:
+        """Prepare a digest and send it to every target (runs on the NewsBot pool)."""
+        prepared = self.newsbot.prepare(category=category)
+        return prepared, self.newsbot.broadcast(prepared, chat_ids=chat_ids, webhook_urls=webhook_urls)
+
     def handle_compliance_query(self, question: str) -> Dict:
         """
-        Handle compliance query.
+        Handle compliance query on the compliance pool, within the request deadline.
 
         Args:
             question: User question
 
         Returns:
             Response dict
+
+        Raises:
+            AgentBusyError: If the compliance pool is full
         """
         start_time = time.time()
         logger.info(f"Handling compliance query: {question[:50]}...")
 
         try:
-            result = self.compliance_sme.answer(question)
+            with deadline(settings.request_deadline_seconds):
+                result = self.agents.run(POOL_COMPLIANCE, self.compliance_sme.answer, question)
             duration = time.time() - start_time
             result["execution_time_seconds"] = duration
             logger.info(f"Compliance query completed in {duration:.2f}s")
             return result
+        except AgentBusyError:
+            raise
         except Exception as e:
             logger.error(f"Error handling compliance query: {e}", exc_info=True)
+            record_error("compliance")
             return {
                 "answer": "An error occurred processing your query.",
                 "sources": [],
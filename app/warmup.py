@@ -0,0 +1,128 @@
+"""Warmup routine run after startup, before the app reports ready."""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.container import Container
+from config.settings import settings
+from services.http_client import warm_async_connections, warm_connections
+from services.tokenizer import get_encoding
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Pays first-request costs up front.
+
+    Steps (configured by WARMUP_STEPS, run in order):
+    - components: build the shared clients and agents
+    - lark_token: fetch the Lark tenant access token
+    - connections: open pooled connections to Lark, news APIs and the LLM/embedding hosts
+    - vector_index: load the Chroma HNSW index into memory
+    - encoders: load the tiktoken BPE ranks
+    """
+
+    STEPS = ("components", "lark_token", "connections", "vector_index", "encoders")
+
+    def __init__(self, container: Container, steps: Optional[List[str]] = None, timeout: Optional[float] = None):
+        """
+        Initialize warmup.
+
+        Args:
+            container: Shared component container
+            steps: Steps to run (defaults to settings)
+            timeout: Seconds after which the app reports ready regardless (defaults to settings)
+        """
+        self.container = container
+        configured = steps if steps is not None else settings.warmup_steps.split(",")
+        self.steps = [step.strip() for step in configured if step.strip()]
+        unknown = set(self.steps) - set(self.STEPS)
+        if unknown:
+            raise ValueError(f"Unknown warmup steps: {sorted(unknown)}")
+        self.timeout = timeout if timeout is not None else settings.warmup_timeout_seconds
+        self.results: Dict[str, Dict] = {}
+        self._started_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        """True once warmup has finished or its timeout has passed."""
+        if self._done.is_set():
+            return True
+        return self._started_at is not None and time.monotonic() - self._started_at > self.timeout
+
+    def skip(self) -> None:
+        """Mark warmup as done without running any step."""
+        self._done.set()
+
+    def run(self) -> None:
+        """Run all configured steps, logging (not raising) step failures."""
+        self._started_at = time.monotonic()
+        logger.info(f"Warmup started: {', '.join(self.steps)}")
+        for step in self.steps:
+            if time.monotonic() - self._started_at > self.timeout:
+                self.results[step] = {"ok": False, "skipped": True}
+                continue
+            start = time.perf_counter()
+            try:
+                detail = getattr(self, f"_warm_{step}")()
+                self.results[step] = {"ok": True, "seconds": round(time.perf_counter() - start, 3)}
+                if detail is not None:
+                    self.results[step]["detail"] = detail
+            except Exception as e:
+                logger.warning(f"Warmup step '{step}' failed: {e}")
+                self.results[step] = {"ok": False, "seconds": round(time.perf_counter() - start, 3), "error": str(e)}
+        self._done.set()
+        logger.info(f"Warmup finished in {time.monotonic() - self._started_at:.2f}s")
+
+    def report(self) -> Dict:
+        """Status for the /ready endpoint."""
+        return {
+            "finished": self._done.is_set(),
+            "steps": self.results,
+        }
+
+    def _warm_components(self):
+        for name in ("router", "lark_bot", "newsbot", "compliance_sme"):
+            getattr(self.container, name)
+
+    def _warm_lark_token(self):
+        lark_bot = self.container.lark_bot
+        if not lark_bot.app_id or not lark_bot.app_secret:
+            return "lark bot not configured"
+        lark_bot._get_access_token()
+
+    def _warm_connections(self):
+        urls = [settings.lark_base_url]
+        if settings.lark_webhook_url:
+            parts = urlsplit(settings.lark_webhook_url)
+            urls.append(f"{parts.scheme}://{parts.netloc}")
+        connected = warm_connections(urls)
+        # News providers are fetched through the shared async client
+        news_urls = []
+        if settings.newsapi_key:
+            news_urls.append(settings.newsapi_base_url)
+        if settings.newsdata_key:
+            news_urls.append(settings.newsdata_base_url)
+        if news_urls:
+            connected += warm_async_connections(news_urls)
+        connected += int(self.container.llm_client.warm_connection())
+        connected += int(self.container.embedding_service.warm_connection())
+        return f"{connected} hosts connected"
+
+    def _warm_vector_index(self):
+        if not self.container.vector_store.warm_index():
+            return "collection empty"
+
+    def _warm_encoders(self):
+        get_encoding()
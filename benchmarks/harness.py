@@ -0,0 +1,219 @@
+"""Shared helpers for benchmarks: app process control, payloads and statistics."""
+
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Seeds a few compliance documents through the (stubbed) embeddings API
+_SEED_SCRIPT = """
+from services.vector_store import VectorStore
+docs = [
+    {"text": "All data breaches must be reported within 72 hours to the compliance officer.", "document_name": "data_privacy_policy.txt"},
+    {"text": "Transactions over $10,000 require additional approval from the finance director.", "document_name": "financial_regulations.txt"},
+    {"text": "Gifts or favors exceeding $100 value must be reported to HR.", "document_name": "code_of_conduct.txt"},
+    {"text": "Multi-factor authentication is required for all remote access.", "document_name": "information_security.txt"},
+    {"text": "Due diligence must be performed on all third-party vendors and partners.", "document_name": "anti_corruption.txt"},
+]
+VectorStore().add_documents(docs)
+"""
+
+
+class AppProcess:
+    """Runs the FastAPI application under uvicorn in a subprocess."""
+
+    def __init__(self, env: Dict[str, str], port: int, workdir: Optional[str] = None):
+        """
+        Initialize app process.
+
+        Args:
+            env: Environment overrides (typically StubServers.app_env())
+            port: Port to serve on
+            workdir: Directory for the Chroma store, state DB and logs (temp dir if omitted)
+        """
+        self.port = port
+        self.workdir = workdir or tempfile.mkdtemp(prefix="bench-app-")
+        self.env = {
+            **os.environ,
+            "CHROMA_PERSIST_DIR": os.path.join(self.workdir, "chroma_db"),
+            "STATE_DB_PATH": os.path.join(self.workdir, "state.db"),
+            "LOG_LEVEL": "WARNING",
+            **env,
+        }
+        self.process: Optional[subprocess.Popen] = None
+        self._log_file = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def seed_compliance_docs(self) -> None:
+        """Populate the app's Chroma store with sample documents."""
+        subprocess.run(
+            [sys.executable, "-c", _SEED_SCRIPT],
+            cwd=REPO_ROOT,
+            env=self.env,
+            check=True,
+            capture_output=True,
+        )
+
+    def start(self, timeout: float = 60.0) -> float:
+        """
+        Start the app and wait for /health.
+
+        Returns:
+            Seconds from process spawn to the first healthy response
+        """
+        os.makedirs(REPO_ROOT / "logs", exist_ok=True)
+        self._log_file = open(os.path.join(self.workdir, "app.out"), "wb")
+        start = time.perf_counter()
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(self.port),
+                "--log-level", "warning", "--no-access-log",
+            ],
+            cwd=REPO_ROOT,
+            env=self.env,
+            stdout=self._log_file,
+            stderr=subprocess.STDOUT,
+        )
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"App exited during startup; see {self._log_file.name}")
+            try:
+                if httpx.get(f"{self.base_url}/health", timeout=1.0).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+        self.stop()
+        raise RuntimeError("App did not become healthy in time")
+
+    def stop(self) -> None:
+        """Terminate the app."""
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory of the app process (Linux only)."""
+        if not self.process:
+            return None
+        try:
+            with open(f"/proc/{self.process.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            return None
+        return None
+
+    def __enter__(self) -> "AppProcess":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def lark_message_event(
+    text: str,
+    chat_id: Optional[str] = None,
+    event_id: Optional[str] = None,
+    message_id: Optional[str] = None,
+) -> Dict:
+    """
+    Build an `im.message.receive_v1` event as Lark delivers it.
+
+    Args:
+        text: Message text (e.g. '@NewsBot tech news')
+        chat_id: Group chat ID
+        event_id: Event ID (reuse it to simulate a Lark retry)
+        message_id: Message ID
+
+    Returns:
+        Webhook request body
+    """
+    return {
+        "schema": "2.0",
+        "header": {
+            "event_id": event_id or uuid.uuid4().hex,
+            "event_type": "im.message.receive_v1",
+            "create_time": str(int(time.time() * 1000)),
+            "token": "stub-verification-token",
+            "app_id": "cli_stub",
+            "tenant_key": "stub-tenant",
+        },
+        "event": {
+            "sender": {
+                "sender_id": {"user_id": f"u_{uuid.uuid4().hex[:8]}", "open_id": f"ou_{uuid.uuid4().hex[:8]}"},
+                "sender_type": "user",
+            },
+            "message": {
+                "message_id": message_id or f"om_{uuid.uuid4().hex[:16]}",
+                "chat_id": chat_id or f"oc_{uuid.uuid4().hex[:16]}",
+                "chat_type": "group",
+                "message_type": "text",
+                "content": json.dumps({"text": text}),
+            },
+            "mentions": [{"key": "@_user_1", "name": "NewsBot", "id": {"open_id": "ou_newsbot"}}],
+        },
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(latencies: List[float], wall_seconds: float, errors: int = 0) -> Dict:
+    """
+    Summarize a run.
+
+    Args:
+        latencies: Successful request latencies in seconds
+        wall_seconds: Wall-clock duration of the run
+        errors: Number of failed requests
+
+    Returns:
+        Dict with counts, p50/p95/p99 in milliseconds and throughput
+    """
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "throughput_rps": round(len(latencies) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+    }
+
+
+def parse_overrides(pairs: List[str], cast=float) -> Dict[str, float]:
+    """Parse repeated 'name=value' CLI options."""
+    result = {}
+    for pair in pairs or []:
+        name, _, value = pair.partition("=")
+        result[name.strip()] = cast(value)
+    return result
@@ -0,0 +1,247 @@
+"""Burst load generator and soak test for the Lark webhook.
+
+Replays realistic `im.message.receive_v1` events against /lark/webhook
+running on the local stand-ins. Each event gets its own chat so replies
+recorded by the Lark stand-in can be attributed to it. Covers bursts,
+Lark-style retries (same event_id re-delivered) and mixed categories,
+and reports ack latency, end-to-end reply latency, duplicate replies and
+app memory growth.
+
+Usage:
+    python -m benchmarks.lark_load burst --events 50 --retries 1
+    python -m benchmarks.lark_load soak --duration 600 --rate 2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import AppProcess, latency_summary, lark_message_event, parse_overrides, percentile
+from benchmarks.stubs import STUB_NAMES, LarkRecorder, StubBehavior, StubServers, free_port
+
+MENTION_TEXTS = [
+    "@NewsBot news",
+    "@NewsBot tech news",
+    "@NewsBot business headlines please",
+    "@NewsBot world summary",
+    "@NewsBot health news",
+    "@NewsBot science",
+    "@NewsBot what's happening in sports",
+]
+
+# Text of the interim message sent before the summary
+PLACEHOLDER_MARKER = "Fetching"
+
+
+@dataclass
+class SentEvent:
+    """One logical event, possibly delivered several times."""
+
+    event_id: str
+    chat_id: str
+    text: str
+    first_sent_at: float = 0.0
+    ack_latencies: List[float] = field(default_factory=list)
+    ack_failures: int = 0
+
+
+async def deliver(client: httpx.AsyncClient, event: SentEvent, payload: Dict) -> None:
+    """POST one delivery of an event and record its ack latency."""
+    start = time.time()
+    if not event.first_sent_at:
+        event.first_sent_at = start
+    try:
+        response = await client.post("/lark/webhook", json=payload)
+        if response.status_code == 200:
+            event.ack_latencies.append(time.time() - start)
+        else:
+            event.ack_failures += 1
+    except httpx.HTTPError:
+        event.ack_failures += 1
+
+
+async def send_with_retries(client: httpx.AsyncClient, event: SentEvent, retries: int, retry_delay: float) -> None:
+    """Deliver an event, then re-deliver it `retries` times like Lark does on slow acks."""
+    payload = lark_message_event(event.text, chat_id=event.chat_id, event_id=event.event_id)
+    deliveries = [deliver(client, event, payload)]
+    for attempt in range(1, retries + 1):
+        deliveries.append(_delayed(deliver(client, event, payload), retry_delay * attempt))
+    await asyncio.gather(*deliveries)
+
+
+async def _delayed(coro, delay: float):
+    await asyncio.sleep(delay)
+    return await coro
+
+
+def new_event() -> SentEvent:
+    """Create an event with a random category mention in a fresh chat."""
+    return SentEvent(
+        event_id=uuid.uuid4().hex,
+        chat_id=f"oc_{uuid.uuid4().hex[:16]}",
+        text=random.choice(MENTION_TEXTS),
+    )
+
+
+def _is_placeholder(record: Dict) -> bool:
+    return PLACEHOLDER_MARKER in json.dumps(record["body"]) and record["kind"] == "message"
+
+
+def replies_by_event(recorder: LarkRecorder, events: List[SentEvent]) -> Dict[str, List[Dict]]:
+    """
+    Group final replies recorded by the Lark stand-in per event.
+
+    A final reply is any message to the event's chat that is not the
+    "Fetching..." placeholder, or an in-place update of that placeholder.
+    """
+    records = recorder.snapshot()
+    chat_to_event = {event.chat_id: event.event_id for event in events}
+    placeholder_to_event = {}
+    replies: Dict[str, List[Dict]] = {event.event_id: [] for event in events}
+
+    for record in records:
+        event_id = chat_to_event.get(record["receive_id"])
+        if event_id and record["kind"] == "message":
+            if _is_placeholder(record):
+                placeholder_to_event[record["message_id"]] = event_id
+            else:
+                replies[event_id].append(record)
+    for record in records:
+        if record["kind"] == "update" and record["receive_id"] in placeholder_to_event:
+            replies[placeholder_to_event[record["receive_id"]]].append(record)
+    return replies
+
+
+async def wait_for_replies(recorder: LarkRecorder, events: List[SentEvent], timeout: float) -> Dict[str, List[Dict]]:
+    """Poll the Lark stand-in until every event has a reply or the timeout passes."""
+    deadline = time.time() + timeout
+    while True:
+        replies = replies_by_event(recorder, events)
+        if all(replies.values()) or time.time() > deadline:
+            return replies
+        await asyncio.sleep(0.2)
+
+
+def report(events: List[SentEvent], replies: Dict[str, List[Dict]], wall_seconds: float) -> Dict:
+    """Build the result summary."""
+    acks = [latency for event in events for latency in event.ack_latencies]
+    ack_failures = sum(event.ack_failures for event in events)
+    end_to_end = []
+    duplicates = 0
+    missing = 0
+    for event in events:
+        event_replies = replies.get(event.event_id, [])
+        if not event_replies:
+            missing += 1
+            continue
+        duplicates += len(event_replies) - 1
+        first_reply = min(reply["received_at"] for reply in event_replies)
+        end_to_end.append(first_reply - event.first_sent_at)
+
+    return {
+        "events": len(events),
+        "deliveries": len(acks) + ack_failures,
+        "ack": latency_summary(acks, wall_seconds, ack_failures),
+        "reply_p50_ms": round(percentile(end_to_end, 50) * 1000, 1),
+        "reply_p95_ms": round(percentile(end_to_end, 95) * 1000, 1),
+        "reply_p99_ms": round(percentile(end_to_end, 99) * 1000, 1),
+        "missing_replies": missing,
+        "duplicate_replies": duplicates,
+    }
+
+
+async def run_burst(app: AppProcess, recorder: LarkRecorder, args) -> Dict:
+    """Fire `events` mentions at once, each re-delivered `retries` times."""
+    events = [new_event() for _ in range(args.events)]
+    limits = httpx.Limits(max_connections=args.events * (args.retries + 1))
+    async with httpx.AsyncClient(base_url=app.base_url, timeout=args.timeout, limits=limits) as client:
+        start = time.time()
+        await asyncio.gather(*(send_with_retries(client, e, args.retries, args.retry_delay) for e in events))
+        replies = await wait_for_replies(recorder, events, args.reply_timeout)
+        wall = time.time() - start
+    return report(events, replies, wall)
+
+
+async def run_soak(app: AppProcess, recorder: LarkRecorder, args) -> Dict:
+    """Send mentions at a steady rate for `duration` seconds while sampling memory."""
+    events: List[SentEvent] = []
+    memory_samples = [(0.0, app.rss_bytes())]
+    tasks = []
+    async with httpx.AsyncClient(base_url=app.base_url, timeout=args.timeout) as client:
+        start = time.time()
+        next_sample = start + args.sample_interval
+        while time.time() - start < args.duration:
+            event = new_event()
+            events.append(event)
+            retries = args.retries if random.random() < args.retry_fraction else 0
+            tasks.append(asyncio.create_task(send_with_retries(client, event, retries, args.retry_delay)))
+            await asyncio.sleep(random.expovariate(args.rate))
+            if time.time() >= next_sample:
+                memory_samples.append((round(time.time() - start, 1), app.rss_bytes()))
+                next_sample += args.sample_interval
+        await asyncio.gather(*tasks)
+        replies = await wait_for_replies(recorder, events, args.reply_timeout)
+        wall = time.time() - start
+    memory_samples.append((round(time.time() - start, 1), app.rss_bytes()))
+
+    result = report(events, replies, wall)
+    rss = [sample for _, sample in memory_samples if sample]
+    if rss:
+        result["rss_start_mb"] = round(rss[0] / 2**20, 1)
+        result["rss_end_mb"] = round(rss[-1] / 2**20, 1)
+        result["rss_growth_mb"] = round((rss[-1] - rss[0]) / 2**20, 1)
+        result["rss_samples_mb"] = [(t, round(s / 2**20, 1)) for t, s in memory_samples if s]
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["burst", "soak"])
+    parser.add_argument("--events", type=int, default=50, help="Burst size")
+    parser.add_argument("--retries", type=int, default=1, help="Re-deliveries of each event with the same event_id")
+    parser.add_argument("--retry-delay", type=float, default=3.0, help="Seconds between re-deliveries")
+    parser.add_argument("--retry-fraction", type=float, default=0.2, help="Soak: fraction of events re-delivered")
+    parser.add_argument("--duration", type=float, default=300.0, help="Soak duration in seconds")
+    parser.add_argument("--rate", type=float, default=2.0, help="Soak: mean events per second")
+    parser.add_argument("--sample-interval", type=float, default=10.0, help="Soak: seconds between RSS samples")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Webhook request timeout")
+    parser.add_argument("--reply-timeout", type=float, default=120.0, help="Max wait for replies after sending")
+    parser.add_argument("--latency", action="append", metavar="STUB=MS",
+                        help=f"Stub latency in ms, stubs: {', '.join(STUB_NAMES)}")
+    parser.add_argument("--error-rate", action="append", metavar="STUB=RATE", help="Stub error rate (0-1)")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    latency = parse_overrides(args.latency)
+    error_rate = parse_overrides(args.error_rate)
+    behaviors = {
+        name: StubBehavior(latency_ms=latency.get(name, 50.0), error_rate=error_rate.get(name, 0.0))
+        for name in STUB_NAMES
+    }
+
+    with StubServers(behaviors) as stubs:
+        with AppProcess(stubs.app_env(), port=free_port()) as app:
+            runner = run_burst if args.mode == "burst" else run_soak
+            result = asyncio.run(runner(app, stubs.lark_recorder, args))
+        result["lark_token_requests"] = stubs.lark_recorder.token_requests
+
+    print(json.dumps(result, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump(result, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
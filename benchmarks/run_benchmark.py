@@ -0,0 +1,147 @@
+"""Offline end-to-end benchmark.
+
+Starts local stand-ins for every upstream API, launches the app against
+them and drives /news/run, /compliance/query and /lark/webhook at the
+requested concurrency levels, reporting p50/p95/p99 latency and
+throughput.
+
+Usage:
+    python -m benchmarks.run_benchmark --concurrency 1,4,16 --requests 40
+    python -m benchmarks.run_benchmark --latency openai=800 --error-rate newsapi=0.1
+    python -m benchmarks.run_benchmark --llm-cache --latency openai=800
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import AppProcess, latency_summary, lark_message_event, parse_overrides
+from benchmarks.stubs import STUB_NAMES, StubBehavior, StubServers, free_port
+
+SCENARIOS = ("news", "compliance", "lark")
+
+QUESTIONS = [
+    "When must data breaches be reported?",
+    "What approval do large transactions need?",
+    "Do gifts need to be reported?",
+    "Is MFA required for remote access?",
+]
+
+LARK_TEXTS = ["@NewsBot news", "@NewsBot tech news", "@NewsBot business headlines", "@NewsBot world summary"]
+
+
+def build_request(scenario: str) -> Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]:
+    """Return a coroutine factory issuing one request for a scenario."""
+    if scenario == "news":
+        return lambda client: client.post("/news/run")
+    if scenario == "compliance":
+        return lambda client: client.post("/compliance/query", json={"question": random.choice(QUESTIONS)})
+    if scenario == "lark":
+        return lambda client: client.post("/lark/webhook", json=lark_message_event(random.choice(LARK_TEXTS)))
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_scenario(base_url: str, scenario: str, concurrency: int, total: int, timeout: float) -> Dict:
+    """
+    Issue `total` requests with `concurrency` in flight.
+
+    Returns:
+        Latency summary dict
+    """
+    make_request = build_request(scenario)
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await make_request(client)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+
+    return latency_summary(latencies, wall, errors)
+
+
+def print_table(rows: List[Dict]) -> None:
+    """Print results as an aligned table."""
+    headers = ["scenario", "concurrency", "requests", "errors", "p50_ms", "p95_ms", "p99_ms", "throughput_rps"]
+    widths = [max(len(h), *(len(str(r[h])) for r in rows)) for h in headers]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(row[h]).ljust(w) for h, w in zip(headers, widths)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per scenario and concurrency level")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--llm-provider", default="openai", choices=["openai", "anthropic"])
+    parser.add_argument("--completion-words", type=int, default=300, help="Length of stub LLM completions")
+    parser.add_argument("--latency", action="append", metavar="STUB=MS",
+                        help=f"Stub latency in ms, stubs: {', '.join(STUB_NAMES)}")
+    parser.add_argument("--error-rate", action="append", metavar="STUB=RATE", help="Stub error rate (0-1)")
+    parser.add_argument("--llm-cache", action="store_true",
+                        help="Enable the LLM response cache (repeated prompts are served from cache)")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    latency = parse_overrides(args.latency)
+    error_rate = parse_overrides(args.error_rate)
+    behaviors = {
+        name: StubBehavior(latency_ms=latency.get(name, 50.0), error_rate=error_rate.get(name, 0.0))
+        for name in STUB_NAMES
+    }
+
+    rows = []
+    with StubServers(behaviors, completion_words=args.completion_words) as stubs:
+        app_env = stubs.app_env(args.llm_provider)
+        if args.llm_cache:
+            app_env["LLM_CACHE_ENABLED"] = "true"
+        app = AppProcess(app_env, port=free_port())
+        app.seed_compliance_docs()
+        startup = app.start()
+        print(f"App healthy after {startup:.2f}s")
+        try:
+            for scenario in args.scenarios.split(","):
+                for concurrency in (int(c) for c in args.concurrency.split(",")):
+                    summary = asyncio.run(run_scenario(app.base_url, scenario, concurrency, args.requests, args.timeout))
+                    rows.append({"scenario": scenario, "concurrency": concurrency, **summary})
+                    print(f"  {scenario} @ {concurrency}: p95={summary['p95_ms']}ms, {summary['throughput_rps']} req/s")
+        finally:
+            app.stop()
+
+    print()
+    print_table(rows)
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump({"startup_seconds": startup, "results": rows}, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Startup-time benchmark.
+
+Measures how long `import app.main` takes in a fresh interpreter and how
+long the app takes from process spawn to its first healthy /health
+response, against the local stand-ins. Exits non-zero when a budget is
+exceeded so it can gate deploys.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --import-budget 1.5 --healthy-budget 3
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import REPO_ROOT, AppProcess
+from benchmarks.stubs import StubServers, free_port
+
+_IMPORT_SCRIPT = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    """Seconds to import app.main in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT],
+        cwd=REPO_ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: Dict[str, str], limit: int = 10) -> List[Tuple[str, float]]:
+    """Top-level packages with the largest cumulative import time, via -X importtime."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    totals: Dict[str, int] = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue
+        package = name.split(".")[0]
+        totals[package] = max(totals.get(package, 0), int(cumulative))
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(package, round(micros / 1e6, 3)) for package, micros in ranked]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions of each measurement")
+    parser.add_argument("--import-budget", type=float, help="Fail if median import time exceeds this (s)")
+    parser.add_argument("--healthy-budget", type=float, help="Fail if median time-to-healthy exceeds this (s)")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    with StubServers() as stubs:
+        app_env = AppProcess(stubs.app_env(), port=0).env
+        import_times = [measure_import(app_env) for _ in range(args.runs)]
+
+        healthy_times = []
+        for _ in range(args.runs):
+            app = AppProcess(stubs.app_env(), port=free_port())
+            healthy_times.append(app.start())
+            app.stop()
+
+        offenders = slowest_imports(app_env)
+
+    result = {
+        "import_seconds_median": round(statistics.median(import_times), 3),
+        "import_seconds_max": round(max(import_times), 3),
+        "time_to_healthy_seconds_median": round(statistics.median(healthy_times), 3),
+        "time_to_healthy_seconds_max": round(max(healthy_times), 3),
+        "slowest_imports": offenders,
+    }
+    print(json.dumps(result, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump(result, output, indent=2)
+
+    failed = False
+    if args.import_budget is not None and result["import_seconds_median"] > args.import_budget:
+        print(f"FAIL: import time {result['import_seconds_median']}s exceeds budget {args.import_budget}s")
+        failed = True
+    if args.healthy_budget is not None and result["time_to_healthy_seconds_median"] > args.healthy_budget:
+        print(f"FAIL: time to healthy {result['time_to_healthy_seconds_median']}s exceeds budget {args.healthy_budget}s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
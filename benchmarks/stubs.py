@@ -0,0 +1,396 @@
+"""Local stand-in servers for the upstream APIs used by the platform.
+
+Each upstream (NewsAPI, NewsData.io, Lark Open API + webhook, OpenAI,
+Anthropic) runs as its own small FastAPI app on a local port, with
+configurable latency and error injection. Lark stand-ins record every
+message they receive so load tools can measure delivery.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Dimension of the fake embedding vectors
+EMBEDDING_DIM = 64
+
+STUB_NAMES = ("newsapi", "newsdata", "lark", "openai", "anthropic")
+
+
+@dataclass
+class StubBehavior:
+    """Latency and error injection settings for one stand-in server."""
+
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+
+    async def apply(self) -> Optional[JSONResponse]:
+        """Sleep for the configured latency and maybe return an injected error."""
+        delay = max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms))
+        await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            return JSONResponse(status_code=503, content={"error": "injected failure"})
+        return None
+
+
+@dataclass
+class LarkRecorder:
+    """Records messages received by the Lark stand-in."""
+
+    messages: List[Dict] = field(default_factory=list)
+    token_requests: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, kind: str, receive_id: Optional[str], body: Dict) -> str:
+        """Store a received message and return its generated message_id."""
+        message_id = f"om_{uuid.uuid4().hex[:16]}"
+        with self._lock:
+            self.messages.append({
+                "kind": kind,
+                "receive_id": receive_id,
+                "message_id": message_id,
+                "body": body,
+                "received_at": time.time(),
+            })
+        return message_id
+
+    def snapshot(self) -> List[Dict]:
+        """Return a copy of all recorded messages."""
+        with self._lock:
+            return list(self.messages)
+
+    def reset(self) -> None:
+        """Forget recorded messages."""
+        with self._lock:
+            self.messages.clear()
+            self.token_requests = 0
+
+
+def fake_embedding(text: str) -> List[float]:
+    """Deterministic pseudo-embedding so Chroma queries behave consistently."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    rng = random.Random(digest)
+    return [rng.uniform(-1.0, 1.0) for _ in range(EMBEDDING_DIM)]
+
+
+_WORDS = (
+    "markets tech climate trade health policy energy transport banks chips rates housing exports "
+    "shipping tourism property insurance airlines retail startups pharma mining oil gas solar wind "
+    "election court budget tariffs jobs wages inflation growth merger lawsuit strike summit treaty "
+    "satellite vaccine drought flood wildfire earthquake typhoon festival museum stadium railway port"
+).split()
+
+
+def _fake_articles(count: int, prefix: str) -> List[Dict]:
+    """Generate plausible article dicts with distinct wording (so they don't cluster as near-duplicates)."""
+    articles = []
+    for i in range(count):
+        rng = random.Random(f"{prefix}:{i}")
+        title_words = rng.sample(_WORDS, 6)
+        articles.append({
+            "title": f"{prefix}: {' '.join(title_words).capitalize()} ({i})",
+            "description": f"Details about {', '.join(rng.sample(_WORDS, 8))}.",
+            "url": f"https://example.com/{prefix.lower().replace(' ', '-')}/{i}",
+            "source": f"{prefix} Wire",
+        })
+    return articles
+
+
+def build_newsapi_app(behavior: StubBehavior) -> FastAPI:
+    """NewsAPI.org stand-in."""
+    app = FastAPI()
+
+    @app.get("/v2/top-headlines")
+    async def top_headlines(pageSize: int = 10, page: int = 1):
+        error = await behavior.apply()
+        if error:
+            return error
+        articles = _fake_articles(pageSize * page, "NewsAPI")[-pageSize:]
+        return {
+            "status": "ok",
+            "totalResults": 100,
+            "articles": [
+                {
+                    "title": a["title"],
+                    "description": a["description"],
+                    "url": a["url"],
+                    "source": {"id": None, "name": a["source"]},
+                    "publishedAt": "2024-01-01T00:00:00Z",
+                }
+                for a in articles
+            ],
+        }
+
+    return app
+
+
+def build_newsdata_app(behavior: StubBehavior) -> FastAPI:
+    """NewsData.io stand-in."""
+    app = FastAPI()
+
+    @app.get("/api/1/news")
+    async def news(category: str = "top", page: Optional[str] = None):
+        error = await behavior.apply()
+        if error:
+            return error
+        page_number = int(page) if page and page.isdigit() else 1
+        articles = _fake_articles(10 * page_number, f"NewsData {category}")[-10:]
+        return {
+            "status": "success",
+            "totalResults": 50,
+            "results": [
+                {
+                    "title": a["title"],
+                    "description": a["description"],
+                    "link": a["url"],
+                    "source_name": a["source"],
+                    "category": [category],
+                    "pubDate": "2024-01-01 00:00:00",
+                }
+                for a in articles
+            ],
+            "nextPage": str(page_number + 1) if page_number < 5 else None,
+        }
+
+    return app
+
+
+def build_lark_app(behavior: StubBehavior, recorder: LarkRecorder) -> FastAPI:
+    """Lark Open API (token + messages) and custom bot webhook stand-in."""
+    app = FastAPI()
+
+    @app.post("/open-apis/auth/v3/tenant_access_token/internal")
+    async def tenant_access_token():
+        error = await behavior.apply()
+        if error:
+            return error
+        recorder.token_requests += 1
+        return {"code": 0, "msg": "ok", "tenant_access_token": f"t-{uuid.uuid4().hex}", "expire": 7200}
+
+    @app.post("/open-apis/im/v1/messages")
+    async def send_message(request: Request, receive_id_type: str = "chat_id"):
+        error = await behavior.apply()
+        if error:
+            return error
+        body = await request.json()
+        message_id = recorder.record("message", body.get("receive_id"), body)
+        return {"code": 0, "msg": "success", "data": {"message_id": message_id}}
+
+    @app.patch("/open-apis/im/v1/messages/{message_id}")
+    async def update_message(message_id: str, request: Request):
+        error = await behavior.apply()
+        if error:
+            return error
+        body = await request.json()
+        body["updated_message_id"] = message_id
+        recorder.record("update", message_id, body)
+        return {"code": 0, "msg": "success"}
+
+    @app.post("/webhook/{hook_id}")
+    async def webhook(hook_id: str, request: Request):
+        error = await behavior.apply()
+        if error:
+            return error
+        body = await request.json()
+        recorder.record("webhook", hook_id, body)
+        return {"code": 0, "msg": "success", "StatusCode": 0}
+
+    return app
+
+
+def build_openai_app(behavior: StubBehavior, completion_words: int = 300) -> FastAPI:
+    """OpenAI chat completions and embeddings stand-in."""
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        error = await behavior.apply()
+        if error:
+            return error
+        body = await request.json()
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": _fake_completion(completion_words)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": completion_words, "total_tokens": 100 + completion_words},
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        error = await behavior.apply()
+        if error:
+            return error
+        body = await request.json()
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        return {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(str(text))}
+                for i, text in enumerate(inputs)
+            ],
+            "model": body.get("model", "stub"),
+            "usage": {"prompt_tokens": 10, "total_tokens": 10},
+        }
+
+    return app
+
+
+def build_anthropic_app(behavior: StubBehavior, completion_words: int = 300) -> FastAPI:
+    """Anthropic messages API stand-in."""
+    app = FastAPI()
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        error = await behavior.apply()
+        if error:
+            return error
+        body = await request.json()
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:12]}",
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": _fake_completion(completion_words)}],
+            "model": body.get("model", "stub"),
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 100, "output_tokens": completion_words},
+        }
+
+    return app
+
+
+def _fake_completion(words: int) -> str:
+    """Markdown-ish filler text of roughly the requested length."""
+    body = " ".join(["lorem"] * max(1, words))
+    return f"# Daily News Summary\n\n## Top Headlines\n\n- {body}\n"
+
+
+def free_port() -> int:
+    """Ask the OS for an unused local port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _ServerThread(threading.Thread):
+    """Runs a uvicorn server in a daemon thread."""
+
+    def __init__(self, app: FastAPI, port: int):
+        super().__init__(daemon=True)
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.port = port
+
+    def run(self):
+        self.server.run()
+
+    def stop(self):
+        self.server.should_exit = True
+
+
+class StubServers:
+    """Starts and stops all upstream stand-ins."""
+
+    def __init__(self, behaviors: Optional[Dict[str, StubBehavior]] = None, completion_words: int = 300):
+        """
+        Initialize stand-ins.
+
+        Args:
+            behaviors: Per-stub latency/error settings keyed by name in STUB_NAMES
+            completion_words: Length of fake LLM completions
+        """
+        behaviors = behaviors or {}
+        self.behaviors = {name: behaviors.get(name, StubBehavior()) for name in STUB_NAMES}
+        self.lark_recorder = LarkRecorder()
+        self._apps = {
+            "newsapi": build_newsapi_app(self.behaviors["newsapi"]),
+            "newsdata": build_newsdata_app(self.behaviors["newsdata"]),
+            "lark": build_lark_app(self.behaviors["lark"], self.lark_recorder),
+            "openai": build_openai_app(self.behaviors["openai"], completion_words),
+            "anthropic": build_anthropic_app(self.behaviors["anthropic"], completion_words),
+        }
+        self.ports: Dict[str, int] = {}
+        self._threads: List[_ServerThread] = []
+
+    def start(self, timeout: float = 10.0) -> None:
+        """Start every stand-in and wait until they accept connections."""
+        for name, app in self._apps.items():
+            port = free_port()
+            thread = _ServerThread(app, port)
+            thread.start()
+            self.ports[name] = port
+            self._threads.append(thread)
+
+        deadline = time.time() + timeout
+        for thread in self._threads:
+            while not thread.server.started:
+                if time.time() > deadline:
+                    raise RuntimeError("Stub servers did not start in time")
+                time.sleep(0.05)
+        logger.info(f"Stub servers started: {self.ports}")
+
+    def stop(self) -> None:
+        """Stop all stand-ins."""
+        for thread in self._threads:
+            thread.stop()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads.clear()
+
+    def url(self, name: str) -> str:
+        """Base URL of a stand-in."""
+        return f"http://127.0.0.1:{self.ports[name]}"
+
+    def app_env(self, llm_provider: str = "openai") -> Dict[str, str]:
+        """
+        Environment variables that point the application at the stand-ins.
+
+        Args:
+            llm_provider: Provider the app should use ('openai' or 'anthropic')
+
+        Returns:
+            Dict of environment overrides
+        """
+        return {
+            "LLM_PROVIDER": llm_provider,
+            "OPENAI_API_KEY": "stub-openai-key",
+            "OPENAI_BASE_URL": f"{self.url('openai')}/v1",
+            "ANTHROPIC_API_KEY": "stub-anthropic-key",
+            "ANTHROPIC_BASE_URL": self.url("anthropic"),
+            "NEWSAPI_KEY": "stub-newsapi-key",
+            "NEWSAPI_BASE_URL": self.url("newsapi"),
+            "NEWSDATA_KEY": "stub-newsdata-key",
+            "NEWSDATA_BASE_URL": self.url("newsdata"),
+            "LARK_WEBHOOK_URL": f"{self.url('lark')}/webhook/bench",
+            "LARK_APP_ID": "cli_stub",
+            "LARK_APP_SECRET": "stub-secret",
+            "LARK_BASE_URL": self.url("lark"),
+        }
+
+    def __enter__(self) -> "StubServers":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -21,24 +21,194 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key")
     anthropic_api_key: Optional[str] = Field(default=None, description="Anthropic API key")
     anthropic_base_url: Optional[str] = Field(default=None, description="Anthropic API base URL")
+    openai_base_url: Optional[str] = Field(default=None, description="OpenAI API base URL (defaults to the SDK's)")
+
+    # LLM response cache
+    llm_cache_enabled: bool = Field(default=False, description="Cache LLM responses by prompt hash")
+    llm_cache_ttl_seconds: float = Field(default=86400.0, description="Max age of a cached LLM response")
+    llm_cache_max_entries: int = Field(default=512, description="In-memory LRU size in front of the SQLite cache")
+
+    # Request deadlines
+    request_deadline_seconds: float = Field(
+        default=45.0,
+        description="Time budget for interactive requests (manual NewsBot runs, Lark mentions, compliance queries); 0 disables",
+    )
+    deadline_send_reserve_seconds: float = Field(
+        default=5.0, description="Part of the request deadline held back for sending the reply"
+    )
+
+    # Agent worker pools (full pools answer 429 / a Lark "busy" reply)
+    agent_max_concurrency: int = Field(
+        default=6, description="Max agent runs executing at once across all pools; compliance first, scheduled last"
+    )
+    compliance_pool_workers: int = Field(default=4, description="Concurrent compliance queries")
+    compliance_pool_queue_size: int = Field(default=16, description="Compliance queries waiting for a worker")
+    newsbot_pool_workers: int = Field(default=2, description="Concurrent manual and Lark-triggered NewsBot runs")
+    newsbot_pool_queue_size: int = Field(default=4, description="NewsBot runs waiting for a worker")
+    scheduled_pool_workers: int = Field(default=2, description="Concurrent scheduled digest preparations")
+    scheduled_pool_queue_size: int = Field(default=8, description="Scheduled preparations waiting for a worker")
+
+    # LLM failover and hedging
+    llm_fallback_provider: Optional[str] = Field(
+        default=None, description="Second LLM provider for hedged requests and failover; unset to use only LLM_PROVIDER"
+    )
+    llm_hedge_enabled: bool = Field(
+        default=True, description="Also ask the fallback provider once the primary runs past its p95 latency"
+    )
+    llm_hedge_min_samples: int = Field(default=20, description="Latency samples needed before hedging at the p95")
+    llm_hedge_default_delay_seconds: float = Field(
+        default=15.0, description="Hedge delay used until enough latency samples are collected"
+    )
+    llm_hedge_max_workers: int = Field(default=8, description="Max concurrent LLM calls in multi-provider mode")
+    llm_latency_window: int = Field(default=100, description="Recent calls per provider used for the latency p95")
+    llm_breaker_failure_threshold: int = Field(
+        default=5, description="Consecutive LLM failures that open a provider's circuit breaker"
+    )
+    llm_breaker_recovery_seconds: float = Field(
+        default=60.0, description="Seconds a provider's circuit stays open before a trial call"
+    )
 
     # Embeddings
     embedding_model: str = Field(default="text-embedding-ada-002", description="Embedding model name")
+    embedding_cache_size: int = Field(default=256, description="Query embeddings kept in memory")
+    embedding_breaker_failure_threshold: int = Field(
+        default=5, description="Consecutive embedding API failures that open its circuit breaker"
+    )
+    embedding_breaker_recovery_seconds: float = Field(
+        default=30.0, description="Seconds the embeddings circuit stays open before a trial call"
+    )
 
     # Lark Webhook
     lark_webhook_url: Optional[str] = Field(default=None, description="Lark webhook URL")
+    lark_webhook_prefixes: str = Field(
+        default="https://open.larksuite.com/open-apis/bot/v2/hook/,https://open.feishu.cn/open-apis/bot/v2/hook/",
+        description="Comma-separated URL prefixes that broadcast webhook URLs must start with",
+    )
     
     # Lark Bot (for receiving messages)
     lark_app_id: Optional[str] = Field(default=None, description="Lark bot app ID")
     lark_app_secret: Optional[str] = Field(default=None, description="Lark bot app secret")
+    lark_base_url: str = Field(default="https://open.larksuite.com", description="Lark Open API base URL")
+    lark_token_refresh_margin_seconds: float = Field(
+        default=600.0, description="Refresh the tenant access token this long before it expires (under 30 minutes)"
+    )
+    lark_token_shared_cache: bool = Field(
+        default=True, description="Share the tenant access token between workers via the local SQLite state file"
+    )
+
+    # Lark outbound dispatcher
+    lark_app_rate_per_second: float = Field(default=50.0, description="Max Open API message sends per second for the app")
+    lark_chat_rate_per_second: float = Field(default=5.0, description="Max sends per second to one chat or webhook")
+    lark_dispatch_workers: int = Field(default=4, description="Threads sending queued Lark messages")
+    lark_queue_max_size: int = Field(default=1000, description="Max queued outbound Lark messages")
+    lark_send_max_attempts: int = Field(default=5, description="Attempts per Lark message before giving up")
+    lark_retry_base_seconds: float = Field(default=0.5, description="Base delay for Lark retry backoff")
+    lark_retry_max_seconds: float = Field(default=30.0, description="Max delay for Lark retry backoff")
+    broadcast_max_concurrency: int = Field(default=8, description="Max digest broadcast sends in flight at once")
+    lark_send_timeout_seconds: float = Field(default=120.0, description="How long a sender waits for its message to go out")
 
     # News APIs
     newsapi_key: Optional[str] = Field(default=None, description="NewsAPI.org API key")
     newsdata_key: Optional[str] = Field(default=None, description="NewsData.io API key")
+    newsapi_base_url: str = Field(default="https://newsapi.org", description="NewsAPI.org base URL")
+    newsdata_base_url: str = Field(default="https://newsdata.io", description="NewsData.io base URL")
+
+    news_fetch_page_size: int = Field(default=10, description="Articles per NewsAPI page")
+    news_fetch_target_articles: int = Field(
+        default=30, description="Unique articles fetched per provider (over-fetched, then clustered)"
+    )
+    news_fetch_max_pages: int = Field(default=5, description="Max pages fetched per provider request")
+    news_fetch_concurrency: int = Field(default=3, description="Max NewsAPI pages fetched at once")
+    news_max_headlines: int = Field(default=20, description="Max stories sent to the LLM after clustering")
+    news_dedup_threshold: float = Field(
+        default=0.33, description="Headline similarity (Jaccard of character n-grams, 0-1) at which articles are the same story"
+    )
+    news_dedup_description_threshold: float = Field(
+        default=0.7, description="Description similarity (Jaccard of character 5-grams, 0-1) at which articles are the same story"
+    )
+    news_source_priority: str = Field(
+        default="Reuters,Associated Press,AP,BBC News,BBC,South China Morning Post,SCMP,Hong Kong Free Press,HKFP",
+        description="Comma-separated source names, most preferred first, for ranking stories into the prompt budget",
+    )
+    news_breaker_failure_threshold: int = Field(
+        default=3, description="Consecutive failed fetches that open a news provider's circuit breaker"
+    )
+    news_breaker_recovery_seconds: float = Field(
+        default=60.0, description="Seconds a news provider's circuit stays open before a trial fetch"
+    )
+    news_stale_max_age_seconds: float = Field(
+        default=21600.0, description="Max age of the last good headlines served when every provider fails"
+    )
+    newsbot_prompt_token_budget: int = Field(
+        default=2500, description="Max tokens of story text (titles, sources, descriptions) sent to the LLM per digest"
+    )
+    newsbot_description_tokens: int = Field(
+        default=60, description="Max tokens of description per story in the prompt (0 for titles only)"
+    )
+    newsbot_map_reduce: bool = Field(
+        default=True, description="Summarize category groups concurrently instead of in one long generation"
+    )
+    newsbot_map_group_size: int = Field(default=6, description="Max stories per map-reduce summary call")
+    newsbot_map_workers: int = Field(default=4, description="Max concurrent map-reduce summary calls")
+    newsbot_map_max_tokens: int = Field(default=600, description="Max output tokens per map-reduce summary call")
+    newsbot_summary_merge: str = Field(
+        default="template", description="Top Headlines section: 'template' or 'llm' (one extra short call)"
+    )
+    newsbot_only_new_articles: bool = Field(
+        default=True, description="Summarize only stories first seen since the last scheduled digest for the category"
+    )
+    article_retention_days: float = Field(default=30.0, description="Days to keep seen articles in the article store")
 
     # Vector Store
     chroma_persist_dir: str = Field(default="./chroma_db", description="ChromaDB persistence directory")
 
+    # Startup
+    warmup_enabled: bool = Field(default=True, description="Run the warmup routine in the background after startup")
+    warmup_steps: str = Field(
+        default="components,lark_token,connections,vector_index,encoders",
+        description="Comma-separated warmup steps to run, in order",
+    )
+    warmup_timeout_seconds: float = Field(default=60.0, description="Report ready after this long even if warmup is unfinished")
+
+    # HTTP connection pooling
+    http_max_connections: int = Field(default=20, description="Max pooled connections per HTTP client")
+    http_keepalive_seconds: float = Field(default=60.0, description="Idle time before a pooled connection is closed")
+
+    # Local state (SQLite file shared by all workers on a host)
+    state_db_path: str = Field(default="./data/state.db", description="SQLite file for leases and local stores")
+    digest_history_enabled: bool = Field(
+        default=True, description="Record every prepared digest so past digests can be served without refetching"
+    )
+    digest_history_max_age_seconds: int = Field(
+        default=86400, description="Cache-Control max-age for /news/history responses about past dates"
+    )
+
+    # Scheduler
+    scheduler_timezone: str = Field(default="Asia/Hong_Kong", description="Timezone for scheduled jobs")
+    newsbot_deliver_time: str = Field(default="07:30", description="Daily digest delivery time (HH:MM)")
+    newsbot_prepare_time: Optional[str] = Field(
+        default="07:20", description="Time to fetch and summarize ahead of delivery (HH:MM, empty to run inline)"
+    )
+    newsbot_prepare_wait_seconds: float = Field(
+        default=120.0, description="How long delivery waits for a still-running prepare before running inline"
+    )
+    newsbot_digest_max_age_seconds: float = Field(
+        default=3600.0, description="How long a prepared digest can be shared by jobs of the same category"
+    )
+    newsbot_jobs: Optional[str] = Field(
+        default=None, description="Digest jobs as a JSON list or a path to a JSON file (defaults to one daily job)"
+    )
+    scheduler_max_workers: int = Field(default=4, description="Max scheduled jobs running at once")
+    scheduler_jitter_seconds: int = Field(default=60, description="Random delay added to job start times")
+
+    # Scheduler leader election
+    leader_election_enabled: bool = Field(default=True, description="Only the elected worker runs scheduled jobs")
+    leader_lease_seconds: float = Field(default=30.0, description="Leader lease duration")
+    leader_heartbeat_seconds: float = Field(default=10.0, description="Leader lease renewal interval")
+
+    # Debugging
+    admin_token: Optional[str] = Field(default=None, description="Token required for admin-only features (broadcasts, request profiling)")
+
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
 
@@ -46,18 +216,19 @@ class Settings(BaseSettings):
     host: str = Field(default="0.0.0.0", description="Server host")
     port: int = Field(default=8000, description="Server port (Render sets PORT)")
 
-    def get_llm_api_key(self) -> str:
-        """Get the appropriate API key based on provider."""
-        if self.llm_provider.lower() == "openai":
+    def get_llm_api_key(self, provider: Optional[str] = None) -> str:
+        """Get the API key for a provider (defaults to LLM_PROVIDER)."""
+        provider = (provider or self.llm_provider).lower()
+        if provider == "openai":
             if not self.openai_api_key:
                 raise ValueError("OPENAI_API_KEY is required when LLM_PROVIDER=openai")
             return self.openai_api_key
-        elif self.llm_provider.lower() == "anthropic":
+        elif provider == "anthropic":
             if not self.anthropic_api_key:
                 raise ValueError("ANTHROPIC_API_KEY is required when LLM_PROVIDER=anthropic")
             return self.anthropic_api_key
         else:
-            raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
+            raise ValueError(f"Unsupported LLM provider: {provider}")
 
     def validate(self) -> None:
         """Validate required settings."""
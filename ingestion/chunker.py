@@ -2,7 +2,8 @@
 
 import logging
 from typing import List
-import tiktoken
+
+from services.tokenizer import get_encoding
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ class Chunker:
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.encoding = get_encoding(encoding_name)
         logger.info(f"Initialized chunker: chunk_size={chunk_size}, overlap={chunk_overlap}")
 
     def chunk_text(self, text: str) -> List[str]:
@@ -0,0 +1,307 @@
+"""Bounded, prioritized worker pools for agent runs."""
+
+import contextvars
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services import deadline
+from services.metrics import AGENT_REJECTIONS, QUEUE_DEPTH
+from services.tracing import worker_profile
+
+logger = logging.getLogger(__name__)
+
+# Pool names
+POOL_COMPLIANCE = "compliance"  # interactive compliance queries
+POOL_NEWSBOT = "newsbot"  # manual and Lark-triggered digests, broadcasts
+POOL_SCHEDULED = "scheduled"  # scheduled digest preparation
+
+# Lower value = gets a free execution slot first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Bounds on the Retry-After hint given to rejected callers
+_MIN_RETRY_AFTER = 1
+_MAX_RETRY_AFTER = 60
+# Weight of the newest run in the average run time
+_DURATION_ALPHA = 0.2
+
+
+class AgentBusyError(Exception):
+    """An agent pool is at capacity; the caller should retry later."""
+
+    def __init__(self, pool: str, retry_after: int):
+        super().__init__(f"The {pool} agent is busy, retry in {retry_after}s")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class PrioritySlots:
+    """
+    Counting semaphore that hands free slots to the highest-priority waiter.
+
+    Bounds how many agent runs execute at once across all pools (and so how
+    many LLM calls are in flight); waiters of equal priority go in arrival order.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize slots.
+
+        Args:
+            limit: Max slots held at once
+        """
+        self.limit = limit
+        self._used = 0
+        self._waiters: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def acquire(self, priority: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+            timeout: Max seconds to wait (None to wait indefinitely)
+
+        Returns:
+            True if a slot was acquired, False on timeout
+        """
+        entry = (priority, next(self._seq))
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            while self._used >= self.limit or self._waiters[0] != entry:
+                wait = None if give_up_at is None else give_up_at - time.monotonic()
+                if wait is not None and wait <= 0:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait(wait)
+            heapq.heappop(self._waiters)
+            self._used += 1
+            # The next waiter may be able to take a slot too
+            self._cond.notify_all()
+            return True
+
+    def release(self) -> None:
+        """Return a slot."""
+        with self._cond:
+            self._used -= 1
+            self._cond.notify_all()
+
+
+class AgentPool:
+    """
+    Worker pool for one kind of agent run.
+
+    At most `workers` runs execute at once and at most `max_queue` more wait;
+    further submissions are rejected at once with AgentBusyError instead of
+    piling up. Each run also takes a slot from the shared PrioritySlots, so
+    pools with higher priority get free capacity first. Runs execute in a
+    copy of the submitter's context, so traces and deadlines still apply.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int, priority: int, slots: PrioritySlots):
+        """
+        Initialize pool.
+
+        Args:
+            name: Pool name (for errors, logs and metrics)
+            workers: Max concurrent runs
+            max_queue: Max runs waiting for a worker
+            priority: Priority for shared execution slots
+            slots: Execution slots shared by all pools
+        """
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.priority = priority
+        self.slots = slots
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"agent-{name}")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._avg_seconds: Optional[float] = None
+
+    def retry_after(self) -> int:
+        """Seconds until the pool is likely to have room, estimated from recent run times."""
+        with self._lock:
+            queued = max(0, self._pending - self._running)
+            average = self._avg_seconds
+        if average is None:
+            return _MIN_RETRY_AFTER
+        estimate = math.ceil(average * (queued // self.workers + 1))
+        return max(_MIN_RETRY_AFTER, min(_MAX_RETRY_AFTER, estimate))
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Queue a run.
+
+        Args:
+            func: Callable to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future resolving to func's result
+
+        Raises:
+            AgentBusyError: If the pool and its queue are full
+        """
+        with self._lock:
+            full = self._pending >= self.workers + self.max_queue
+            if not full:
+                self._pending += 1
+        if full:
+            AGENT_REJECTIONS.labels(pool=self.name).inc()
+            retry_after = self.retry_after()
+            logger.warning(f"Rejected {self.name} agent run: pool is full (retry in {retry_after}s)")
+            raise AgentBusyError(self.name, retry_after)
+
+        self._update_depth()
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._execute, func, args, kwargs)
+        future.add_done_callback(self._done)
+        return future
+
+    def run(self, func: Callable, *args, **kwargs):
+        """
+        Run func on the pool and wait for its result.
+
+        Under a request deadline, a run still queued when the deadline passes
+        is cancelled and rejected as busy; a run that has started is waited for,
+        since the agent itself stops work at the deadline.
+
+        Returns:
+            func's result
+
+        Raises:
+            AgentBusyError: If the pool is full, or the run didn't start in time
+        """
+        future = self.submit(func, *args, **kwargs)
+        try:
+            return future.result(timeout=deadline.remaining())
+        except FutureTimeoutError:
+            if future.cancel():
+                AGENT_REJECTIONS.labels(pool=self.name).inc()
+                raise AgentBusyError(self.name, self.retry_after())
+            return future.result()
+
+    def _execute(self, func: Callable, args: tuple, kwargs: Dict):
+        """Run func in a worker thread, holding a shared execution slot."""
+        if not self.slots.acquire(self.priority, timeout=deadline.remaining()):
+            AGENT_REJECTIONS.labels(pool=self.name).inc()
+            raise AgentBusyError(self.name, self.retry_after())
+        with self._lock:
+            self._running += 1
+        self._update_depth()
+        start = time.perf_counter()
+        try:
+            with worker_profile():
+                return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            self.slots.release()
+            with self._lock:
+                self._running -= 1
+                if self._avg_seconds is None:
+                    self._avg_seconds = duration
+                else:
+                    self._avg_seconds += _DURATION_ALPHA * (duration - self._avg_seconds)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._update_depth()
+
+    def _update_depth(self) -> None:
+        with self._lock:
+            queued = max(0, self._pending - self._running)
+        QUEUE_DEPTH.labels(queue=f"agent_{self.name}").set(queued)
+
+    def status(self) -> Dict:
+        """Pool capacity and load for status endpoints."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "priority": self.priority,
+                "running": self._running,
+                "queued": max(0, self._pending - self._running),
+            }
+
+    def shutdown(self) -> None:
+        """Cancel queued runs and stop the workers once running ones finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AgentPools:
+    """The agent pools (compliance, NewsBot, scheduled digests) and their shared execution slots."""
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        """
+        Initialize pools from settings.
+
+        Args:
+            max_concurrency: Max runs executing at once across all pools (defaults to settings)
+        """
+        self.slots = PrioritySlots(max_concurrency or settings.agent_max_concurrency)
+        self._pools = {
+            POOL_COMPLIANCE: AgentPool(
+                POOL_COMPLIANCE,
+                settings.compliance_pool_workers,
+                settings.compliance_pool_queue_size,
+                PRIORITY_HIGH,
+                self.slots,
+            ),
+            POOL_NEWSBOT: AgentPool(
+                POOL_NEWSBOT,
+                settings.newsbot_pool_workers,
+                settings.newsbot_pool_queue_size,
+                PRIORITY_NORMAL,
+                self.slots,
+            ),
+            POOL_SCHEDULED: AgentPool(
+                POOL_SCHEDULED,
+                settings.scheduled_pool_workers,
+                settings.scheduled_pool_queue_size,
+                PRIORITY_LOW,
+                self.slots,
+            ),
+        }
+        logger.info(
+            f"Initialized agent pools: {', '.join(f'{name}={pool.workers}' for name, pool in self._pools.items())}"
+            f" (max {self.slots.limit} concurrent)"
+        )
+
+    def __getitem__(self, name: str) -> AgentPool:
+        return self._pools[name]
+
+    def run(self, name: str, func: Callable, *args, **kwargs):
+        """Run func on the named pool and wait for its result (see `AgentPool.run`)."""
+        return self._pools[name].run(func, *args, **kwargs)
+
+    def statuses(self) -> Dict[str, Dict]:
+        """Status of each pool."""
+        return {name: pool.status() for name, pool in self._pools.items()}
+
+    def shutdown(self) -> None:
+        """Shut down every pool."""
+        for pool in self._pools.values():
+            pool.shutdown()
@@ -0,0 +1,172 @@
+"""Persistent store of seen news articles, for cross-day deduplication."""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that identify a campaign or referrer, not the article
+_TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ocid", "taid", "ito"}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize an article URL so the same story maps to one key.
+
+    Lowercases the scheme and host, drops 'www.', the fragment, tracking
+    parameters (utm_*, fbclid, ...) and trailing slashes, sorts the
+    remaining query parameters, and treats http and https as the same.
+
+    Args:
+        url: Article URL
+
+    Returns:
+        Canonical URL
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    scheme = "https" if parts.scheme.lower() in ("http", "https", "") else parts.scheme.lower()
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class ArticleStore:
+    """
+    SQLite store of every article fetched, keyed by canonical URL.
+
+    Records when and from which provider each article was first seen, and
+    when each digest scope (category) was last delivered, so NewsBot can
+    summarize only stories that are new since the previous digest.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize article store.
+
+        Args:
+            db_path: SQLite file (defaults to settings)
+        """
+        self._conn = connect(db_path or settings.state_db_path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS articles (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                source TEXT,
+                provider TEXT,
+                first_seen_at REAL NOT NULL,
+                last_seen_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_first_seen ON articles (first_seen_at)")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS digest_marks (
+                scope TEXT PRIMARY KEY,
+                seen_until REAL NOT NULL
+            )"""
+        )
+
+    def record(self, articles: List[Dict[str, str]], provider: str) -> None:
+        """
+        Record fetched articles, keeping the first-seen time and provider of known ones.
+
+        Args:
+            articles: Article dicts with 'title', 'url' and 'source' keys
+            provider: Provider the articles came from
+        """
+        now = time.time()
+        rows = [
+            (canonicalize_url(a["url"]), a["url"], a["title"], a.get("source"), provider, now, now)
+            for a in articles if a.get("url")
+        ]
+        with self._lock:
+            self._conn.executemany(
+                """INSERT INTO articles (url_key, url, title, source, provider, first_seen_at, last_seen_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_key) DO UPDATE SET last_seen_at = excluded.last_seen_at""",
+                rows,
+            )
+
+    def first_seen(self, urls: List[str]) -> Dict[str, float]:
+        """Map canonical URL to first-seen time for the given URLs that are known."""
+        keys = list({canonicalize_url(url) for url in urls})
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url_key, first_seen_at FROM articles WHERE url_key IN ({placeholders})", keys
+            ).fetchall()
+        return {row["url_key"]: row["first_seen_at"] for row in rows}
+
+    def last_digest(self, scope: str) -> float:
+        """Time up to which articles were covered by the last digest for a scope (0 if none)."""
+        with self._lock:
+            row = self._conn.execute("SELECT seen_until FROM digest_marks WHERE scope = ?", (scope,)).fetchone()
+        return row["seen_until"] if row else 0.0
+
+    def mark_digest(self, scope: str, seen_until: float) -> None:
+        """Record that a digest covering articles seen up to `seen_until` was delivered."""
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO digest_marks (scope, seen_until) VALUES (?, ?)
+                ON CONFLICT(scope) DO UPDATE SET seen_until = MAX(seen_until, excluded.seen_until)""",
+                (scope, seen_until),
+            )
+
+    def new_since_last_digest(self, articles: List[Dict[str, str]], scope: str) -> List[Dict[str, str]]:
+        """
+        Filter articles to those first seen after the last digest for a scope.
+
+        Articles not in the store (never recorded) count as new.
+
+        Args:
+            articles: Article dicts with a 'url' key
+            scope: Digest scope (e.g. category)
+
+        Returns:
+            New articles, in their original order
+        """
+        since = self.last_digest(scope)
+        seen = self.first_seen([a["url"] for a in articles if a.get("url")])
+        return [
+            a for a in articles
+            if seen.get(canonicalize_url(a.get("url", "")), float("inf")) > since
+        ]
+
+    def prune(self, older_than_days: Optional[float] = None) -> int:
+        """
+        Delete articles not seen for a while.
+
+        Args:
+            older_than_days: Age cutoff (defaults to settings)
+
+        Returns:
+            Number of articles deleted
+        """
+        days = older_than_days if older_than_days is not None else settings.article_retention_days
+        cutoff = time.time() - days * 86400
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM articles WHERE last_seen_at < ?", (cutoff,))
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} articles from the article store")
+        return cursor.rowcount
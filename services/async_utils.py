@@ -0,0 +1,69 @@
+"""Helpers for calling async code from the synchronous parts of the app."""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_io_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide event loop for async I/O, started on first use.
+
+    The loop runs forever on a daemon thread, so async clients bound to it
+    (see `services.http_client.get_async_http_client`) keep their pooled
+    connections between calls.
+    """
+    global _loop, _thread
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                _thread = threading.Thread(target=loop.run_forever, name="io-loop", daemon=True)
+                _thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    The coroutine runs on the shared I/O loop, in a copy of the caller's
+    context so traces and deadlines still apply, while the calling thread
+    waits for the result. Must not be called from the I/O loop itself.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    loop = get_io_loop()
+    # The task is created in the callback scheduled here, so it inherits this context
+    future = contextvars.copy_context().run(asyncio.run_coroutine_threadsafe, coro, loop)
+    return future.result()
+
+
+def stop_io_loop() -> None:
+    """Stop the shared I/O loop (pending work is abandoned)."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            return
+        _loop.call_soon_threadsafe(_loop.stop)
+        _thread.join(timeout=5)
+        if not _loop.is_running():
+            _loop.close()
+        _loop = None
+        _thread = None
+    logger.info("Stopped shared I/O loop")
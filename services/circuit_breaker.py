@@ -0,0 +1,143 @@
+"""Circuit breaker for calls to unreliable upstream services."""
+
+import logging
+import threading
+import time
+from typing import Dict
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.metrics import CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+_registry: Dict[str, "CircuitBreaker"] = {}
+_registry_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because its circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a service after repeated failures, then probes it again.
+
+    - closed: calls go through; `failure_threshold` consecutive failures open it
+    - open: calls are refused for `recovery_seconds`
+    - half_open: one trial call is let through; success closes the circuit,
+      failure opens it again
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Name for logs, metrics and status endpoints
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_seconds: How long the circuit stays open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.labels(name=name).set(_STATE_VALUES[CLOSED])
+        with _registry_lock:
+            _registry[name] = self
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the recovery time has passed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.warning(f"Circuit '{self.name}' {self._state} -> {state}")
+        self._state = state
+        CIRCUIT_STATE.labels(name=self.name).set(_STATE_VALUES[state])
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go ahead.
+
+        In half-open state only one caller gets True until its result is recorded.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def release(self) -> None:
+        """Forget an allowed call that says nothing about the service's health (e.g. cut short by the caller)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def status(self) -> Dict:
+        """Breaker status for status endpoints."""
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == OPEN:
+                retry_in = round(max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at)), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in_seconds": retry_in,
+            }
+
+
+def get_breaker(name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0) -> CircuitBreaker:
+    """Get the process-wide breaker with this name, creating it on first use."""
+    with _registry_lock:
+        breaker = _registry.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(name, failure_threshold=failure_threshold, recovery_seconds=recovery_seconds)
+    return breaker
+
+
+def breaker_statuses() -> Dict[str, Dict]:
+    """Status of every breaker in the process."""
+    with _registry_lock:
+        breakers = list(_registry.values())
+    return {breaker.name: breaker.status() for breaker in breakers}
@@ -0,0 +1,81 @@
+"""Per-request deadlines that propagate through every stage of a request."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage starts or waits after the request deadline."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float] = None, reserve: float = 0.0) -> Iterator[Optional[float]]:
+    """
+    Set the deadline for the wrapped block.
+
+    The deadline lives in a context variable, so it follows the request into
+    spans, `contextvars.copy_context()` worker threads and `run_sync`. Nested
+    deadlines can only shorten the enclosing one.
+
+    Args:
+        seconds: Budget from now (None or 0 keeps the enclosing deadline)
+        reserve: Seconds to hold back from the enclosing deadline for later
+            stages (e.g. sending the reply after the LLM stage)
+
+    Yields:
+        Seconds remaining in the new deadline, or None if there is none
+    """
+    current = _deadline.get()
+    candidates = []
+    if seconds:
+        candidates.append(time.monotonic() + seconds)
+    if current is not None:
+        candidates.append(current - reserve)
+    token = _deadline.set(min(candidates) if candidates else None)
+    try:
+        yield remaining()
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the active deadline (may be negative), or None without one."""
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+
+def check(stage: str) -> None:
+    """
+    Fail fast if the deadline has already passed.
+
+    Args:
+        stage: Stage name for the error message
+
+    Raises:
+        DeadlineExceeded: If the active deadline has passed
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+
+def timeout(default: float, floor: float = 0.0) -> float:
+    """
+    Timeout for a blocking call: the default, capped by the time remaining.
+
+    Args:
+        default: Timeout to use without a deadline
+        floor: Minimum timeout even if the deadline has passed (for stages
+            that must still run, like sending a degraded reply)
+
+    Returns:
+        Timeout in seconds
+    """
+    left = remaining()
+    if left is None:
+        return default
+    return min(default, max(left, floor))
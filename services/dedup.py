@@ -0,0 +1,196 @@
+"""Near-duplicate article clustering with MinHash and LSH."""
+
+import hashlib
+import logging
+import random
+import re
+from typing import Dict, List, Optional, Set
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_POSSESSIVE_RE = re.compile(r"['’]s\b")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "over", "says", "said", "that", "the", "to", "was", "were", "will", "with",
+}
+# Character n-gram sizes. Wire rewrites of one story reorder and inflect words
+# ("China's exports rise" / "China exports rose"), which word shingles miss
+_MIN_GRAM = 3
+_MAX_GRAM = 5
+# Descriptions are long enough that 5-grams alone separate stories; shorter
+# ones are usually boilerplate ("Click to read more") and are ignored
+_DESCRIPTION_GRAM = 5
+_MIN_DESCRIPTION_WORDS = 6
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase title words without punctuation, possessives or stopwords."""
+    words = _TOKEN_RE.findall(_POSSESSIVE_RE.sub("", title.lower()))
+    return " ".join(word for word in words if word not in _STOPWORDS)
+
+
+def _shingles(article: Dict[str, str]) -> Set[str]:
+    """Character 3- to 5-grams of the normalized title."""
+    text = normalize_title(article.get("title", ""))
+    return {
+        text[i:i + size]
+        for size in range(_MIN_GRAM, _MAX_GRAM + 1)
+        for i in range(len(text) - size + 1)
+    }
+
+
+def _description_shingles(article: Dict[str, str]) -> Set[str]:
+    """Character 5-grams of the normalized description (empty if it is missing or too short)."""
+    text = normalize_title(article.get("description") or "")
+    if len(text.split()) < _MIN_DESCRIPTION_WORDS:
+        return set()
+    return {text[i:i + _DESCRIPTION_GRAM] for i in range(len(text) - _DESCRIPTION_GRAM + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures using random universal hash permutations."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """
+        Initialize hasher.
+
+        Args:
+            num_perm: Signature length
+            seed: Seed for the permutations (fixed so signatures are comparable)
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Set[str]) -> List[int]:
+        """MinHash signature of a shingle set."""
+        if not shingles:
+            return [_MAX_HASH] * self.num_perm
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+
+def cluster_articles(
+    articles: List[Dict[str, str]],
+    threshold: Optional[float] = None,
+    description_threshold: Optional[float] = None,
+    num_perm: int = 64,
+    bands: int = 32,
+) -> List[Dict]:
+    """
+    Collapse near-duplicate articles into one representative per story.
+
+    Articles are bucketed by LSH over MinHash signatures of character
+    n-grams of their normalized title, and separately of their description.
+    An article joins a cluster when the exact Jaccard similarity of its
+    title n-grams and those of the cluster's first article meets the
+    threshold, or that of their descriptions meets the (stricter)
+    description threshold. Each article is only compared with the first
+    member of the buckets it lands in, so this is linear in the number of
+    articles.
+
+    The default title threshold (0.33) sits between reworded wire headlines
+    for one story (typically 0.4-0.8) and different stories sharing a subject
+    (up to ~0.3, e.g. "China's exports rise" / "Japan's exports rise").
+    Descriptions carry less weight: outlets often rewrite the headline but
+    reuse the wire lede, so a near-copy description (default 0.7) marks the
+    same story, while templated ledes for different stories (~0.6, e.g.
+    "exports grew 8% ... customs data showed" / "imports fell 2% ...") don't.
+
+    Args:
+        articles: Article dicts with 'title', 'source' and optionally 'description'
+        threshold: Min title Jaccard similarity to merge (defaults to settings)
+        description_threshold: Min description Jaccard similarity to merge (defaults to settings)
+        num_perm: MinHash signature length
+        bands: LSH bands (num_perm must divide evenly); more bands catch lower similarities.
+            The default (2 rows per band) makes pairs at 0.33 similarity candidates ~97% of
+            the time, and pairs at 0.4 >99% of the time
+
+    Returns:
+        Representatives in input order (the first article of each cluster),
+        each with a 'sources' list of every source that ran the story
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    threshold = threshold if threshold is not None else settings.news_dedup_threshold
+    if description_threshold is None:
+        description_threshold = settings.news_dedup_description_threshold
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm)
+    shingles = [_shingles(article) for article in articles]
+    descriptions = [_description_shingles(article) for article in articles]
+
+    parent = list(range(len(articles)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def similar(i: int, j: int) -> bool:
+        return (
+            _jaccard(shingles[i], shingles[j]) >= threshold
+            or _jaccard(descriptions[i], descriptions[j]) >= description_threshold
+        )
+
+    # Title and description signatures go in separate LSH buckets
+    buckets: Dict[tuple, int] = {}
+    for i in range(len(articles)):
+        for field, field_shingles in (("title", shingles[i]), ("description", descriptions[i])):
+            if not field_shingles:
+                continue
+            signature = hasher.signature(field_shingles)
+            for band in range(bands):
+                key = (field, band, tuple(signature[band * rows:(band + 1) * rows]))
+                first = buckets.setdefault(key, i)
+                if first == i:
+                    continue
+                root_i, root_first = find(i), find(first)
+                if root_i != root_first and similar(i, root_first):
+                    # Keep the earlier article as the root, so it becomes the representative
+                    parent[max(root_i, root_first)] = min(root_i, root_first)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(articles)):
+        clusters.setdefault(find(i), []).append(i)
+
+    representatives = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        representative = dict(articles[root])
+        sources = []
+        for i in members:
+            source = articles[i].get("source", "Unknown")
+            if source not in sources:
+                sources.append(source)
+        representative["sources"] = sources
+        representatives.append(representative)
+
+    merged = len(articles) - len(representatives)
+    if merged:
+        logger.info(f"Clustered {len(articles)} articles into {len(representatives)} stories")
+    return representatives
@@ -0,0 +1,182 @@
+"""Append-only history of NewsBot digests."""
+
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import pytz
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.metrics import record_cache
+from services.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+# Decoded digest bodies kept in memory; rows never change once written
+_BODY_CACHE_SIZE = 64
+
+
+def digest_date(timestamp: Optional[float] = None) -> str:
+    """Calendar date (YYYY-MM-DD) of a time in SCHEDULER_TIMEZONE (defaults to now)."""
+    tz = pytz.timezone(settings.scheduler_timezone)
+    moment = datetime.fromtimestamp(timestamp if timestamp is not None else time.time(), tz)
+    return moment.date().isoformat()
+
+
+class DigestHistory:
+    """
+    SQLite store of every digest NewsBot has prepared.
+
+    Each row holds the digest's category, date (in SCHEDULER_TIMEZONE),
+    timestamps and stage timings as columns for filtering, and the summary
+    and compact headline list as one zlib-compressed JSON body. Rows are
+    only ever appended, so past digests can be served without any news
+    fetch or LLM call, and decoded bodies can be cached indefinitely.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize digest history.
+
+        Args:
+            db_path: SQLite file (defaults to settings)
+        """
+        self._conn = connect(db_path or settings.state_db_path)
+        self._lock = threading.Lock()
+        self._bodies: "OrderedDict[int, Dict]" = OrderedDict()
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS digests (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL,
+                digest_date TEXT NOT NULL,
+                prepared_at REAL NOT NULL,
+                headlines_count INTEGER NOT NULL,
+                degraded INTEGER NOT NULL,
+                timings TEXT,
+                body BLOB NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS digests_date ON digests (digest_date, category)")
+
+    def append(self, prepared: Dict, scope: str) -> int:
+        """
+        Record a prepared digest.
+
+        Args:
+            prepared: Result of `NewsBot.prepare`
+            scope: Digest scope (category, or 'general')
+
+        Returns:
+            The digest's history ID
+        """
+        prepared_at = time.time()
+        headlines = [
+            {"title": h["title"], "url": h.get("url"), "sources": h.get("sources") or [h.get("source")]}
+            for h in prepared["headlines"]
+        ]
+        body = zlib.compress(
+            json.dumps({"summary": prepared["summary"], "headlines": headlines}, separators=(",", ":")).encode("utf-8")
+        )
+        timings = dict(prepared.get("timings") or {})
+        if prepared.get("prompt"):
+            timings["prompt_tokens"] = prepared["prompt"]["input_tokens"]
+        with self._lock:
+            cursor = self._conn.execute(
+                """INSERT INTO digests (category, digest_date, prepared_at, headlines_count, degraded, timings, body)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    scope,
+                    digest_date(prepared_at),
+                    prepared_at,
+                    prepared["headlines_count"],
+                    int(bool(prepared.get("degraded"))),
+                    json.dumps(timings),
+                    body,
+                ),
+            )
+        logger.info(f"Recorded digest {cursor.lastrowid} for '{scope}' in history")
+        return cursor.lastrowid
+
+    def _body(self, digest_id: int, blob: bytes) -> Dict:
+        """Decode a digest body, from the in-memory cache when possible."""
+        with self._lock:
+            body = self._bodies.get(digest_id)
+            if body is not None:
+                self._bodies.move_to_end(digest_id)
+        record_cache("digest_history", hit=body is not None)
+        if body is None:
+            body = json.loads(zlib.decompress(blob))
+            with self._lock:
+                self._bodies[digest_id] = body
+                while len(self._bodies) > _BODY_CACHE_SIZE:
+                    self._bodies.popitem(last=False)
+        return body
+
+    def query(
+        self,
+        on_date: Optional[date] = None,
+        category: Optional[str] = None,
+        limit: int = 10,
+        include_degraded: bool = True,
+    ) -> List[Dict]:
+        """
+        Find recorded digests, newest first.
+
+        Args:
+            on_date: Only digests from this date (in SCHEDULER_TIMEZONE)
+            category: Only digests for this scope (category, or 'general')
+            limit: Max digests returned
+            include_degraded: Whether to include digests built from the fallback summary
+
+        Returns:
+            Dicts with 'id', 'category', 'date', 'prepared_at', 'headlines_count',
+            'degraded', 'timings', 'summary' and 'headlines' keys
+        """
+        clauses, params = [], []
+        if on_date is not None:
+            clauses.append("digest_date = ?")
+            params.append(on_date.isoformat())
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if not include_degraded:
+            clauses.append("degraded = 0")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM digests {where} ORDER BY prepared_at DESC, id DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+
+        digests = []
+        for row in rows:
+            body = self._body(row["id"], row["body"])
+            digests.append({
+                "id": row["id"],
+                "category": row["category"],
+                "date": row["digest_date"],
+                "prepared_at": datetime.fromtimestamp(row["prepared_at"]).isoformat(),
+                "headlines_count": row["headlines_count"],
+                "degraded": bool(row["degraded"]),
+                "timings": json.loads(row["timings"]) if row["timings"] else {},
+                "summary": body["summary"],
+                "headlines": body["headlines"],
+            })
+        return digests
+
+    def latest(self, on_date: date, category: str) -> Optional[Dict]:
+        """The last digest recorded for a date and scope, preferring one that isn't degraded."""
+        digests = self.query(on_date=on_date, category=category, limit=1, include_degraded=False)
+        if not digests:
+            digests = self.query(on_date=on_date, category=category, limit=1)
+        return digests[0] if digests else None
@@ -1,8 +1,9 @@
 """Embedding generation service."""
 
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Optional
-from openai import OpenAI
 
 import sys
 from pathlib import Path
@@ -11,10 +12,24 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from services import deadline
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from services.http_client import new_sdk_http_client, warm_connections
+from services.metrics import EMBEDDING_SECONDS, record_cache, track
+from services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 
+def embeddings_breaker() -> CircuitBreaker:
+    """The process-wide circuit breaker for the embeddings API."""
+    return get_breaker(
+        "embeddings",
+        failure_threshold=settings.embedding_breaker_failure_threshold,
+        recovery_seconds=settings.embedding_breaker_recovery_seconds,
+    )
+
+
 class EmbeddingService:
     """Service for generating text embeddings."""
 
@@ -28,10 +43,20 @@ class EmbeddingService:
         api_key = api_key or settings.openai_api_key
         if not api_key:
             raise ValueError("OPENAI_API_KEY is required for embeddings")
-        self.client = OpenAI(api_key=api_key)
+        from openai import OpenAI
+        self._http_client = new_sdk_http_client()
+        self.client = OpenAI(api_key=api_key, base_url=settings.openai_base_url, http_client=self._http_client)
         self.model = settings.embedding_model
+        self.breaker = embeddings_breaker()
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
         logger.info(f"Initialized embedding service with model: {self.model}")
 
+    def warm_connection(self) -> bool:
+        """Open a pooled connection to the embeddings API host."""
+        return warm_connections([str(self.client.base_url)], client=self._http_client) > 0
+
+    @traced("embeddings.generate_embeddings")
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for a list of texts.
@@ -41,14 +66,58 @@ class EmbeddingService:
 
         Returns:
             List of embedding vectors
+
+        Raises:
+            CircuitOpenError: If the embeddings circuit is open
         """
+        client = self.client
+        if deadline.remaining() is not None:
+            deadline.check("embeddings")
+            client = client.with_options(timeout=deadline.timeout(600.0), max_retries=0)
+        if not self.breaker.allow():
+            raise CircuitOpenError("Embeddings API unavailable (circuit open)")
         try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=texts,
-            )
-            return [item.embedding for item in response.data]
+            with track(EMBEDDING_SECONDS, component="embeddings", model=self.model):
+                response = client.embeddings.create(
+                    model=self.model,
+                    input=texts,
+                )
         except Exception as e:
+            left = deadline.remaining()
+            if left is not None and left <= 0:
+                self.breaker.release()
+            else:
+                self.breaker.record_failure()
             logger.error(f"Embedding generation error: {e}", exc_info=True)
             raise
+        self.breaker.record_success()
+        return [item.embedding for item in response.data]
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query, reusing the vector for repeated queries.
+
+        Repeated questions are answered from memory, including while the
+        embeddings circuit is open.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Embedding vector
+        """
+        with self._query_cache_lock:
+            vector = self._query_cache.get(query)
+            if vector is not None:
+                self._query_cache.move_to_end(query)
+        record_cache("embeddings", hit=vector is not None)
+        if vector is not None:
+            return vector
+
+        vector = self.generate_embeddings([query])[0]
+        with self._query_cache_lock:
+            self._query_cache[query] = vector
+            while len(self._query_cache) > settings.embedding_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
 
@@ -0,0 +1,131 @@
+"""Shared, pooled HTTP clients."""
+
+import logging
+import threading
+from typing import Iterable, Optional
+
+import httpx
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.async_utils import run_sync
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_connections,
+        keepalive_expiry=settings.http_keepalive_seconds,
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide pooled client used for Lark and news API calls.
+
+    Reusing one client keeps TLS connections alive between requests
+    instead of opening a new one per call.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(timeout=10.0, limits=_limits())
+    return _client
+
+
+def new_sdk_http_client() -> httpx.Client:
+    """Create a pooled client to hand to an SDK (OpenAI/Anthropic) constructor."""
+    return httpx.Client(timeout=httpx.Timeout(600.0, connect=10.0), limits=_limits())
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled async client used for news API calls.
+
+    Async clients are bound to the loop they run on, so this one must only
+    be used from coroutines on the shared I/O loop (i.e. run via `run_sync`).
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(timeout=10.0, limits=_limits())
+    return _async_client
+
+
+def warm_connections(urls: Iterable[str], client: Optional[httpx.Client] = None) -> int:
+    """
+    Open pooled connections to the given hosts ahead of real traffic.
+
+    Any HTTP response counts: the point is the DNS lookup, TCP connect and
+    TLS handshake, which leave a keep-alive connection in the pool.
+
+    Args:
+        urls: URLs whose hosts should be connected
+        client: Client whose pool to warm (defaults to the shared client)
+
+    Returns:
+        Number of hosts connected
+    """
+    client = client or get_http_client()
+    connected = 0
+    for url in urls:
+        try:
+            client.head(url, timeout=5.0)
+            connected += 1
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not pre-connect to {url}: {e}")
+    return connected
+
+
+async def _awarm_connections(urls: Iterable[str]) -> int:
+    client = get_async_http_client()
+    connected = 0
+    for url in urls:
+        try:
+            await client.head(url, timeout=5.0)
+            connected += 1
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not pre-connect to {url}: {e}")
+    return connected
+
+
+def warm_async_connections(urls: Iterable[str]) -> int:
+    """
+    Open connections in the shared async client's pool (see `warm_connections`).
+
+    Args:
+        urls: URLs whose hosts should be connected
+
+    Returns:
+        Number of hosts connected
+    """
+    return run_sync(_awarm_connections(urls))
+
+
+async def _aclose_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def close_http_client() -> None:
+    """Close the shared clients."""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+    if _async_client is not None:
+        run_sync(_aclose_async_client())
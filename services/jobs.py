@@ -0,0 +1,95 @@
+"""Registry of scheduled digest jobs, loaded from config."""
+
+import json
+import logging
+import os
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def parse_time_of_day(value: str) -> tuple:
+    """Parse an 'HH:MM' string into (hour, minute)."""
+    hour, minute = value.strip().split(":")
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid time of day: {value}")
+    return hour, minute
+
+
+class DigestJob(BaseModel):
+    """One scheduled digest: what to summarize, when, and where to post it."""
+
+    id: str = Field(description="Unique job ID")
+    category: Optional[str] = Field(default=None, description="News category (None for general headlines)")
+    deliver_time: str = Field(description="Delivery time (HH:MM)")
+    prepare_time: Optional[str] = Field(default=None, description="Time to prepare ahead of delivery (HH:MM)")
+    timezone: Optional[str] = Field(default=None, description="Timezone (defaults to SCHEDULER_TIMEZONE)")
+    webhook_url: Optional[str] = Field(default=None, description="Lark webhook to post to")
+    chat_ids: List[str] = Field(default_factory=list, description="Lark chats to post to via the bot")
+    enabled: bool = Field(default=True, description="Whether the job is scheduled")
+
+    @field_validator("deliver_time", "prepare_time")
+    @classmethod
+    def _check_time(cls, value: Optional[str]) -> Optional[str]:
+        if value:
+            parse_time_of_day(value)
+        return value or None
+
+    @property
+    def tz(self) -> str:
+        """Timezone name for this job."""
+        return self.timezone or settings.scheduler_timezone
+
+
+def default_job() -> DigestJob:
+    """The single job used when NEWSBOT_JOBS is not set: the original daily digest."""
+    return DigestJob(
+        id="daily_newsbot",
+        deliver_time=settings.newsbot_deliver_time,
+        prepare_time=settings.newsbot_prepare_time,
+    )
+
+
+def load_digest_jobs(raw: Optional[str] = None) -> List[DigestJob]:
+    """
+    Load digest jobs from config.
+
+    Args:
+        raw: JSON list of jobs, or a path to a JSON file (defaults to NEWSBOT_JOBS)
+
+    Returns:
+        Enabled jobs (the default daily digest if none are configured)
+
+    Raises:
+        ValueError: If the config is invalid or job IDs are duplicated
+    """
+    raw = raw if raw is not None else settings.newsbot_jobs
+    if not raw or not raw.strip():
+        return [default_job()]
+
+    if not raw.lstrip().startswith("["):
+        if not os.path.exists(raw):
+            raise ValueError(f"NEWSBOT_JOBS file not found: {raw}")
+        with open(raw, encoding="utf-8") as f:
+            raw = f.read()
+
+    jobs = [DigestJob(**entry) for entry in json.loads(raw)]
+    ids = [job.id for job in jobs]
+    duplicates = {job_id for job_id in ids if ids.count(job_id) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate digest job IDs: {sorted(duplicates)}")
+
+    enabled = [job for job in jobs if job.enabled]
+    logger.info(f"Loaded {len(enabled)} digest jobs ({len(jobs) - len(enabled)} disabled)")
+    return enabled
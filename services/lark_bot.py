@@ -2,15 +2,23 @@
 
 import logging
 import json
-import time
-import httpx
+import uuid
+from datetime import date, datetime, timedelta
 from typing import Optional, Dict, Any
 
+import pytz
+
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from services import deadline
+from services.http_client import get_http_client
+from services.lark_dispatcher import PRIORITY_HIGH, LarkDeliveryError, get_dispatcher
+from services.lark_token import TenantTokenManager
+from services.metrics import LARK_SEND_SECONDS, record_error, track
+from services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -28,49 +36,115 @@ class LarkBot:
         """
         self.app_id = app_id or settings.lark_app_id
         self.app_secret = app_secret or settings.lark_app_secret
-        self._access_token: Optional[str] = None
-        self._token_expires_at: float = 0
+        self._token_manager: Optional[TenantTokenManager] = None
         logger.info("Initialized LarkBot")
 
+    @property
+    def token_manager(self) -> TenantTokenManager:
+        """Tenant token manager, created on first use."""
+        if self._token_manager is None:
+            if not self.app_id or not self.app_secret:
+                raise ValueError("Lark app_id and app_secret are required for bot functionality")
+            self._token_manager = TenantTokenManager(self.app_id, self.app_secret)
+        return self._token_manager
+
     def _get_access_token(self) -> str:
         """
-        Get or refresh access token.
+        Get the tenant access token.
+
+        The token manager refreshes it in the background, so this only
+        blocks on a fetch for the very first call (or after a failed refresh).
 
         Returns:
             Access token string
         """
-        # Return cached token if still valid
-        if self._access_token and time.time() < self._token_expires_at:
-            return self._access_token
+        try:
+            return self.token_manager.get_token()
+        except Exception as e:
+            logger.error(f"Error getting Lark access token: {e}", exc_info=True)
+            raise
 
-        if not self.app_id or not self.app_secret:
-            raise ValueError("Lark app_id and app_secret are required for bot functionality")
+    def close(self) -> None:
+        """Stop the background token refresh."""
+        if self._token_manager is not None:
+            self._token_manager.stop()
 
-        try:
-            url = "https://open.larksuite.com/open-apis/auth/v3/tenant_access_token/internal"
-            payload = {
-                "app_id": self.app_id,
-                "app_secret": self.app_secret
-            }
+    @staticmethod
+    def build_card(content: str, title: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build a markdown interactive card.
 
-            response = httpx.post(url, json=payload, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
+        Cards are marked `update_multi` so they can be edited in place later
+        with `update_card`.
 
-            if data.get("code") == 0:
-                self._access_token = data["tenant_access_token"]
-                # Token expires in 2 hours, refresh 5 minutes early
-                self._token_expires_at = time.time() + (data.get("expire", 7200) - 300)
-                logger.info("Obtained Lark access token")
-                return self._access_token
-            else:
-                raise Exception(f"Failed to get access token: {data.get('msg')}")
+        Args:
+            content: Markdown content
+            title: Optional header title
 
-        except Exception as e:
-            logger.error(f"Error getting Lark access token: {e}", exc_info=True)
-            raise
+        Returns:
+            Card dict
+        """
+        card: Dict[str, Any] = {
+            "config": {"wide_screen_mode": True, "update_multi": True},
+            "elements": [{"tag": "markdown", "content": content}],
+        }
+        if title:
+            card["header"] = {"title": {"tag": "plain_text", "content": title}}
+        return card
+
+    def _request(self, method: str, url: str, payload: Dict[str, Any], chat_key: str, priority: int) -> Dict[str, Any]:
+        """
+        Make an Open API call through the rate-limited dispatcher.
+
+        Calls must be idempotent (updates, or creates with a `uuid` dedup key),
+        since they are retried after network errors.
 
-    def send_reply(self, message_id: str, content: str, msg_type: str = "text", chat_id: Optional[str] = None) -> bool:
+        Raises:
+            LarkDeliveryError: If the call failed after retries
+        """
+        def attempt():
+            # Fetch the token per attempt so a retry picks up a refreshed one
+            headers = {
+                "Authorization": f"Bearer {self._get_access_token()}",
+                "Content-Type": "application/json"
+            }
+            with track(LARK_SEND_SECONDS, component="lark_bot", channel="bot"):
+                return get_http_client().request(method, url, headers=headers, json=payload, timeout=10.0)
+
+        timeout = deadline.timeout(settings.lark_send_timeout_seconds, floor=settings.deadline_send_reserve_seconds)
+        return get_dispatcher().send(attempt, chat_key=chat_key, priority=priority, timeout=timeout, idempotent=True)
+
+    def _send(
+        self,
+        message_id: str,
+        msg_type: str,
+        content: str,
+        chat_id: Optional[str],
+        priority: int,
+    ) -> Optional[str]:
+        """Send a message, returning its message_id (None on failure)."""
+        receive_id = chat_id or message_id
+        receive_id_type = "chat_id" if chat_id else "message_id"
+        url = f"{settings.lark_base_url}/open-apis/im/v1/messages?receive_id_type={receive_id_type}"
+        # Lark drops a repeat of the same uuid, so retries can't post the message twice
+        payload = {"receive_id": receive_id, "msg_type": msg_type, "content": content, "uuid": uuid.uuid4().hex}
+        try:
+            result = self._request("POST", url, payload, chat_key=receive_id, priority=priority)
+        except LarkDeliveryError as e:
+            record_error("lark_bot")
+            logger.error(f"Failed to send reply: {e}")
+            return None
+        return (result.get("data") or {}).get("message_id") or ""
+
+    @traced("lark_bot.send_reply")
+    def send_reply(
+        self,
+        message_id: str,
+        content: str,
+        msg_type: str = "text",
+        chat_id: Optional[str] = None,
+        priority: int = PRIORITY_HIGH,
+    ) -> bool:
         """
         Reply to a message in Lark.
 
@@ -79,60 +153,94 @@ class LarkBot:
             content: Reply content
             msg_type: Message type ('text' or 'interactive' for markdown)
             chat_id: Chat ID (optional, will use message_id if not provided)
+            priority: Outbound queue priority (replies to users go first by default)
 
         Returns:
             True if successful
         """
         try:
-            token = self._get_access_token()
-            receive_id = chat_id or message_id
-            receive_id_type = "chat_id" if chat_id else "message_id"
-            
-            url = f"https://open.larksuite.com/open-apis/im/v1/messages?receive_id_type={receive_id_type}"
-            
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            }
-
             if msg_type == "interactive":
                 # Parse content as JSON if it's markdown
                 try:
                     card_content = json.loads(content) if isinstance(content, str) else content
-                except:
+                except ValueError:
                     # If not JSON, wrap in card format
-                    card_content = {
-                        "config": {"wide_screen_mode": True},
-                        "elements": [{"tag": "markdown", "content": content}]
-                    }
-                
-                payload = {
-                    "receive_id": receive_id,
-                    "msg_type": "interactive",
-                    "content": json.dumps(card_content)
-                }
-            else:
-                payload = {
-                    "receive_id": receive_id,
-                    "msg_type": "text",
-                    "content": json.dumps({"text": content})
-                }
-
-            response = httpx.post(url, headers=headers, json=payload, timeout=10.0)
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get("code") == 0:
-                logger.info("Successfully sent reply to Lark")
-                return True
+                    card_content = self.build_card(content)
+                body = json.dumps(card_content)
             else:
-                logger.error(f"Failed to send reply: {result.get('msg')}")
+                body = json.dumps({"text": content})
+
+            if self._send(message_id, msg_type, body, chat_id, priority) is None:
                 return False
+            logger.info("Successfully sent reply to Lark")
+            return True
 
         except Exception as e:
             logger.error(f"Error sending reply to Lark: {e}", exc_info=True)
             return False
 
+    @traced("lark_bot.send_card")
+    def send_card(
+        self,
+        card: Dict[str, Any],
+        chat_id: Optional[str] = None,
+        message_id: Optional[str] = None,
+        priority: int = PRIORITY_HIGH,
+    ) -> Optional[str]:
+        """
+        Send an interactive card.
+
+        Args:
+            card: Card dict (see `build_card`)
+            chat_id: Chat to send to
+            message_id: Message to reply to, if no chat_id is given
+            priority: Outbound queue priority
+
+        Returns:
+            The new message's ID (for `update_card`), or None on failure
+        """
+        try:
+            sent_id = self._send(message_id or "", "interactive", json.dumps(card), chat_id, priority)
+            if sent_id is not None:
+                logger.info("Successfully sent card to Lark")
+            return sent_id
+        except Exception as e:
+            logger.error(f"Error sending card to Lark: {e}", exc_info=True)
+            return None
+
+    @traced("lark_bot.update_card")
+    def update_card(
+        self,
+        message_id: str,
+        card: Dict[str, Any],
+        chat_id: Optional[str] = None,
+        priority: int = PRIORITY_HIGH,
+    ) -> bool:
+        """
+        Replace the content of a card sent earlier by the bot.
+
+        Args:
+            message_id: ID of the card message (from `send_card`)
+            card: New card dict
+            chat_id: Chat the card is in (for rate limiting; defaults to the message)
+            priority: Outbound queue priority
+
+        Returns:
+            True if successful
+        """
+        url = f"{settings.lark_base_url}/open-apis/im/v1/messages/{message_id}"
+        try:
+            self._request("PATCH", url, {"content": json.dumps(card)}, chat_key=chat_id or message_id, priority=priority)
+        except LarkDeliveryError as e:
+            record_error("lark_bot")
+            logger.error(f"Failed to update card: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Error updating card in Lark: {e}", exc_info=True)
+            return False
+        logger.info("Successfully updated card in Lark")
+        return True
+
     def parse_message(self, event_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Parse incoming message event.
@@ -203,7 +311,9 @@ class LarkBot:
             text: Message text
 
         Returns:
-            Dict with 'command' and 'category' keys
+            Dict with 'command', 'category' and 'date' keys ('date' is set when
+            the message asks for a past digest, e.g. "yesterday's tech news"
+            or "news 2024-05-01")
         """
         text_lower = text.lower()
         
@@ -236,7 +346,20 @@ class LarkBot:
                 category = cat
                 break
         
+        # Past digest requested? Dates are in the scheduler's timezone
+        digest_day = None
+        date_match = re.search(r'\b(\d{4}-\d{2}-\d{2})\b', text_clean)
+        if date_match:
+            try:
+                digest_day = date.fromisoformat(date_match.group(1))
+            except ValueError:
+                pass
+        elif "yesterday" in text_clean:
+            today = datetime.now(pytz.timezone(settings.scheduler_timezone)).date()
+            digest_day = today - timedelta(days=1)
+
         return {
             "command": command or "news",  # Default to 'news'
-            "category": category
+            "category": category,
+            "date": digest_day,
         }
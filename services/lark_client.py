@@ -2,7 +2,6 @@
 
 import logging
 from typing import Optional
-import httpx
 
 import sys
 from pathlib import Path
@@ -11,10 +10,23 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from services import deadline
+from services.http_client import get_http_client
+from services.lark_dispatcher import PRIORITY_NORMAL, get_dispatcher
+from services.metrics import LARK_SEND_SECONDS, track
+from services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 
+def is_lark_webhook(url: str) -> bool:
+    """Check that a URL is the configured webhook or a Lark/Feishu bot hook (LARK_WEBHOOK_PREFIXES)."""
+    if url == settings.lark_webhook_url:
+        return True
+    prefixes = [p.strip() for p in settings.lark_webhook_prefixes.split(",") if p.strip()]
+    return any(url.startswith(prefix) for prefix in prefixes)
+
+
 class LarkClient:
     """Client for sending messages to Lark via webhook."""
 
@@ -30,13 +42,27 @@ class LarkClient:
             raise ValueError("LARK_WEBHOOK_URL is required")
         logger.info("Initialized Lark client")
 
-    def send_message(self, content: str, title: Optional[str] = None) -> bool:
+    def _post(self, payload: dict, priority: int) -> dict:
+        """Post to the webhook through the rate-limited dispatcher, retrying transient failures."""
+        def attempt():
+            with track(LARK_SEND_SECONDS, component="lark_webhook", channel="webhook"):
+                return get_http_client().post(self.webhook_url, json=payload, timeout=10.0)
+
+        # Sending still gets its reserved share when the request deadline has passed
+        timeout = deadline.timeout(settings.lark_send_timeout_seconds, floor=settings.deadline_send_reserve_seconds)
+        return get_dispatcher().send(
+            attempt, chat_key=self.webhook_url, priority=priority, app_limited=False, timeout=timeout
+        )
+
+    @traced("lark_client.send_message")
+    def send_message(self, content: str, title: Optional[str] = None, priority: int = PRIORITY_NORMAL) -> bool:
         """
         Send a text message to Lark.
 
         Args:
             content: Message content
             title: Optional message title
+            priority: Outbound queue priority
 
         Returns:
             True if successful, False otherwise
@@ -53,13 +79,7 @@ class LarkClient:
             if title:
                 payload["content"]["text"] = f"{title}\n\n{content}"
 
-            response = httpx.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10.0
-            )
-            response.raise_for_status()
-
+            self._post(payload, priority)
             logger.info("Successfully sent message to Lark")
             return True
 
@@ -67,13 +87,15 @@ class LarkClient:
             logger.error(f"Failed to send message to Lark: {e}", exc_info=True)
             return False
 
-    def send_markdown(self, content: str, title: Optional[str] = None) -> bool:
+    @traced("lark_client.send_markdown")
+    def send_markdown(self, content: str, title: Optional[str] = None, priority: int = PRIORITY_NORMAL) -> bool:
         """
         Send a markdown message to Lark.
 
         Args:
             content: Markdown content
             title: Optional message title
+            priority: Outbound queue priority
 
         Returns:
             True if successful, False otherwise
@@ -100,13 +122,7 @@ class LarkClient:
                 }
             }
 
-            response = httpx.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10.0
-            )
-            response.raise_for_status()
-
+            self._post(payload, priority)
             logger.info("Successfully sent markdown message to Lark")
             return True
 
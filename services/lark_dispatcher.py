@@ -0,0 +1,434 @@
+"""Outbound Lark message dispatcher with rate limiting and retries."""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.metrics import LARK_DISPATCH, QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+# Lower value = sent first
+PRIORITY_HIGH = 0  # interactive replies to a user
+PRIORITY_NORMAL = 1  # scheduled digests
+PRIORITY_LOW = 2  # bulk fan-out
+
+# Lark error codes meaning "slow down": Open API frequency limit, custom bot frequency limit
+RATE_LIMIT_CODES = {99991400, 11232}
+
+_QUEUE = "lark_outbound"
+
+# Per-chat rate buckets kept (least recently used are dropped; a new bucket starts full)
+_MAX_CHAT_BUCKETS = 10000
+
+# Failures before the request reached Lark, so a retry can't duplicate a message
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class LarkDeliveryError(Exception):
+    """A message could not be delivered (rejected, dropped or out of retries)."""
+
+
+class TokenBucket:
+    """Token bucket; callers serialize access."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Burst size (defaults to one second's worth)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class _Message:
+    __slots__ = ("send", "chat_key", "app_limited", "idempotent", "priority", "future", "attempts", "seq", "abandoned")
+
+    def __init__(self, send, chat_key, app_limited, idempotent, priority, seq):
+        self.send = send
+        self.chat_key = chat_key
+        self.app_limited = app_limited
+        self.idempotent = idempotent
+        self.priority = priority
+        self.future: Future = Future()
+        self.attempts = 0
+        self.seq = seq
+        # Set when the sender stopped waiting; the message is dropped instead of (re)tried
+        self.abandoned = False
+
+
+class LarkDispatcher:
+    """
+    Sends outbound Lark requests at the highest rate Lark allows.
+
+    - Token buckets per app (Open API sends) and per chat or webhook keep
+      sends under Lark's limits; a message whose chat is at its limit is
+      deferred without blocking messages for other chats.
+    - Rate-limited (HTTP 429 / Lark frequency codes), 5xx and network
+      failures are retried with exponential backoff and full jitter,
+      honouring Retry-After / x-ogw-ratelimit-reset when Lark sends one.
+      Network failures after the request may have reached Lark (e.g. read
+      timeouts) are only retried for idempotent requests, so a retry never
+      posts a message twice.
+    - A message whose sender stopped waiting (`send` timed out) is dropped
+      before its next attempt.
+    - The queue is bounded. When it is full, a new message evicts the
+      newest queued message of lower priority, or is rejected if there is none.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        app_rate: Optional[float] = None,
+        chat_rate: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        max_chat_buckets: int = _MAX_CHAT_BUCKETS,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            workers: Sender threads (defaults to settings)
+            max_queue: Max queued messages, including those awaiting retry (defaults to settings)
+            app_rate: Open API sends per second for the app (defaults to settings)
+            chat_rate: Sends per second per chat or webhook (defaults to settings)
+            max_attempts: Attempts per message before giving up (defaults to settings)
+            max_chat_buckets: Per-chat rate buckets kept, least recently used dropped first
+        """
+        self.workers = workers or settings.lark_dispatch_workers
+        self.max_queue = max_queue or settings.lark_queue_max_size
+        self.app_rate = app_rate or settings.lark_app_rate_per_second
+        self.chat_rate = chat_rate or settings.lark_chat_rate_per_second
+        self.max_attempts = max_attempts or settings.lark_send_max_attempts
+
+        self._app_bucket = TokenBucket(self.app_rate)
+        self.max_chat_buckets = max_chat_buckets
+        self._chat_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._ready: List[Tuple[int, int, _Message]] = []
+        self._delayed: List[Tuple[float, int, _Message]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._threads: List[threading.Thread] = []
+
+    def submit(
+        self,
+        send: Callable[[], httpx.Response],
+        chat_key: str,
+        priority: int = PRIORITY_NORMAL,
+        app_limited: bool = True,
+        idempotent: bool = False,
+    ) -> Future:
+        """
+        Queue a request.
+
+        Args:
+            send: Performs one attempt and returns the HTTP response
+            chat_key: Chat ID or webhook URL, for the per-chat limit
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+            app_limited: Whether the per-app Open API limit applies (not for webhooks)
+            idempotent: Whether repeating the request is harmless (an update, or a
+                create carrying Lark's `uuid` dedup key), so it may be retried after
+                failures where Lark may already have received it
+
+        Returns:
+            Future resolving to the response JSON, or raising LarkDeliveryError
+        """
+        return self._enqueue(send, chat_key, priority, app_limited, idempotent).future
+
+    def _enqueue(
+        self,
+        send: Callable[[], httpx.Response],
+        chat_key: str,
+        priority: int,
+        app_limited: bool,
+        idempotent: bool,
+    ) -> _Message:
+        self._start()
+        with self._cond:
+            message = _Message(send, chat_key, app_limited, idempotent, priority, next(self._seq))
+            if len(self._ready) + len(self._delayed) >= self.max_queue and not self._evict_for(message):
+                LARK_DISPATCH.labels(outcome="rejected").inc()
+                message.future.set_exception(LarkDeliveryError("Lark outbound queue is full"))
+                return message
+            heapq.heappush(self._ready, (priority, message.seq, message))
+            self._update_depth()
+            self._cond.notify()
+        return message
+
+    def send(self, send: Callable[[], httpx.Response], chat_key: str, priority: int = PRIORITY_NORMAL,
+             app_limited: bool = True, timeout: Optional[float] = None, idempotent: bool = False) -> Dict:
+        """
+        Queue a request and wait for its result.
+
+        Args:
+            send: Performs one attempt and returns the HTTP response
+            chat_key: Chat ID or webhook URL, for the per-chat limit
+            priority: Queue priority
+            app_limited: Whether the per-app Open API limit applies
+            timeout: Seconds to wait (defaults to settings); on timeout the message is
+                dropped before any further attempt (one already in flight may still land)
+            idempotent: Whether the request may be retried after ambiguous failures (see `submit`)
+
+        Returns:
+            Response JSON
+
+        Raises:
+            LarkDeliveryError: If the message was rejected, dropped, timed out or failed
+        """
+        message = self._enqueue(send, chat_key, priority, app_limited, idempotent)
+        try:
+            return message.future.result(timeout=timeout or settings.lark_send_timeout_seconds)
+        except FutureTimeoutError:
+            # Not started yet: cancel outright; otherwise the worker drops it before the next attempt
+            message.abandoned = True
+            message.future.cancel()
+            raise LarkDeliveryError("Timed out waiting for Lark delivery")
+
+    def _evict_for(self, message: _Message) -> bool:
+        """Drop the newest lower-priority queued message to make room. Caller holds the lock."""
+        candidates = [entry for entry in self._ready if entry[0] > message.priority]
+        if not candidates:
+            return False
+        victim = max(candidates, key=lambda entry: (entry[0], entry[1]))
+        self._ready.remove(victim)
+        heapq.heapify(self._ready)
+        LARK_DISPATCH.labels(outcome="dropped").inc()
+        if not victim[2].future.done():
+            victim[2].future.set_exception(LarkDeliveryError("Dropped for a higher-priority Lark message"))
+        return True
+
+    def _update_depth(self) -> None:
+        QUEUE_DEPTH.labels(queue=_QUEUE).set(len(self._ready) + len(self._delayed))
+
+    def _start(self) -> None:
+        with self._cond:
+            if self._threads or self._stopped:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"lark-dispatch-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop the sender threads, failing anything still queued."""
+        with self._cond:
+            self._stopped = True
+            pending = [entry[2] for entry in self._ready + self._delayed]
+            self._ready.clear()
+            self._delayed.clear()
+            self._update_depth()
+            self._cond.notify_all()
+        for message in pending:
+            if not message.future.done():
+                message.future.set_exception(LarkDeliveryError("Lark dispatcher stopped"))
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+
+    def _next_message(self) -> Optional[_Message]:
+        """Wait for a message that is due and within its rate limits."""
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, seq, message = heapq.heappop(self._delayed)
+                    heapq.heappush(self._ready, (message.priority, seq, message))
+
+                deferred = []
+                chosen = None
+                while self._ready:
+                    entry = heapq.heappop(self._ready)
+                    message = entry[2]
+                    if message.future.cancelled():
+                        continue
+                    if message.abandoned:
+                        self._drop_abandoned(message)
+                        continue
+                    wait = self._limit_wait(message)
+                    if wait == 0:
+                        chosen = message
+                        break
+                    deferred.append((now + wait, entry[1], message))
+                for item in deferred:
+                    heapq.heappush(self._delayed, item)
+                self._update_depth()
+                if chosen:
+                    return chosen
+
+                timeout = self._delayed[0][0] - now if self._delayed else None
+                self._cond.wait(timeout)
+        return None
+
+    @staticmethod
+    def _drop_abandoned(message: _Message) -> None:
+        LARK_DISPATCH.labels(outcome="cancelled").inc()
+        if not message.future.done():
+            message.future.set_exception(LarkDeliveryError("Sender stopped waiting for Lark delivery"))
+
+    def _chat_bucket(self, chat_key: str) -> TokenBucket:
+        """The rate bucket for a chat or webhook, kept in a bounded LRU. Caller holds the lock."""
+        bucket = self._chat_buckets.get(chat_key)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_key] = TokenBucket(self.chat_rate)
+            while len(self._chat_buckets) > self.max_chat_buckets:
+                self._chat_buckets.popitem(last=False)
+        else:
+            self._chat_buckets.move_to_end(chat_key)
+        return bucket
+
+    def _limit_wait(self, message: _Message) -> float:
+        """Take rate-limit tokens for a message, or return how long it must wait. Caller holds the lock."""
+        chat_bucket = self._chat_bucket(message.chat_key)
+        buckets = [chat_bucket, self._app_bucket] if message.app_limited else [chat_bucket]
+        wait = max(bucket.wait_time() for bucket in buckets)
+        if wait == 0:
+            for bucket in buckets:
+                bucket.take()
+        return wait
+
+    def _worker(self) -> None:
+        while True:
+            message = self._next_message()
+            if message is None:
+                return
+            if message.attempts == 0 and not message.future.set_running_or_notify_cancel():
+                continue
+            message.attempts += 1
+            try:
+                retry_after = self._attempt(message)
+            except Exception as e:
+                LARK_DISPATCH.labels(outcome="failed").inc()
+                message.future.set_exception(e if isinstance(e, LarkDeliveryError) else LarkDeliveryError(str(e)))
+                continue
+            if retry_after is None:
+                continue
+
+            if message.abandoned:
+                self._drop_abandoned(message)
+                continue
+            if message.attempts >= self.max_attempts:
+                LARK_DISPATCH.labels(outcome="failed").inc()
+                message.future.set_exception(
+                    LarkDeliveryError(f"Lark delivery failed after {message.attempts} attempts")
+                )
+                continue
+            LARK_DISPATCH.labels(outcome="retried").inc()
+            with self._cond:
+                heapq.heappush(self._delayed, (time.monotonic() + retry_after, message.seq, message))
+                self._update_depth()
+                self._cond.notify()
+
+    def _attempt(self, message: _Message) -> Optional[float]:
+        """
+        Make one attempt.
+
+        Returns:
+            None if the message is finished, else seconds to wait before retrying
+
+        Raises:
+            LarkDeliveryError: If Lark rejected the message for a non-retryable reason
+        """
+        try:
+            response = message.send()
+        except httpx.TransportError as e:
+            if not message.idempotent and not isinstance(e, _NOT_SENT_ERRORS):
+                # Lark may have accepted the request already; retrying could post it twice
+                raise LarkDeliveryError(f"Lark send failed, not retried to avoid a duplicate: {e!r}")
+            logger.warning(f"Lark send failed (attempt {message.attempts}): {e!r}")
+            return self._backoff(message.attempts)
+
+        data = {}
+        try:
+            data = response.json()
+        except ValueError:
+            pass
+        code = data.get("code", data.get("StatusCode", 0))
+
+        if response.status_code == 429 or code in RATE_LIMIT_CODES:
+            LARK_DISPATCH.labels(outcome="rate_limited").inc()
+            retry_after = _retry_after(response)
+            logger.warning(f"Lark rate limited {message.chat_key}, retrying in {retry_after or 'backoff'}s")
+            return retry_after if retry_after is not None else self._backoff(message.attempts)
+        if response.status_code >= 500:
+            logger.warning(f"Lark returned {response.status_code} (attempt {message.attempts})")
+            return self._backoff(message.attempts)
+        if response.status_code >= 400 or code != 0:
+            raise LarkDeliveryError(
+                f"Lark rejected message: HTTP {response.status_code}, code {code}, {data.get('msg')}"
+            )
+
+        LARK_DISPATCH.labels(outcome="sent").inc()
+        message.future.set_result(data)
+        return None
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        cap = min(settings.lark_retry_max_seconds, settings.lark_retry_base_seconds * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait from Retry-After or Lark's x-ogw-ratelimit-reset header."""
+    for header in ("Retry-After", "x-ogw-ratelimit-reset"):
+        value = response.headers.get(header)
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                continue
+    return None
+
+
+_dispatcher: Optional[LarkDispatcher] = None
+_lock = threading.Lock()
+
+
+def get_dispatcher() -> LarkDispatcher:
+    """Get the process-wide dispatcher."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _lock:
+            if _dispatcher is None:
+                _dispatcher = LarkDispatcher()
+    return _dispatcher
+
+
+def close_dispatcher() -> None:
+    """Stop the process-wide dispatcher."""
+    global _dispatcher
+    with _lock:
+        if _dispatcher is not None:
+            _dispatcher.stop()
+            _dispatcher = None
@@ -0,0 +1,196 @@
+"""Lark tenant access token manager."""
+
+import logging
+import random
+import threading
+import time
+from typing import Optional, Tuple
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.http_client import get_http_client
+from services.metrics import record_cache, record_error
+from services.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+
+class TenantTokenManager:
+    """
+    Keeps a Lark tenant access token fresh so senders never wait on a fetch.
+
+    - A background thread refreshes the token `refresh_margin` seconds
+      before it expires (Lark issues a new token once the old one has under
+      30 minutes left, so the margin must stay below that).
+    - Only one refresh runs at a time; callers that find no valid token
+      wait for that refresh instead of starting their own.
+    - With a shared cache, the token is stored in the local SQLite state
+      file so workers on one host reuse each other's tokens.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        refresh_margin: Optional[float] = None,
+        shared_cache: Optional[bool] = None,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize token manager.
+
+        Args:
+            app_id: Lark app ID
+            app_secret: Lark app secret
+            refresh_margin: Seconds before expiry to refresh (defaults to settings)
+            shared_cache: Share tokens between workers via SQLite (defaults to settings)
+            db_path: SQLite file for the shared cache (defaults to settings)
+        """
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.refresh_margin = refresh_margin if refresh_margin is not None else settings.lark_token_refresh_margin_seconds
+        shared_cache = shared_cache if shared_cache is not None else settings.lark_token_shared_cache
+
+        self._token: Optional[str] = None
+        self._expires_at: float = 0.0
+        self._lock = threading.Lock()
+        self._refreshed = threading.Condition(self._lock)
+        self._refreshing = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._conn = None
+        self._db_lock = threading.Lock()
+        if shared_cache:
+            self._conn = connect(db_path or settings.state_db_path)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS tokens (
+                    name TEXT PRIMARY KEY,
+                    token TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+
+    @property
+    def expires_at(self) -> float:
+        """Expiry time (epoch seconds) of the current token."""
+        return self._expires_at
+
+    def get_token(self) -> str:
+        """
+        Get a valid token, waiting for a refresh only if none is cached.
+
+        Returns:
+            Tenant access token
+
+        Raises:
+            Exception: If the token cannot be fetched
+        """
+        if self._token and time.time() < self._expires_at:
+            record_cache("lark_token", hit=True)
+            return self._token
+        record_cache("lark_token", hit=False)
+        token = self.refresh()
+        self.start()
+        return token
+
+    def refresh(self, force: bool = False) -> str:
+        """
+        Refresh the token, joining a refresh that is already running.
+
+        Args:
+            force: Fetch even if the cached token is outside the refresh margin
+
+        Returns:
+            Tenant access token
+        """
+        with self._lock:
+            while self._refreshing:
+                self._refreshed.wait()
+            if not force and self._token and time.time() < self._expires_at - self.refresh_margin:
+                return self._token
+            self._refreshing = True
+
+        try:
+            token, expires_at = self._load_shared()
+            if not token:
+                token, expires_at = self._fetch()
+                self._store_shared(token, expires_at)
+            with self._lock:
+                self._token, self._expires_at = token, expires_at
+            return token
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._refreshed.notify_all()
+
+    def _fetch(self) -> Tuple[str, float]:
+        url = f"{settings.lark_base_url}/open-apis/auth/v3/tenant_access_token/internal"
+        payload = {"app_id": self.app_id, "app_secret": self.app_secret}
+        response = get_http_client().post(url, json=payload, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("code") != 0:
+            raise Exception(f"Failed to get access token: {data.get('msg')}")
+        logger.info("Obtained Lark access token")
+        return data["tenant_access_token"], time.time() + data.get("expire", 7200)
+
+    def _load_shared(self) -> Tuple[Optional[str], float]:
+        """Return another worker's token if it is outside the refresh margin."""
+        if self._conn is None:
+            return None, 0.0
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT token, expires_at FROM tokens WHERE name = ?", (self.app_id,)
+            ).fetchone()
+        if row and row["expires_at"] - self.refresh_margin > time.time():
+            logger.info("Reusing Lark access token from shared cache")
+            return row["token"], row["expires_at"]
+        return None, 0.0
+
+    def _store_shared(self, token: str, expires_at: float) -> None:
+        if self._conn is None:
+            return
+        with self._db_lock:
+            self._conn.execute(
+                """INSERT INTO tokens (name, token, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET token = excluded.token, expires_at = excluded.expires_at
+                WHERE excluded.expires_at > tokens.expires_at""",
+                (self.app_id, token, expires_at),
+            )
+
+    def start(self) -> None:
+        """Start refreshing in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="lark-token-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+
+    def _refresh_loop(self) -> None:
+        retry_delay = 5.0
+        while not self._stop.is_set():
+            # Spread refreshes so workers sharing the cache don't all fetch at once
+            wake_at = self._expires_at - self.refresh_margin + random.uniform(0, min(60.0, self.refresh_margin / 4))
+            if self._stop.wait(max(0.0, wake_at - time.time())):
+                return
+            try:
+                self.refresh()
+                retry_delay = 5.0
+            except Exception as e:
+                record_error("lark_token")
+                logger.error(f"Background Lark token refresh failed: {e}", exc_info=True)
+                if self._stop.wait(retry_delay):
+                    return
+                retry_delay = min(retry_delay * 2, 300.0)
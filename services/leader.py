@@ -0,0 +1,164 @@
+"""Leader election between worker processes using a SQLite lease."""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElector:
+    """
+    Elects one leader among processes sharing a SQLite file.
+
+    The leader holds a time-limited lease and renews it on every heartbeat.
+    If it stops renewing (crash, hang, shutdown), the lease expires and the
+    next worker to heartbeat takes over. Works across gunicorn workers on
+    one host, which share the same database file.
+    """
+
+    def __init__(
+        self,
+        name: str = "scheduler",
+        db_path: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        heartbeat_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize leader elector.
+
+        Args:
+            name: Lease name (one leader per name)
+            db_path: SQLite file (defaults to settings)
+            lease_seconds: Lease duration (defaults to settings)
+            heartbeat_seconds: Renewal interval (defaults to settings)
+        """
+        self.name = name
+        self.lease_seconds = lease_seconds or settings.leader_lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds or settings.leader_heartbeat_seconds
+        if self.heartbeat_seconds >= self.lease_seconds:
+            raise ValueError("Leader heartbeat interval must be shorter than the lease")
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._conn = connect(db_path or settings.state_db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                acquired_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        self._lock = threading.Lock()
+        self._lease_expires_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        logger.info(f"Initialized LeaderElector for '{name}' as {self.worker_id}")
+
+    @property
+    def is_leader(self) -> bool:
+        """True while this worker holds an unexpired lease."""
+        return time.time() < self._lease_expires_at
+
+    def try_acquire(self) -> bool:
+        """
+        Acquire the lease if it is free or expired, or renew it if held.
+
+        Returns:
+            True if this worker is the leader
+        """
+        now = time.time()
+        expires_at = now + self.lease_seconds
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO leases (name, holder, acquired_at, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    acquired_at = CASE WHEN leases.holder = excluded.holder
+                                       THEN leases.acquired_at ELSE excluded.acquired_at END,
+                    holder = excluded.holder,
+                    expires_at = excluded.expires_at
+                WHERE leases.holder = excluded.holder OR leases.expires_at < ?""",
+                (self.name, self.worker_id, now, expires_at, now),
+            )
+            row = self._conn.execute("SELECT holder FROM leases WHERE name = ?", (self.name,)).fetchone()
+
+        was_leader = self.is_leader
+        if row and row["holder"] == self.worker_id:
+            self._lease_expires_at = expires_at
+            if not was_leader:
+                logger.info(f"{self.worker_id} became leader for '{self.name}'")
+            return True
+
+        self._lease_expires_at = 0.0
+        if was_leader:
+            logger.warning(f"{self.worker_id} lost leadership for '{self.name}'")
+        return False
+
+    def release(self) -> None:
+        """Give up the lease so another worker can take over immediately."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE name = ? AND holder = ?",
+                (self.name, self.worker_id),
+            )
+        self._lease_expires_at = 0.0
+
+    def current_leader(self) -> Optional[Dict]:
+        """Return the current lease holder, if the lease is live."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT holder, acquired_at, expires_at FROM leases WHERE name = ?", (self.name,)
+            ).fetchone()
+        if not row or row["expires_at"] < time.time():
+            return None
+        return dict(row)
+
+    def start(self) -> None:
+        """Start heartbeating in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._heartbeat, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop heartbeating and release the lease."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.heartbeat_seconds)
+        if self.is_leader:
+            self.release()
+            logger.info(f"{self.worker_id} released leadership for '{self.name}'")
+
+    def _heartbeat(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.try_acquire()
+            except Exception as e:
+                logger.error(f"Leader heartbeat failed: {e}", exc_info=True)
+                self._lease_expires_at = 0.0
+            self._stop.wait(self.heartbeat_seconds)
+
+    def status(self) -> Dict:
+        """Leadership status for status endpoints."""
+        leader = self.current_leader()
+        return {
+            "worker_id": self.worker_id,
+            "is_leader": self.is_leader,
+            "leader": leader["holder"] if leader else None,
+            "leader_since": leader["acquired_at"] if leader else None,
+            "lease_expires_at": leader["expires_at"] if leader else None,
+        }
@@ -0,0 +1,133 @@
+"""LLM response cache: in-memory LRU in front of a SQLite store."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.metrics import record_cache
+from services.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    temperature: float,
+    max_tokens: Optional[int],
+) -> str:
+    """Hash of everything that determines a generation."""
+    payload = json.dumps([provider, model, system_prompt, prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Caches LLM responses by prompt hash.
+
+    Lookups hit an in-memory LRU first, then the SQLite store (shared by
+    workers on one host and kept across restarts). Entries older than the
+    TTL are treated as misses.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            db_path: SQLite file (defaults to settings)
+            max_entries: In-memory LRU size (defaults to settings)
+            ttl_seconds: Entry lifetime (defaults to settings)
+        """
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.llm_cache_ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = connect(db_path or settings.state_db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+
+    def get(self, key: str, ttl_seconds: Optional[float] = None) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Result of `cache_key`
+            ttl_seconds: Max entry age for this lookup (defaults to the cache's TTL)
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        min_created_at = time.time() - ttl
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            else:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (row["response"], row["created_at"])
+                    self._remember(key, entry)
+
+        if entry is None or entry[1] < min_created_at:
+            record_cache("llm", hit=False)
+            return None
+        record_cache("llm", hit=True)
+        return entry[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response."""
+        entry = (response, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            self._conn.execute(
+                """INSERT INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET response = excluded.response, created_at = excluded.created_at""",
+                (key, entry[0], entry[1]),
+            )
+
+    def _remember(self, key: str, entry: Tuple[str, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def prune(self) -> int:
+        """
+        Delete expired entries from the store.
+
+        Returns:
+            Number of entries deleted
+        """
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (cutoff,))
+            for key in [k for k, (_, created_at) in self._memory.items() if created_at < cutoff]:
+                del self._memory[key]
+        return cursor.rowcount
@@ -1,9 +1,10 @@
 """LLM client wrapper for OpenAI and Anthropic APIs."""
 
 import logging
+import threading
+import time
+from collections import deque
 from typing import Optional
-from openai import OpenAI
-from anthropic import Anthropic
 
 import sys
 from pathlib import Path
@@ -12,42 +13,115 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from services import deadline
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from services.http_client import new_sdk_http_client, warm_connections
+from services.llm_cache import LLMResponseCache, cache_key
+from services.metrics import LLM_GENERATE_SECONDS, track
+from services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 
+def llm_breaker(provider: str) -> CircuitBreaker:
+    """The process-wide circuit breaker for an LLM provider."""
+    return get_breaker(
+        f"llm:{provider}",
+        failure_threshold=settings.llm_breaker_failure_threshold,
+        recovery_seconds=settings.llm_breaker_recovery_seconds,
+    )
+
+
+class RollingLatency:
+    """Latencies of a provider's most recent calls."""
+
+    def __init__(self, window: Optional[int] = None):
+        """
+        Initialize latency window.
+
+        Args:
+            window: Number of recent samples kept (defaults to settings)
+        """
+        self._samples = deque(maxlen=window or settings.llm_latency_window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add a sample."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency at quantile q (0-1), or None if there are no samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
 class LLMClient:
     """Thin wrapper for LLM API calls."""
 
-    def __init__(self, provider: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        api_key: Optional[str] = None,
+        cache: Optional[LLMResponseCache] = None,
+    ):
         """
         Initialize LLM client.
 
         Args:
             provider: LLM provider ('openai' or 'anthropic'). Defaults to settings.
             api_key: API key. Defaults to settings.
+            cache: Response cache. Defaults to a shared SQLite-backed cache if
+                LLM_CACHE_ENABLED, else no caching.
         """
         self.provider = provider or settings.llm_provider.lower()
-        api_key = api_key or settings.get_llm_api_key()
+        api_key = api_key or settings.get_llm_api_key(self.provider)
+
+        self._http_client = new_sdk_http_client()
 
+        # SDKs are imported here so importing this module stays cheap
         if self.provider == "openai":
-            self.client = OpenAI(api_key=api_key)
+            from openai import OpenAI
+            self.client = OpenAI(api_key=api_key, base_url=settings.openai_base_url, http_client=self._http_client)
             self.model = "gpt-4-turbo-preview"
         elif self.provider == "anthropic":
+            from anthropic import Anthropic
             base_url = settings.anthropic_base_url or "https://api.anthropic.com"
-            self.client = Anthropic(api_key=api_key, base_url=base_url)
+            self.client = Anthropic(api_key=api_key, base_url=base_url, http_client=self._http_client)
             self.model = "claude-3-5-sonnet-20241022"
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
 
+        self.cache = cache
+        if self.cache is None and settings.llm_cache_enabled:
+            self.cache = LLMResponseCache()
+            self.cache.prune()
+
+        # Latency of uncached calls, and a breaker that fails fast while the provider is down
+        self.latency = RollingLatency()
+        self.breaker = llm_breaker(self.provider)
+
         logger.info(f"Initialized LLM client with provider: {self.provider}")
 
+    def warm_connection(self) -> bool:
+        """Open a pooled connection to the provider's API host."""
+        return warm_connections([str(self.client.base_url)], client=self._http_client) > 0
+
+    @traced("llm.generate")
     def generate(
         self,
         prompt: str,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
         system_prompt: Optional[str] = None,
+        use_cache: bool = True,
+        cache_ttl: Optional[float] = None,
     ) -> str:
         """
         Generate text completion.
@@ -57,37 +131,101 @@ class LLMClient:
             temperature: Sampling temperature (0.0-1.0)
             max_tokens: Maximum tokens to generate
             system_prompt: System prompt (if supported)
+            use_cache: Set False to bypass the response cache (the fresh result is still stored)
+            cache_ttl: Max age of a cached response to accept (defaults to LLM_CACHE_TTL_SECONDS)
 
         Returns:
             Generated text
+
+        Raises:
+            CircuitOpenError: If the provider's circuit breaker is open
+            DeadlineExceeded: If the request deadline passed before or during the call
         """
+        if use_cache:
+            cached = self.cached(prompt, temperature, max_tokens, system_prompt, cache_ttl)
+            if cached is not None:
+                logger.info("Using cached LLM response")
+                return cached
+
+        deadline.check("LLM call")
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"LLM provider {self.provider} is unavailable (circuit open)")
+        start = time.perf_counter()
         try:
-            if self.provider == "openai":
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
-                return response.choices[0].message.content
-
-            elif self.provider == "anthropic":
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=max_tokens or 4096,
-                    temperature=temperature,
-                    system=system_prompt or "",
-                    messages=[{"role": "user", "content": prompt}],
-                )
-                return response.content[0].text
-
+            with track(LLM_GENERATE_SECONDS, component="llm", provider=self.provider, model=self.model):
+                response = self._generate(prompt, temperature, max_tokens, system_prompt)
         except Exception as e:
+            left = deadline.remaining()
+            if left is not None and left <= 0:
+                # Cut short by the request deadline, which says nothing about the provider
+                self.breaker.release()
+                logger.warning(f"LLM call to {self.provider} stopped at the request deadline: {e}")
+                raise deadline.DeadlineExceeded("Deadline exceeded during LLM call") from e
+            self.breaker.record_failure()
             logger.error(f"LLM generation error: {e}", exc_info=True)
             raise
+        self.breaker.record_success()
+        self.latency.record(time.perf_counter() - start)
+
+        if self.cache is not None and response:
+            key = cache_key(self.provider, self.model, system_prompt, prompt, temperature, max_tokens)
+            try:
+                self.cache.put(key, response)
+            except Exception as e:
+                # The response is already paid for; losing the cache entry is no reason to fail
+                logger.warning(f"Could not cache LLM response: {e}")
+        return response
+
+    def cached(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+    ) -> Optional[str]:
+        """Cached response for these arguments, or None on a miss or without a cache."""
+        if self.cache is None:
+            return None
+        key = cache_key(self.provider, self.model, system_prompt, prompt, temperature, max_tokens)
+        try:
+            return self.cache.get(key, ttl_seconds=cache_ttl)
+        except Exception as e:
+            logger.warning(f"Could not read LLM response cache, calling the provider: {e}")
+            return None
 
+    def _generate(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        system_prompt: Optional[str],
+    ) -> str:
+        """Call the configured provider's API, within the request deadline if there is one."""
+        client = self.client
+        if deadline.remaining() is not None:
+            # A retry would overrun the deadline: fail fast and let the caller degrade
+            client = client.with_options(timeout=deadline.timeout(600.0), max_retries=0)
 
+        if self.provider == "openai":
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            return response.choices[0].message.content
+
+        response = client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens or 4096,
+            temperature=temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return response.content[0].text
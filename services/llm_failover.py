@@ -0,0 +1,201 @@
+"""Multi-provider LLM client: hedged requests and failover between providers."""
+
+import contextvars
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, Optional
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.circuit_breaker import OPEN, CircuitOpenError
+from services.deadline import DeadlineExceeded
+from services.llm_client import LLMClient
+from services.metrics import LLM_HEDGES, record_fallback
+
+logger = logging.getLogger(__name__)
+
+HEDGE_QUANTILE = 0.95
+
+
+class FailoverLLMClient:
+    """
+    Sends each generation to a primary provider and, when needed, a secondary.
+
+    - Hedging: if the primary has not answered by its rolling p95 latency, the
+      same request goes to the secondary and the first answer wins.
+    - Failover: if the primary errors, the secondary is asked straight away.
+    - Circuit breaking: a provider whose breaker is open is skipped, so calls
+      route to the other one without waiting for a timeout.
+
+    Calls run in a copy of the caller's context, so a request deadline
+    bounds both providers' calls.
+
+    The provider SDKs are synchronous, so a losing call cannot be aborted; it
+    finishes in the background (its latency and outcome still feed the
+    provider's p95 and breaker) and its result is discarded.
+
+    Exposes the same `generate` signature as `LLMClient`.
+    """
+
+    def __init__(
+        self,
+        primary: Optional[LLMClient] = None,
+        secondary: Optional[LLMClient] = None,
+        hedge: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize failover client.
+
+        Args:
+            primary: Client for the preferred provider (defaults to LLM_PROVIDER)
+            secondary: Client for the other provider (defaults to LLM_FALLBACK_PROVIDER)
+            hedge: Whether to hedge slow primary calls (defaults to settings)
+            max_workers: Max concurrent provider calls (defaults to settings)
+        """
+        self.primary = primary or LLMClient()
+        self.secondary = secondary or LLMClient(provider=settings.llm_fallback_provider.lower())
+        if self.primary.provider == self.secondary.provider:
+            raise ValueError("LLM_FALLBACK_PROVIDER must differ from LLM_PROVIDER")
+        self.hedge = settings.llm_hedge_enabled if hedge is None else hedge
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or settings.llm_hedge_max_workers, thread_name_prefix="llm-call"
+        )
+        logger.info(
+            f"Initialized failover LLM client: {self.primary.provider} -> {self.secondary.provider}"
+            f" (hedging {'on' if self.hedge else 'off'})"
+        )
+
+    @property
+    def provider(self) -> str:
+        return self.primary.provider
+
+    @property
+    def model(self) -> str:
+        return self.primary.model
+
+    def warm_connection(self) -> bool:
+        """Open pooled connections to both providers' API hosts."""
+        return any([self.primary.warm_connection(), self.secondary.warm_connection()])
+
+    def hedge_delay(self, client: LLMClient) -> float:
+        """Seconds to wait for a client before hedging: its p95 once there are enough samples."""
+        if len(client.latency) < settings.llm_hedge_min_samples:
+            return settings.llm_hedge_default_delay_seconds
+        return client.latency.quantile(HEDGE_QUANTILE)
+
+    def _order(self) -> List[LLMClient]:
+        """Clients to try, preferred first, skipping any whose circuit is open."""
+        clients = [c for c in (self.primary, self.secondary) if c.breaker.state != OPEN]
+        if not clients:
+            raise CircuitOpenError("All LLM providers are unavailable (circuits open)")
+        return clients
+
+    def _submit(self, client: LLMClient, **kwargs) -> Future:
+        # Run in a copy of the caller's context so request traces see the spans
+        return self._pool.submit(contextvars.copy_context().run, client.generate, use_cache=False, **kwargs)
+
+    def generate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        use_cache: bool = True,
+        cache_ttl: Optional[float] = None,
+    ) -> str:
+        """
+        Generate text completion from whichever provider answers first.
+
+        Args:
+            prompt: User prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens to generate
+            system_prompt: System prompt (if supported)
+            use_cache: Set False to bypass the response cache (the fresh result is still stored)
+            cache_ttl: Max age of a cached response to accept (defaults to LLM_CACHE_TTL_SECONDS)
+
+        Returns:
+            Generated text
+
+        Raises:
+            CircuitOpenError: If every provider's circuit is open
+            Exception: The last provider error if every provider failed
+        """
+        clients = self._order()
+        if use_cache:
+            for client in clients:
+                cached = client.cached(prompt, temperature, max_tokens, system_prompt, cache_ttl)
+                if cached is not None:
+                    logger.info(f"Using cached LLM response ({client.provider})")
+                    return cached
+
+        kwargs = dict(prompt=prompt, temperature=temperature, max_tokens=max_tokens, system_prompt=system_prompt)
+        first = clients[0]
+        backup = clients[1] if len(clients) > 1 else None
+        if first is not self.primary:
+            logger.warning(f"LLM provider {self.primary.provider} circuit open, using {first.provider}")
+            record_fallback("llm_failover")
+        if backup is None:
+            response = first.generate(use_cache=False, **kwargs)
+            self._record_outcome(first, None)
+            return response
+
+        futures = {self._submit(first, **kwargs): first}
+        mode = None
+        if self.hedge:
+            done, _ = wait(futures, timeout=self.hedge_delay(first))
+        else:
+            done, _ = wait(futures)
+        if not done:
+            logger.info(f"LLM provider {first.provider} slow, hedging to {backup.provider}")
+            futures[self._submit(backup, **kwargs)] = backup
+            mode = "hedge"
+
+        last_error: Optional[Exception] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    self._record_outcome(futures[future], mode)
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                last_error = error
+                if mode is None and not isinstance(error, DeadlineExceeded):
+                    # Primary failed before the hedge delay: fail over now
+                    logger.warning(f"LLM provider {first.provider} failed, failing over to {backup.provider}")
+                    record_fallback("llm_failover")
+                    retry = self._submit(backup, **kwargs)
+                    futures[retry] = backup
+                    pending.add(retry)
+                    mode = "failover"
+        raise last_error
+
+    def _record_outcome(self, winner: LLMClient, mode: Optional[str]) -> None:
+        """Count a call by how it was answered, relative to the configured primary provider."""
+        if mode == "hedge":
+            outcome = "primary_won" if winner is self.primary else "hedge_won"
+        elif winner is self.primary:
+            outcome = "primary"
+        else:
+            outcome = "failover"
+        LLM_HEDGES.labels(outcome=outcome, provider=winner.provider).inc()
+
+    def close(self) -> None:
+        """Stop the call pool without waiting for calls that already lost."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_llm_client():
+    """LLM client for the configured providers: failover when LLM_FALLBACK_PROVIDER is set."""
+    if settings.llm_fallback_provider:
+        return FailoverLLMClient()
+    return LLMClient()
@@ -0,0 +1,117 @@
+"""Prometheus metrics and lightweight instrumentation helpers."""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Buckets cover fast cache/Chroma lookups up to slow long-form LLM generations
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Stage latency histograms
+NEWS_FETCH_SECONDS = Histogram(
+    "news_fetch_seconds",
+    "Latency of news provider fetches",
+    ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_GENERATE_SECONDS = Histogram(
+    "llm_generate_seconds",
+    "Latency of LLM generate calls",
+    ["provider", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+EMBEDDING_SECONDS = Histogram(
+    "embedding_seconds",
+    "Latency of embedding API calls",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+VECTOR_QUERY_SECONDS = Histogram(
+    "chroma_query_seconds",
+    "Latency of Chroma similarity queries",
+    ["collection"],
+    buckets=LATENCY_BUCKETS,
+)
+NEWSBOT_PROMPT_TOKENS = Histogram(
+    "newsbot_prompt_tokens",
+    "Tokens of story text sent to the LLM per NewsBot digest",
+    buckets=(250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 16000),
+)
+LARK_SEND_SECONDS = Histogram(
+    "lark_send_seconds",
+    "Latency of outbound Lark messages",
+    ["channel"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Counters
+CACHE_HITS = Counter("cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache misses", ["cache"])
+ERRORS = Counter("errors_total", "Errors raised or reported by a component", ["component"])
+FALLBACKS = Counter("fallbacks_total", "Fallback paths taken", ["kind"])
+LARK_DISPATCH = Counter(
+    "lark_dispatch_total",
+    "Outbound Lark message outcomes (sent, retried, rate_limited, dropped, rejected, cancelled, failed)",
+    ["outcome"],
+)
+LLM_HEDGES = Counter(
+    "llm_hedges_total",
+    "Multi-provider LLM calls by outcome (primary, hedge_won, primary_won, failover) and answering provider",
+    ["outcome", "provider"],
+)
+AGENT_REJECTIONS = Counter(
+    "agent_rejections_total",
+    "Agent runs rejected because their pool was full or the run couldn't start before its deadline",
+    ["pool"],
+)
+
+# Gauges
+QUEUE_DEPTH = Gauge("queue_depth", "Items waiting in an internal queue", ["queue"])
+IN_FLIGHT_REQUESTS = Gauge("http_requests_in_flight", "HTTP requests currently being served", ["endpoint"])
+CIRCUIT_STATE = Gauge("circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["name"])
+
+
+@contextmanager
+def track(histogram: Histogram, component: Optional[str] = None, **labels: str) -> Iterator[None]:
+    """
+    Time the wrapped block into a histogram.
+
+    Args:
+        histogram: Histogram to observe the duration into
+        component: Component name for the errors counter (counted if the block raises)
+        **labels: Histogram label values
+
+    Yields:
+        None
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if component:
+            ERRORS.labels(component=component).inc()
+        raise
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def record_error(component: str) -> None:
+    """Count an error that was handled without raising."""
+    ERRORS.labels(component=component).inc()
+
+
+def record_fallback(kind: str) -> None:
+    """Count a fallback path being taken."""
+    FALLBACKS.labels(kind=kind).inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    (CACHE_HITS if hit else CACHE_MISSES).labels(cache=cache).inc()
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text exposition format."""
+    return generate_latest(), CONTENT_TYPE_LATEST
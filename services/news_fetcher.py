@@ -1,156 +1,415 @@
 """News fetching service with support for multiple APIs."""
 
+import asyncio
 import logging
-from typing import List, Dict, Optional
+import math
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
 import httpx
-from datetime import datetime, timedelta
+
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from config.settings import settings
+from services import deadline
+from services.article_store import ArticleStore, canonicalize_url
+from services.async_utils import run_sync
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from services.dedup import cluster_articles
+from services.http_client import get_async_http_client
+from services.metrics import NEWS_FETCH_SECONDS, record_fallback, track
+from services.tracing import span, traced
+
 logger = logging.getLogger(__name__)
 
+NEWS_PROVIDERS = ("newsapi", "newsdata")
+
+
+def news_breaker(provider: str) -> CircuitBreaker:
+    """The process-wide circuit breaker for a news provider."""
+    return get_breaker(
+        f"news:{provider}",
+        failure_threshold=settings.news_breaker_failure_threshold,
+        recovery_seconds=settings.news_breaker_recovery_seconds,
+    )
+
 
 class NewsFetcher:
     """Fetches news from various APIs."""
 
-    def __init__(self, newsapi_key: Optional[str] = None, newsdata_key: Optional[str] = None):
+    def __init__(
+        self,
+        newsapi_key: Optional[str] = None,
+        newsdata_key: Optional[str] = None,
+        article_store: Optional[ArticleStore] = None,
+    ):
         """
         Initialize news fetcher.
 
         Args:
             newsapi_key: NewsAPI.org API key
             newsdata_key: NewsData.io API key
+            article_store: Optional store that records every fetched article
         """
         self.newsapi_key = newsapi_key
         self.newsdata_key = newsdata_key
+        self.article_store = article_store
+        self.breakers = {provider: news_breaker(provider) for provider in NEWS_PROVIDERS}
+        # Last non-empty result per request, reused when every provider fails
+        self._last_good: Dict[Tuple, Tuple[float, List[Dict[str, str]]]] = {}
+        self._last_good_lock = threading.Lock()
         logger.info("Initialized NewsFetcher")
 
-    def fetch_from_newsapi(self, sources: List[str] = None, country: str = "hk") -> List[Dict[str, str]]:
+    def _with_last_good(self, key: Tuple, articles: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Remember a non-empty result, or fall back to the last good one for the same request."""
+        with self._last_good_lock:
+            if articles:
+                self._last_good[key] = (time.time(), articles)
+                return articles
+            cached = self._last_good.get(key)
+        if cached and time.time() - cached[0] <= settings.news_stale_max_age_seconds:
+            logger.warning(f"No articles fetched, reusing {len(cached[1])} from {time.time() - cached[0]:.0f}s ago")
+            record_fallback("news_stale_cache")
+            return list(cached[1])
+        return articles
+
+    def _record(self, articles: List[Dict[str, str]], provider: str) -> None:
+        """Record fetched articles in the article store, if there is one."""
+        if not self.article_store or not articles:
+            return
+        try:
+            self.article_store.record(articles, provider)
+        except Exception as e:
+            logger.error(f"Error recording articles: {e}", exc_info=True)
+
+    async def _get_page(self, client: httpx.AsyncClient, provider: str, url: str, params: Dict) -> Dict:
         """
-        Fetch news from NewsAPI.org.
+        Fetch one page of results, within the request deadline if there is one.
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open (without making a request)
+        """
+        deadline.check(f"{provider} fetch")
+        breaker = self.breakers[provider]
+        if not breaker.allow():
+            raise CircuitOpenError(f"{provider} circuit open")
+        try:
+            with span(f"news.{provider}.page"), track(NEWS_FETCH_SECONDS, component=provider, provider=provider):
+                response = await client.get(url, params=params, timeout=deadline.timeout(10.0))
+                response.raise_for_status()
+                data = response.json()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            left = deadline.remaining()
+            if left is not None and left <= 0:
+                breaker.release()
+            else:
+                breaker.record_failure()
+            raise
+        breaker.record_success()
+        return data
+
+    async def aiter_newsapi(
+        self,
+        sources: List[str] = None,
+        country: str = "hk",
+        target: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Stream unique articles from NewsAPI.org, fetching pages concurrently.
+
+        The first page gives the total result count; the remaining pages
+        needed to reach `target` are then requested together (up to
+        NEWS_FETCH_CONCURRENCY at a time) and yielded as they complete.
+        Outstanding pages are cancelled once `target` unique articles are
+        yielded or the consumer stops iterating.
 
         Args:
             sources: List of source IDs (e.g., ['reuters', 'bbc-news'])
             country: Country code (default: 'hk' for Hong Kong)
+            target: Unique articles wanted (defaults to settings)
 
-        Returns:
-            List of news articles
+        Yields:
+            Article dicts
         """
         if not self.newsapi_key:
             logger.warning("NewsAPI key not configured")
-            return []
+            return
 
+        target = target or settings.news_fetch_target_articles
+        page_size = min(settings.news_fetch_page_size, 100)
+        url = f"{settings.newsapi_base_url}/v2/top-headlines"
+        params = {"apiKey": self.newsapi_key, "pageSize": page_size}
+        if sources:
+            params["sources"] = ",".join(sources)
+        else:
+            params["country"] = country
+
+        seen = _SeenArticles()
+        client = get_async_http_client()
         try:
-            url = "https://newsapi.org/v2/top-headlines"
-            params = {
-                "apiKey": self.newsapi_key,
-                "pageSize": 10,
-            }
-
-            if sources:
-                params["sources"] = ",".join(sources)
-            else:
-                params["country"] = country
+            data = await self._get_page(client, "newsapi", url, {**params, "page": 1})
+        except CircuitOpenError:
+            logger.warning("NewsAPI circuit open, skipping")
+            return
+        except Exception as e:
+            logger.error(f"Error fetching from NewsAPI: {e}", exc_info=True)
+            return
+        for article in seen.new(await self._page_articles(_parse_newsapi(data), "newsapi")):
+            yield article
+            if seen.count >= target:
+                return
 
-            response = httpx.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
+        pages = min(
+            settings.news_fetch_max_pages,
+            math.ceil(data.get("totalResults", 0) / page_size),
+            math.ceil(target / page_size) + 1,
+        )
+        if pages < 2:
+            return
 
-            articles = []
-            for article in data.get("articles", []):
-                if article.get("title") and article.get("url"):
-                    articles.append({
-                        "title": article["title"],
-                        "source": article.get("source", {}).get("name", "Unknown"),
-                        "url": article["url"],
-                        "description": article.get("description", ""),
-                    })
+        semaphore = asyncio.Semaphore(settings.news_fetch_concurrency)
 
-            logger.info(f"Fetched {len(articles)} articles from NewsAPI")
-            return articles
+        async def fetch(page: int) -> Dict:
+            async with semaphore:
+                return await self._get_page(client, "newsapi", url, {**params, "page": page})
 
-        except Exception as e:
-            logger.error(f"Error fetching from NewsAPI: {e}", exc_info=True)
-            return []
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, pages + 1)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    data = await next_done
+                except Exception as e:
+                    logger.warning(f"Error fetching NewsAPI page: {e}")
+                    continue
+                for article in seen.new(await self._page_articles(_parse_newsapi(data), "newsapi")):
+                    yield article
+                    if seen.count >= target:
+                        return
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled pages finish unwinding (and release their breaker trials)
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-    def fetch_from_newsdata(self, category: str = "top", country: str = "hk") -> List[Dict[str, str]]:
+    async def aiter_newsdata(
+        self,
+        category: str = "top",
+        country: str = "hk",
+        target: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, str]]:
         """
-        Fetch news from NewsData.io.
+        Stream unique articles from NewsData.io, following its nextPage cursor.
+
+        Pages can only be fetched in order, so the request for the next page
+        is started before the current page's articles are yielded.
 
         Args:
             category: News category (top, business, technology, etc.)
             country: Country code (default: 'hk')
+            target: Unique articles wanted (defaults to settings)
 
-        Returns:
-            List of news articles
+        Yields:
+            Article dicts
         """
         if not self.newsdata_key:
             logger.warning("NewsData.io key not configured")
-            return []
+            return
+
+        target = target or settings.news_fetch_target_articles
+        url = f"{settings.newsdata_base_url}/api/1/news"
+        params = {
+            "apikey": self.newsdata_key,
+            "category": category,
+            "country": country,
+            "language": "en",
+        }
 
+        seen = _SeenArticles()
+        client = get_async_http_client()
+        pending = asyncio.ensure_future(self._get_page(client, "newsdata", url, params))
+        pages = 1
         try:
-            url = "https://newsdata.io/api/1/news"
-            params = {
-                "apikey": self.newsdata_key,
-                "category": category,
-                "country": country,
-                "language": "en",
-            }
-
-            response = httpx.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-
-            articles = []
-            for article in data.get("results", []):
-                if article.get("title") and article.get("link"):
-                    articles.append({
-                        "title": article["title"],
-                        "source": article.get("source_name", "Unknown"),
-                        "url": article["link"],
-                        "description": article.get("description", ""),
-                    })
-
-            logger.info(f"Fetched {len(articles)} articles from NewsData.io")
-            return articles
+            while pending is not None:
+                try:
+                    data = await pending
+                except CircuitOpenError:
+                    logger.warning("NewsData.io circuit open, skipping")
+                    return
+                except Exception as e:
+                    logger.error(f"Error fetching from NewsData.io: {e}", exc_info=True)
+                    return
+                pending = None
+                next_page = data.get("nextPage")
+                if next_page and pages < settings.news_fetch_max_pages and seen.count < target:
+                    pending = asyncio.ensure_future(
+                        self._get_page(client, "newsdata", url, {**params, "page": next_page})
+                    )
+                    pages += 1
+                for article in seen.new(await self._page_articles(_parse_newsdata(data, category), "newsdata")):
+                    yield article
+                    if seen.count >= target:
+                        return
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
 
-        except Exception as e:
-            logger.error(f"Error fetching from NewsData.io: {e}", exc_info=True)
-            return []
+    async def _page_articles(self, articles: List[Dict[str, str]], provider: str) -> List[Dict[str, str]]:
+        """Record a page's articles before they are yielded, in a worker thread so page fetches keep running."""
+        if self.article_store and articles:
+            await asyncio.to_thread(self._record, articles, provider)
+        return articles
 
-    def fetch_combined(self, preferred_sources: List[str] = None) -> List[Dict[str, str]]:
+    @traced("news.fetch_from_newsapi")
+    def fetch_from_newsapi(
+        self,
+        sources: List[str] = None,
+        country: str = "hk",
+        target: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
         """
-        Fetch news from multiple sources and combine.
+        Fetch news from NewsAPI.org.
 
         Args:
-            preferred_sources: Preferred news sources (e.g., ['reuters', 'bbc-news'])
+            sources: List of source IDs (e.g., ['reuters', 'bbc-news'])
+            country: Country code (default: 'hk' for Hong Kong)
+            target: Unique articles wanted (defaults to settings)
 
         Returns:
-            Combined list of news articles
+            List of news articles (the last good result, if recent, when none could be fetched)
         """
-        all_articles = []
+        articles = run_sync(_collect(self.aiter_newsapi(sources=sources, country=country, target=target)))
+        logger.info(f"Fetched {len(articles)} articles from NewsAPI")
+        return self._with_last_good(("newsapi", tuple(sources or ()), country), articles)
+
+    @traced("news.fetch_from_newsdata")
+    def fetch_from_newsdata(
+        self,
+        category: str = "top",
+        country: str = "hk",
+        target: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Fetch news from NewsData.io.
+
+        Args:
+            category: News category (top, business, technology, etc.)
+            country: Country code (default: 'hk')
+            target: Unique articles wanted (defaults to settings)
+
+        Returns:
+            List of news articles (the last good result, if recent, when none could be fetched)
+        """
+        articles = run_sync(_collect(self.aiter_newsdata(category=category, country=country, target=target)))
+        logger.info(f"Fetched {len(articles)} articles from NewsData.io")
+        return self._with_last_good(("newsdata", category, country), articles)
+
+    async def _acombined(self, preferred_sources: List[str] = None) -> List[Dict[str, str]]:
+        """Exact-dedup articles from both providers as they stream in."""
+        unique_articles: List[Dict[str, str]] = []
+        seen_titles = set()
+        seen_urls = set()
+
+        async def consume(articles: AsyncIterator[Dict[str, str]]) -> None:
+            async for article in articles:
+                title_lower = article["title"].lower()
+                url_key = canonicalize_url(article["url"])
+                if title_lower not in seen_titles and url_key not in seen_urls:
+                    seen_titles.add(title_lower)
+                    seen_urls.add(url_key)
+                    unique_articles.append(article)
 
         # Try NewsAPI first
         if self.newsapi_key:
-            articles = self.fetch_from_newsapi(sources=preferred_sources)
-            all_articles.extend(articles)
+            await consume(self.aiter_newsapi(sources=preferred_sources))
 
         # Try NewsData.io as fallback
-        if len(all_articles) < 5 and self.newsdata_key:
-            articles = self.fetch_from_newsdata()
-            all_articles.extend(articles)
+        if len(unique_articles) < 5 and self.newsdata_key:
+            if self.newsapi_key:
+                record_fallback("newsdata")
+            await consume(self.aiter_newsdata())
 
-        # Remove duplicates based on title
-        seen_titles = set()
-        unique_articles = []
-        for article in all_articles:
-            title_lower = article["title"].lower()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                unique_articles.append(article)
-
-        logger.info(f"Combined {len(unique_articles)} unique articles")
-        return unique_articles[:10]  # Return top 10
+        return unique_articles
+
+    @traced("news.fetch_combined")
+    def fetch_combined(self, preferred_sources: List[str] = None) -> List[Dict[str, str]]:
+        """
+        Fetch news from multiple sources and combine.
+
+        Args:
+            preferred_sources: Preferred news sources (e.g., ['reuters', 'bbc-news'])
+
+        Returns:
+            Combined list of news articles, one per story, each with a
+            'sources' list of every outlet that ran it (the last good result,
+            if recent, when none could be fetched)
+        """
+        unique_articles = run_sync(self._acombined(preferred_sources))
+
+        # Collapse the same story run by several outlets under different titles
+        stories = cluster_articles(unique_articles)
+
+        logger.info(f"Combined {len(unique_articles)} unique articles into {len(stories)} stories")
+        return self._with_last_good(("combined", tuple(preferred_sources or ())), stories[:settings.news_max_headlines])
+
+
+class _SeenArticles:
+    """Tracks canonical URLs already yielded by one paginated fetch."""
+
+    def __init__(self):
+        self._urls = set()
+
+    @property
+    def count(self) -> int:
+        return len(self._urls)
+
+    def new(self, articles: List[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        for article in articles:
+            key = canonicalize_url(article["url"])
+            if key not in self._urls:
+                self._urls.add(key)
+                yield article
+
+
+async def _collect(articles: AsyncIterator[Dict[str, str]]) -> List[Dict[str, str]]:
+    return [article async for article in articles]
+
+
+def _parse_newsapi(data: Dict) -> List[Dict[str, str]]:
+    articles = []
+    for article in data.get("articles", []):
+        if article.get("title") and article.get("url"):
+            articles.append({
+                "title": article["title"],
+                "source": (article.get("source") or {}).get("name", "Unknown"),
+                "url": article["url"],
+                "description": article.get("description", ""),
+                "published_at": article.get("publishedAt"),
+                "provider": "newsapi",
+                "category": None,
+            })
+    return articles
+
+
+def _parse_newsdata(data: Dict, category: str) -> List[Dict[str, str]]:
+    articles = []
+    for article in data.get("results", []):
+        if article.get("title") and article.get("link"):
+            articles.append({
+                "title": article["title"],
+                "source": article.get("source_name", "Unknown"),
+                "url": article["link"],
+                "description": article.get("description", ""),
+                "published_at": article.get("pubDate"),
+                "provider": "newsdata",
+                "category": (article.get("category") or [category])[0],
+            })
+    return articles
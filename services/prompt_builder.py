@@ -0,0 +1,206 @@
+"""Token-budgeted story lists for NewsBot prompts."""
+
+import html
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.tokenizer import get_encoding
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio, used only if the tiktoken encoding can't be loaded
+_CHARS_PER_TOKEN = 4
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Feed and API boilerplate that carries no information about the story
+_BOILERPLATE_RES = [
+    re.compile(r"\[\+\d+ chars\]"),  # NewsAPI truncation marker
+    re.compile(r"The post .+? appeared first on .+?\.?$", re.IGNORECASE),
+    re.compile(r"\b(read more|continue reading|click here|full story|subscribe now|sign up)\b.*$", re.IGNORECASE),
+    re.compile(r"(\.\.\.|…)\s*$"),
+]
+
+
+def clean_text(text: Optional[str]) -> str:
+    """Unescape HTML, strip tags and boilerplate, and collapse whitespace."""
+    if not text:
+        return ""
+    text = _TAG_RE.sub(" ", html.unescape(text))
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    for pattern in _BOILERPLATE_RES:
+        text = pattern.sub("", text).strip()
+    return text
+
+
+def story_sources(article: Dict) -> str:
+    """Outlets that ran a story (several if near-duplicates were clustered)."""
+    return ", ".join(article.get("sources") or [article.get("source", "Unknown")])
+
+
+def story_line(article: Dict) -> str:
+    """One prompt line for a story: title, sources and description if any."""
+    line = f"- {article['title']} ({story_sources(article)})"
+    if article.get("description"):
+        line += f": {article['description']}"
+    return line
+
+
+def _published_ts(article: Dict) -> float:
+    value = article.get("published_at")
+    if not value:
+        return 0.0
+    try:
+        published = datetime.fromisoformat(value)
+    except ValueError:
+        return 0.0
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.timestamp()
+
+
+class PromptBuilder:
+    """
+    Fits a digest's stories into a token budget.
+
+    Stories are ranked by their best source (NEWS_SOURCE_PRIORITY order,
+    unranked sources last), then by recency. Titles and descriptions are
+    cleaned and each description is trimmed to a per-story token limit.
+    Stories are added in rank order while they fit; a story that only fits
+    without its description goes in title-only.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: Optional[int] = None,
+        description_tokens: Optional[int] = None,
+        source_priority: Optional[List[str]] = None,
+    ):
+        """
+        Initialize prompt builder.
+
+        Args:
+            budget_tokens: Max tokens of story text per digest (defaults to settings)
+            description_tokens: Max tokens per description (defaults to settings)
+            source_priority: Source names, most preferred first (defaults to settings)
+        """
+        self.budget_tokens = budget_tokens or settings.newsbot_prompt_token_budget
+        self.description_tokens = (
+            description_tokens if description_tokens is not None else settings.newsbot_description_tokens
+        )
+        if source_priority is None:
+            source_priority = [s.strip() for s in settings.news_source_priority.split(",") if s.strip()]
+        self._source_rank = {name.lower(): rank for rank, name in enumerate(source_priority)}
+        self._encoding = None
+        self._estimate_only = False
+
+    def _encoder(self):
+        """The tiktoken encoding, or None if it can't be loaded (then token counts are estimated)."""
+        if self._encoding is None and not self._estimate_only:
+            try:
+                self._encoding = get_encoding()
+            except Exception as e:
+                logger.warning(f"Could not load tiktoken encoding, estimating token counts: {e}")
+                self._estimate_only = True
+        return self._encoding
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens in text."""
+        encoding = self._encoder()
+        if encoding is None:
+            return -(-len(text) // _CHARS_PER_TOKEN)
+        return len(encoding.encode(text))
+
+    def trim(self, text: str, max_tokens: int) -> Tuple[str, bool]:
+        """
+        Trim text to a token limit, at a word boundary.
+
+        Returns:
+            (text, whether it was trimmed)
+        """
+        encoding = self._encoder()
+        if encoding is None:
+            limit = max_tokens * _CHARS_PER_TOKEN
+            if len(text) <= limit:
+                return text, False
+            cut = text[:limit]
+        else:
+            tokens = encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text, False
+            cut = encoding.decode(tokens[:max_tokens])
+        if " " in cut:
+            cut = cut.rsplit(" ", 1)[0]
+        return cut.rstrip(" ,;:-") + "…", True
+
+    def _rank(self, article: Dict) -> int:
+        sources = article.get("sources") or [article.get("source", "")]
+        return min((self._source_rank.get(s.lower(), len(self._source_rank)) for s in sources), default=0)
+
+    def fit(self, articles: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """
+        Select and compact stories to fit the token budget.
+
+        Args:
+            articles: Article dicts with 'title', 'source' and optional
+                'description', 'sources' and 'published_at' keys
+
+        Returns:
+            (compacted article copies in priority order, stats dict with
+            'input_tokens', 'budget_tokens', 'stories_included', 'stories_dropped',
+            'descriptions_trimmed' and 'descriptions_dropped' keys)
+        """
+        ranked = sorted(
+            enumerate(articles),
+            key=lambda item: (self._rank(item[1]), -_published_ts(item[1]), item[0]),
+        )
+
+        chosen: List[Dict] = []
+        used = dropped = trimmed = descriptions_dropped = 0
+        for _, article in ranked:
+            story = dict(article)
+            story["title"] = clean_text(article.get("title")) or article.get("title", "")
+            description = clean_text(article.get("description"))
+            if description and self.description_tokens > 0:
+                description, was_trimmed = self.trim(description, self.description_tokens)
+                trimmed += was_trimmed
+            else:
+                description = ""
+            story["description"] = description
+
+            # Each line costs its tokens plus the newline joining it to the next
+            cost = self.count_tokens(story_line(story)) + 1
+            title_only = False
+            if used + cost > self.budget_tokens and description:
+                story["description"] = ""
+                title_only = True
+                cost = self.count_tokens(story_line(story)) + 1
+            if used + cost > self.budget_tokens:
+                dropped += 1
+                continue
+            used += cost
+            descriptions_dropped += title_only
+            chosen.append(story)
+
+        stats = {
+            "input_tokens": used,
+            "budget_tokens": self.budget_tokens,
+            "stories_included": len(chosen),
+            "stories_dropped": dropped,
+            "descriptions_trimmed": trimmed,
+            "descriptions_dropped": descriptions_dropped,
+        }
+        logger.info(
+            f"Prompt stories: {len(chosen)} in {used}/{self.budget_tokens} tokens"
+            f" ({dropped} dropped, {trimmed} descriptions trimmed)"
+        )
+        return chosen, stats
@@ -2,7 +2,12 @@
 
 import logging
 import sys
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
@@ -11,52 +16,231 @@ import pytz
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.router import Router
+from config.settings import settings
+from services.agent_pool import POOL_SCHEDULED, AgentBusyError
+from services.jobs import DigestJob, load_digest_jobs, parse_time_of_day
+from services.leader import LeaderElector
 
 logger = logging.getLogger(__name__)
 
 
 class NewsScheduler:
-    """Scheduler for automatic NewsBot execution."""
+    """
+    Scheduler for automatic NewsBot execution.
 
-    def __init__(self, router: Router):
+    Runs the digest jobs from the job registry (NEWSBOT_JOBS) on a shared,
+    bounded thread pool. Each job has an optional prepare step ahead of its
+    delivery time; jobs for the same category share one prepared digest.
+    """
+
+    def __init__(self, router: Router, elector: Optional[LeaderElector] = None, jobs: Optional[List[DigestJob]] = None):
         """
         Initialize scheduler.
 
         Args:
             router: Router instance with NewsBot
+            elector: Leader elector; when set, jobs only run in the leader worker
+            jobs: Digest jobs to schedule (defaults to the registry in settings)
         """
         self.router = router
-        self.scheduler = BackgroundScheduler(timezone=pytz.timezone('Asia/Hong_Kong'))
-        self._setup_job()
+        self.elector = elector
+        self.jobs = {job.id: job for job in (jobs if jobs is not None else load_digest_jobs())}
+        self.timezone = pytz.timezone(settings.scheduler_timezone)
+        self.scheduler = BackgroundScheduler(
+            timezone=self.timezone,
+            executors={"default": ThreadPoolExecutor(max_workers=settings.scheduler_max_workers)},
+            job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 300},
+        )
+
+        # Prepared digests by category, shared between jobs
+        self._digests: Dict[Optional[str], Dict] = {}
+        self._inflight: Dict[Optional[str], threading.Event] = {}
+        self._digests_lock = threading.Lock()
+
+        self._setup_jobs()
         logger.info("Initialized NewsScheduler")
 
-    def _setup_job(self):
-        """Set up the daily NewsBot job at 7:30 AM HKT."""
-        # Schedule NewsBot to run daily at 7:30 AM Hong Kong time
-        self.scheduler.add_job(
-            func=self._run_newsbot,
-            trigger=CronTrigger(hour=7, minute=30, timezone=pytz.timezone('Asia/Hong_Kong')),
-            id='daily_newsbot',
-            name='Daily NewsBot at 7:30 AM HKT',
-            replace_existing=True
+    def _setup_jobs(self):
+        """
+        Register a deliver job per digest job, plus a prepare job if it has a prepare time.
+
+        Triggers that do LLM work (prepare, or deliver without a prepare
+        step) get SCHEDULER_JITTER_SECONDS of jitter so jobs sharing a start
+        time don't hit the providers at once.
+        """
+        jitter = settings.scheduler_jitter_seconds or None
+        for job in self.jobs.values():
+            timezone = pytz.timezone(job.tz)
+            deliver_hour, deliver_minute = parse_time_of_day(job.deliver_time)
+            self.scheduler.add_job(
+                func=self._run_newsbot,
+                args=[job.id],
+                trigger=CronTrigger(
+                    hour=deliver_hour,
+                    minute=deliver_minute,
+                    timezone=timezone,
+                    jitter=None if job.prepare_time else jitter,
+                ),
+                id=job.id,
+                name=f"NewsBot '{job.id}' delivery at {job.deliver_time}",
+                replace_existing=True
+            )
+
+            if job.prepare_time:
+                prepare_hour, prepare_minute = parse_time_of_day(job.prepare_time)
+                self.scheduler.add_job(
+                    func=self._prepare_newsbot,
+                    args=[job.id],
+                    trigger=CronTrigger(hour=prepare_hour, minute=prepare_minute, timezone=timezone, jitter=jitter),
+                    id=f"{job.id}:prepare",
+                    name=f"NewsBot '{job.id}' preparation at {job.prepare_time}",
+                    replace_existing=True
+                )
+            logger.info(
+                f"Scheduled NewsBot '{job.id}' (category: {job.category or 'general'}): "
+                f"prepare at {job.prepare_time or 'delivery time'}, deliver at {job.deliver_time} {job.tz}"
+            )
+
+    def _is_leader(self) -> bool:
+        """True if this worker should run scheduled jobs."""
+        if self.elector and not self.elector.is_leader:
+            logger.info(f"Skipping scheduled NewsBot job: {self.elector.worker_id} is not the leader")
+            return False
+        return True
+
+    def _fresh_digest(self, category: Optional[str]) -> Optional[Dict]:
+        """Return the shared digest for a category if it is recent and not degraded."""
+        digest = self._digests.get(category)
+        if not digest or digest["degraded"]:
+            return None
+        age = (datetime.now() - datetime.fromisoformat(digest["prepared_at"])).total_seconds()
+        if age > settings.newsbot_digest_max_age_seconds:
+            return None
+        return digest
+
+    def _get_digest(self, category: Optional[str], reuse: bool = True) -> Dict:
+        """
+        Get a prepared digest for a category, preparing it at most once at a time.
+
+        Concurrent callers for the same category wait for the one in-flight
+        prepare instead of starting their own.
+
+        Args:
+            category: News category
+            reuse: Return a recent shared digest instead of preparing a new one
+
+        Returns:
+            Result of `NewsBot.prepare`
+        """
+        with self._digests_lock:
+            digest = self._fresh_digest(category) if reuse else None
+            if digest:
+                return digest
+            inflight = self._inflight.get(category)
+            if inflight is None:
+                inflight = self._inflight[category] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            logger.info(f"Waiting for in-flight NewsBot preparation (category: {category or 'general'})")
+            inflight.wait(settings.newsbot_prepare_wait_seconds)
+            with self._digests_lock:
+                digest = self._fresh_digest(category)
+            if digest:
+                return digest
+            # The in-flight prepare failed or timed out; prepare our own copy
+            return self._prepare(category)
+
+        try:
+            digest = self._prepare(category)
+            with self._digests_lock:
+                self._digests[category] = digest
+            return digest
+        finally:
+            with self._digests_lock:
+                self._inflight.pop(category, None)
+            inflight.set()
+
+    def _prepare(self, category: Optional[str]) -> Dict:
+        """
+        Run `NewsBot.prepare` on the scheduled-jobs pool, behind interactive requests.
+
+        A full pool is waited out (retrying after its Retry-After hint) for up
+        to NEWSBOT_PREPARE_WAIT_SECONDS rather than skipping the delivery.
+
+        Raises:
+            AgentBusyError: If the pool stayed full for the whole wait
+        """
+        give_up_at = time.monotonic() + settings.newsbot_prepare_wait_seconds
+        while True:
+            try:
+                return self.router.agents.run(POOL_SCHEDULED, self.router.newsbot.prepare, category=category)
+            except AgentBusyError as e:
+                wait = min(e.retry_after, give_up_at - time.monotonic())
+                if wait <= 0:
+                    raise
+                logger.warning(f"Scheduled pool busy, retrying NewsBot preparation in {wait:.0f}s")
+                time.sleep(wait)
+
+    def _prepare_newsbot(self, job_id: str):
+        """Fetch and summarize a job's digest ahead of delivery (called by scheduler)."""
+        if not self._is_leader():
+            return
+        job = self.jobs[job_id]
+        try:
+            logger.info(f"Scheduled NewsBot preparation triggered for '{job_id}'")
+            prepared = self._get_digest(job.category)
+            logger.info(
+                f"Staged NewsBot digest for '{job_id}' with {prepared['headlines_count']} headlines"
+                f"{' (degraded)' if prepared['degraded'] else ''}"
+            )
+        except Exception as e:
+            logger.error(f"Error preparing scheduled NewsBot digest for '{job_id}': {e}", exc_info=True)
+
+    def _deliver(self, job: DigestJob, prepared: Dict) -> bool:
+        """Post a prepared digest to each of a job's channels."""
+        if not job.webhook_url and not job.chat_ids:
+            return self.router.newsbot.deliver(prepared, scheduled=True)
+
+        results = self.router.newsbot.broadcast(
+            prepared,
+            chat_ids=job.chat_ids,
+            webhook_urls=[job.webhook_url] if job.webhook_url else [],
+            scheduled=True,
         )
-        logger.info("Scheduled NewsBot to run daily at 7:30 AM HKT")
+        for result in results:
+            if not result["success"]:
+                logger.error(f"Failed to deliver NewsBot digest '{job.id}' to {result['type']}")
+        return all(result["success"] for result in results)
 
-    def _run_newsbot(self):
-        """Execute NewsBot (called by scheduler)."""
+    def _run_newsbot(self, job_id: str = "daily_newsbot"):
+        """Deliver a job's prepared digest, preparing it inline if needed (called by scheduler)."""
         try:
-            logger.info("Scheduled NewsBot run triggered")
-            result = self.router.handle_news_request()
-            if result.get("success"):
-                logger.info(f"Scheduled NewsBot completed successfully. Headlines: {result.get('headlines_count')}")
+            if not self._is_leader():
+                return
+            job = self.jobs[job_id]
+            logger.info(f"Scheduled NewsBot delivery triggered for '{job_id}'")
+
+            prepared = self._get_digest(job.category)
+            if prepared["degraded"]:
+                # Give the LLM one more chance before posting the plain headline list
+                logger.warning(f"Shared digest for '{job_id}' is degraded, preparing again")
+                prepared = self._get_digest(job.category, reuse=False)
+
+            if self._deliver(job, prepared):
+                logger.info(f"Scheduled NewsBot '{job_id}' completed successfully. Headlines: {prepared['headlines_count']}")
             else:
-                logger.error(f"Scheduled NewsBot failed: {result.get('error')}")
+                logger.error(f"Scheduled NewsBot '{job_id}' failed to deliver")
         except Exception as e:
-            logger.error(f"Error in scheduled NewsBot run: {e}", exc_info=True)
+            logger.error(f"Error in scheduled NewsBot run '{job_id}': {e}", exc_info=True)
 
     def start(self):
         """Start the scheduler."""
         if not self.scheduler.running:
+            if self.elector:
+                self.elector.start()
             self.scheduler.start()
             logger.info("NewsScheduler started")
         else:
@@ -66,13 +250,32 @@ class NewsScheduler:
         """Stop the scheduler."""
         if self.scheduler.running:
             self.scheduler.shutdown()
+            if self.elector:
+                self.elector.stop()
             logger.info("NewsScheduler stopped")
         else:
             logger.warning("Scheduler is not running")
 
     def get_next_run_time(self):
-        """Get the next scheduled run time."""
-        job = self.scheduler.get_job('daily_newsbot')
-        if job:
-            return job.next_run_time
-        return None
+        """Get the earliest next delivery time across all jobs."""
+        run_times = [
+            job.next_run_time for job in self.scheduler.get_jobs()
+            if job.id in self.jobs and job.next_run_time
+        ]
+        return min(run_times) if run_times else None
+
+    def get_jobs_status(self) -> List[Dict]:
+        """Per-job schedule for status endpoints."""
+        status = []
+        for job in self.jobs.values():
+            scheduled = self.scheduler.get_job(job.id)
+            next_run = scheduled.next_run_time if scheduled else None
+            status.append({
+                "id": job.id,
+                "category": job.category,
+                "prepare_time": job.prepare_time,
+                "deliver_time": job.deliver_time,
+                "timezone": job.tz,
+                "next_run_time": next_run.isoformat() if next_run else None,
+            })
+        return status
@@ -0,0 +1,27 @@
+"""SQLite connection helper for the local state stores."""
+
+import os
+import sqlite3
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database shared between threads and worker processes.
+
+    Uses WAL mode so readers don't block the writer, and a busy timeout so
+    concurrent workers wait for locks instead of failing.
+
+    Args:
+        path: Database file path (parent directories are created)
+
+    Returns:
+        Connection usable from any thread (callers serialize access)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
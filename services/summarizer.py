@@ -0,0 +1,188 @@
+"""Map-reduce news summarization: summarize category groups concurrently, then assemble."""
+
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import settings
+from services.llm_client import LLMClient
+from services.metrics import record_fallback
+from services.prompt_builder import story_line, story_sources
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "You are a professional news summarizer. Provide factual, neutral summaries."
+
+# Section titles for provider category names; others are title-cased
+_SECTION_TITLES = {
+    "top": "Top Stories",
+    "world": "World News",
+    "business": "Business",
+    "technology": "Technology",
+    "politics": "Politics",
+    "science": "Science",
+    "health": "Health",
+    "sports": "Sports",
+    "entertainment": "Entertainment",
+}
+
+
+def section_title(category: Optional[str]) -> str:
+    """Markdown section title for a category."""
+    category = (category or "top").lower()
+    return _SECTION_TITLES.get(category, category.replace("_", " ").title())
+
+
+class MapReduceSummarizer:
+    """
+    Summarizes many headlines with several short LLM calls instead of one long one.
+
+    Map: articles are grouped by category (large groups are split) and each
+    group is summarized concurrently with a short output, so wall-clock time
+    is bounded by the slowest group rather than the total output length.
+    Reduce: the group summaries are assembled into the digest by template,
+    with the headline list and source links built from the article data;
+    optionally one more short call writes the Top Headlines bullets.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        group_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        merge: Optional[str] = None,
+    ):
+        """
+        Initialize summarizer.
+
+        Args:
+            llm_client: LLM client instance
+            group_size: Max articles per map call (defaults to settings)
+            max_workers: Max concurrent map calls (defaults to settings)
+            merge: 'template' or 'llm' for the Top Headlines section (defaults to settings)
+        """
+        self.llm_client = llm_client
+        self.group_size = group_size or settings.newsbot_map_group_size
+        self.max_workers = max_workers or settings.newsbot_map_workers
+        self.merge = merge or settings.newsbot_summary_merge
+        if self.merge not in ("template", "llm"):
+            raise ValueError(f"Unsupported summary merge mode: {self.merge}")
+
+    def group(self, headlines: List[Dict]) -> List[Tuple[str, List[Dict]]]:
+        """
+        Group headlines by category, splitting groups larger than group_size.
+
+        Returns:
+            (section title, articles) pairs, in order of first appearance
+        """
+        by_category: Dict[str, List[Dict]] = {}
+        for headline in headlines:
+            by_category.setdefault(section_title(headline.get("category")), []).append(headline)
+
+        groups = []
+        for title, articles in by_category.items():
+            for start in range(0, len(articles), self.group_size):
+                groups.append((title, articles[start:start + self.group_size]))
+        return groups
+
+    def _map(self, title: str, articles: List[Dict]) -> str:
+        """Summarize one group of articles into markdown bullets."""
+        stories = "\n".join(story_line(a) for a in articles)
+        prompt = f"""Summarize each of the following {title} news stories in 2-4 factual, neutral sentences.
+
+Stories:
+{stories}
+
+Output one markdown bullet per story, starting with the headline in bold. Do not add a heading, introduction or sources list."""
+        return self.llm_client.generate(
+            prompt=prompt,
+            temperature=0.3,
+            max_tokens=settings.newsbot_map_max_tokens,
+            system_prompt=SYSTEM_PROMPT,
+        ).strip()
+
+    def _top_headlines(self, headlines: List[Dict], sections: List[Tuple[str, str]]) -> str:
+        """Top Headlines bullets: the lead stories by template, or picked by a short LLM call."""
+        template = "\n".join(f"- {h['title']} ({story_sources(h)})" for h in headlines[:10])
+        if self.merge != "llm":
+            return template
+        digest = "\n\n".join(f"{title}:\n{body}" for title, body in sections)
+        prompt = f"""From these news summaries, write the 5-10 most important headlines as markdown bullets, one line each.
+
+{digest}
+
+Output only the bullets."""
+        try:
+            return self.llm_client.generate(
+                prompt=prompt,
+                temperature=0.3,
+                max_tokens=settings.newsbot_map_max_tokens,
+                system_prompt=SYSTEM_PROMPT,
+            ).strip()
+        except Exception as e:
+            logger.warning(f"Top headlines merge call failed, using template: {e}")
+            record_fallback("news_summary_merge")
+            return template
+
+    def summarize(self, headlines: List[Dict]) -> str:
+        """
+        Summarize headlines into the daily digest markdown.
+
+        Args:
+            headlines: Article dicts with 'title', 'source', 'url' and optional
+                'category', 'description' and 'sources' keys
+
+        Returns:
+            Markdown summary
+
+        Raises:
+            Exception: If every group failed to summarize
+        """
+        groups = self.group(headlines)
+        workers = max(1, min(len(groups), self.max_workers))
+        logger.info(f"Summarizing {len(headlines)} headlines in {len(groups)} groups")
+
+        # Run each map call in a copy of the caller's context so request traces see the spans
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="newsbot-map") as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._map, title, articles)
+                for title, articles in groups
+            ]
+
+        sections: List[Tuple[str, str]] = []
+        failures = 0
+        last_error: Optional[Exception] = None
+        for (title, articles), future in zip(groups, futures):
+            try:
+                body = future.result()
+            except Exception as e:
+                logger.error(f"Summary for group '{title}' failed: {e}")
+                record_fallback("news_summary_group")
+                failures += 1
+                last_error = e
+                body = "\n".join(f"- {a['title']} ({story_sources(a)})" for a in articles)
+            sections.append((title, body))
+        if failures == len(groups) and last_error is not None:
+            raise last_error
+
+        # Split groups of one category come back as one section
+        merged: Dict[str, List[str]] = {}
+        for title, body in sections:
+            merged.setdefault(title, []).append(body)
+        sections = [(title, "\n".join(bodies)) for title, bodies in merged.items()]
+
+        date_str = datetime.now().strftime('%Y-%m-%d')
+        parts = [f"# Daily News Summary - {date_str}", "## Top Headlines", self._top_headlines(headlines, sections)]
+        for title, body in sections:
+            parts.extend([f"## {title}", body])
+        parts.append("## Sources")
+        parts.append("\n".join(f"- [{h['title']}]({h['url']}) - {story_sources(h)}" for h in headlines))
+        return "\n\n".join(parts) + "\n"
@@ -0,0 +1,22 @@
+"""Token counting with tiktoken."""
+
+from functools import lru_cache
+
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=4)
+def get_encoding(encoding_name: str = DEFAULT_ENCODING):
+    """
+    Load a tiktoken encoding once per process.
+
+    Loading parses the BPE ranks (and downloads them on first use), so
+    callers share the cached instance.
+    """
+    import tiktoken
+    return tiktoken.get_encoding(encoding_name)
+
+
+def count_tokens(text: str, encoding_name: str = DEFAULT_ENCODING) -> int:
+    """Count tokens in text."""
+    return len(get_encoding(encoding_name).encode(text))
@@ -0,0 +1,160 @@
+"""Opt-in per-request stage timing and profiling."""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Number of functions included in a captured profile
+PROFILE_TOP_N = 40
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """Collects spans recorded while a request is being served."""
+
+    def __init__(self, profile: bool = False):
+        """
+        Initialize trace.
+
+        Args:
+            profile: Capture a cProfile profile of the traced block
+        """
+        self.started_at = time.perf_counter()
+        self.spans: List[Dict] = []
+        self.profile_text: Optional[str] = None
+        self._profiler = cProfile.Profile() if profile else None
+        self._worker_profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, start: float, duration: float, error: bool = False) -> None:
+        """Record a finished span."""
+        span = {
+            "name": name,
+            "start_ms": round((start - self.started_at) * 1000, 2),
+            "duration_ms": round(duration * 1000, 2),
+        }
+        if error:
+            span["error"] = True
+        with self._lock:
+            self.spans.append(span)
+
+    def timings(self) -> Dict:
+        """
+        Build the timing breakdown returned to the caller.
+
+        Returns:
+            Dict with 'total_ms', per-stage 'stages' totals and raw 'spans'
+        """
+        stages: Dict[str, float] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stages[span["name"]] = round(stages.get(span["name"], 0.0) + span["duration_ms"], 2)
+        return {
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 2),
+            "stages": stages,
+            "spans": spans,
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace active in this context, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the wrapped block as a span of the active trace.
+
+    Does nothing when no trace is active, so it is safe on hot paths.
+
+    Args:
+        name: Span name (e.g. 'llm.generate')
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        trace.add_span(name, start, time.perf_counter() - start, error=error)
+
+
+def traced(name: str) -> Callable:
+    """Decorator that records each call of the wrapped function as a span."""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def worker_profile() -> Iterator[None]:
+    """
+    Profile the wrapped block into the active trace, if it is profiling.
+
+    For work handed off to another thread: cProfile only sees the thread
+    that enabled it, so the block gets its own profiler, merged into the
+    trace's profile when the request finishes.
+    """
+    trace = _current_trace.get()
+    if trace is None or trace._profiler is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with trace._lock:
+            trace._worker_profilers.append(profiler)
+
+
+@contextmanager
+def request_trace(profile: bool = False) -> Iterator[Trace]:
+    """
+    Activate a trace for the current request.
+
+    Args:
+        profile: Also run cProfile over the block; the formatted stats are
+            stored in `Trace.profile_text` on exit
+
+    Yields:
+        The active Trace
+    """
+    trace = Trace(profile=profile)
+    token = _current_trace.set(trace)
+    if trace._profiler:
+        trace._profiler.enable()
+    try:
+        yield trace
+    finally:
+        if trace._profiler:
+            trace._profiler.disable()
+            output = io.StringIO()
+            stats = pstats.Stats(trace._profiler, stream=output)
+            for profiler in trace._worker_profilers:
+                stats.add(profiler)
+            stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+            trace.profile_text = output.getvalue()
+        _current_trace.reset(token)
@@ -2,8 +2,6 @@
 
 import logging
 from typing import List, Dict, Optional
-import chromadb
-from chromadb.config import Settings as ChromaSettings
 
 import sys
 from pathlib import Path
@@ -13,6 +11,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
 from services.embeddings import EmbeddingService
+from services.metrics import VECTOR_QUERY_SECONDS, track
+from services.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +20,21 @@ logger = logging.getLogger(__name__)
 class VectorStore:
     """ChromaDB-based vector store for document storage and retrieval."""
 
-    def __init__(self, collection_name: str = "compliance_docs"):
+    def __init__(self, collection_name: str = "compliance_docs", embedding_service: Optional[EmbeddingService] = None):
         """
         Initialize vector store.
 
         Args:
             collection_name: Name of the ChromaDB collection
+            embedding_service: Shared embedding service (will create one if not provided)
         """
         self.collection_name = collection_name
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = embedding_service or EmbeddingService()
         
-        # Initialize ChromaDB client with persistent storage
+        # Initialize ChromaDB client with persistent storage (imported lazily, it is slow to import)
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+
         self.client = chromadb.PersistentClient(
             path=settings.chroma_persist_dir,
             settings=ChromaSettings(anonymized_telemetry=False)
@@ -87,6 +91,7 @@ class VectorStore:
 
         logger.info(f"Added {len(documents)} documents to vector store")
 
+    @traced("vector_store.similarity_search")
     def similarity_search(self, query: str, top_k: int = 5) -> List[Dict]:
         """
         Search for similar documents.
@@ -103,13 +108,14 @@ class VectorStore:
             return []
 
         # Generate query embedding
-        query_embedding = self.embedding_service.generate_embeddings([query])[0]
+        query_embedding = self.embedding_service.embed_query(query)
 
         # Search
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k
-        )
+        with span("chroma.query"), track(VECTOR_QUERY_SECONDS, component="chroma", collection=self.collection_name):
+            results = self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=top_k
+            )
 
         # Format results
         formatted_results = []
@@ -125,6 +131,22 @@ class VectorStore:
         logger.info(f"Found {len(formatted_results)} results for query")
         return formatted_results
 
+    def warm_index(self) -> bool:
+        """
+        Load the collection's HNSW index into memory.
+
+        Chroma loads the index on the first query, so this runs one query
+        with a stored embedding (no embedding API call).
+
+        Returns:
+            True if a query was run, False if the collection is empty
+        """
+        sample = self.collection.get(limit=1, include=["embeddings"])
+        if not sample["embeddings"]:
+            return False
+        self.collection.query(query_embeddings=[sample["embeddings"][0]], n_results=1)
+        return True
+
     def get_collection_stats(self) -> Dict:
         """Get statistics about the collection."""
         count = self.collection.count()
@@ -0,0 +1,129 @@
+"""Tests for the bounded agent pools and their shared priority slots."""
+
+import threading
+import time
+
+import pytest
+
+from services import deadline
+from services.agent_pool import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    AgentBusyError,
+    AgentPool,
+    PrioritySlots,
+)
+
+
+def _wait_until(predicate, timeout=2.0):
+    give_up_at = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < give_up_at, "condition not met in time"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def pools():
+    created = []
+
+    def make(workers=1, max_queue=1, slots=None):
+        pool = AgentPool("test", workers, max_queue, PRIORITY_NORMAL, slots or PrioritySlots(workers))
+        created.append(pool)
+        return pool
+
+    yield make
+    for pool in created:
+        pool.shutdown()
+
+
+def test_slots_go_to_the_highest_priority_waiter():
+    slots = PrioritySlots(1)
+    assert slots.acquire(PRIORITY_NORMAL)
+    order = []
+
+    def take(priority, name):
+        slots.acquire(priority)
+        order.append(name)
+        slots.release()
+
+    waiters = [(PRIORITY_LOW, "low"), (PRIORITY_NORMAL, "normal-1"), (PRIORITY_HIGH, "high"), (PRIORITY_NORMAL, "normal-2")]
+    threads = []
+    for priority, name in waiters:
+        thread = threading.Thread(target=take, args=(priority, name))
+        thread.start()
+        threads.append(thread)
+        _wait_until(lambda: len(slots._waiters) == len(threads))
+
+    slots.release()
+    for thread in threads:
+        thread.join(timeout=2)
+    assert order == ["high", "normal-1", "normal-2", "low"]
+
+
+def test_slot_acquire_times_out_and_leaves_the_queue():
+    slots = PrioritySlots(1)
+    assert slots.acquire(PRIORITY_NORMAL)
+    assert not slots.acquire(PRIORITY_HIGH, timeout=0.05)
+    assert slots._waiters == []
+    slots.release()
+    assert slots.acquire(PRIORITY_LOW, timeout=0.05)
+
+
+def test_full_pool_rejects_with_retry_after(pools):
+    pool = pools(workers=1, max_queue=1)
+    release = threading.Event()
+    running = pool.submit(release.wait, 5)
+    queued = pool.submit(lambda: "queued")
+    _wait_until(lambda: pool.status()["running"] == 1)
+
+    with pytest.raises(AgentBusyError) as busy:
+        pool.submit(lambda: "rejected")
+    assert busy.value.pool == "test"
+    assert busy.value.retry_after == 1  # no run time measured yet
+
+    release.set()
+    assert running.result(timeout=2) is True
+    assert queued.result(timeout=2) == "queued"
+    assert pool.status() == {"workers": 1, "max_queue": 1, "priority": PRIORITY_NORMAL, "running": 0, "queued": 0}
+
+
+def test_retry_after_scales_with_queue_and_run_time(pools):
+    pool = pools(workers=2, max_queue=4)
+    pool._avg_seconds = 7.5
+    assert pool.retry_after() == 8
+
+    release = threading.Event()
+    futures = [pool.submit(release.wait, 5) for _ in range(6)]
+    _wait_until(lambda: pool.status()["running"] == 2)
+    # Four queued behind two workers: two rounds of waiting plus this run
+    assert pool.retry_after() == 23
+    pool._avg_seconds = 100.0
+    assert pool.retry_after() == 60
+
+    release.set()
+    for future in futures:
+        future.result(timeout=2)
+
+
+def test_run_past_deadline_cancels_a_queued_run(pools):
+    pool = pools(workers=1, max_queue=1)
+    release = threading.Event()
+    started = []
+    pool.submit(release.wait, 5)
+    _wait_until(lambda: pool.status()["running"] == 1)
+
+    with deadline.deadline(0.1):
+        with pytest.raises(AgentBusyError):
+            pool.run(started.append, "late")
+    release.set()
+    _wait_until(lambda: pool.status()["queued"] == 0 and pool.status()["running"] == 0)
+    assert started == []
+
+
+def test_runs_inherit_the_callers_deadline(pools):
+    pool = pools()
+    with deadline.deadline(30):
+        left = pool.run(deadline.remaining)
+    assert 0 < left <= 30
+    assert pool.run(deadline.remaining) is None
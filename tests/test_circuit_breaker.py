@@ -0,0 +1,73 @@
+"""Tests for the circuit breaker state machine."""
+
+from services import circuit_breaker as breaker_module
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test-open", failure_threshold=3, recovery_seconds=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.status() == {"state": OPEN, "consecutive_failures": 3, "retry_in_seconds": 10.0}
+
+
+def test_half_open_lets_one_trial_through_then_closes(clock):
+    breaker = CircuitBreaker("test-recover", failure_threshold=2, recovery_seconds=10)
+    _open(breaker)
+
+    clock.advance(9.9)
+    assert not breaker.allow()
+    clock.advance(0.1)
+    assert breaker.state == HALF_OPEN
+
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    assert breaker.status()["consecutive_failures"] == 0
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("test-reopen", failure_threshold=2, recovery_seconds=10)
+    _open(breaker)
+    clock.advance(10)
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.status()["retry_in_seconds"] == 10.0
+    clock.advance(10)
+    assert breaker.state == HALF_OPEN
+
+
+def test_released_trial_frees_the_slot(clock):
+    breaker = CircuitBreaker("test-release", failure_threshold=1, recovery_seconds=5)
+    _open(breaker)
+    clock.advance(5)
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_get_breaker_returns_the_shared_instance():
+    first = breaker_module.get_breaker("test-shared", failure_threshold=2)
+    assert breaker_module.get_breaker("test-shared") is first
+    assert "test-shared" in breaker_module.breaker_statuses()
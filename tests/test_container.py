@@ -0,0 +1,64 @@
+"""Tests for the component container's lazy builds."""
+
+import threading
+import time
+
+from app.container import Container
+from config.settings import settings
+from services.circuit_breaker import breaker_statuses
+
+
+def test_slow_build_does_not_block_other_components():
+    container = Container()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_factory():
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    builder = threading.Thread(target=lambda: container._get("slow", slow_factory))
+    builder.start()
+    started.wait(5)
+
+    start = time.perf_counter()
+    assert container._get("fast", lambda: "fast") == "fast"
+    assert time.perf_counter() - start < 1.0
+
+    release.set()
+    builder.join(5)
+    assert container._get("slow", lambda: "rebuilt") == "slow"
+
+
+def test_concurrent_callers_build_once():
+    container = Container()
+    builds = []
+
+    def factory():
+        builds.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(container._get("shared", factory))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(builds) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_breakers_are_registered_before_components_are_built(monkeypatch):
+    monkeypatch.setattr(settings, "llm_provider", "openai")
+    monkeypatch.setattr(settings, "llm_fallback_provider", "anthropic")
+    container = Container()
+
+    container.register_breakers()
+
+    statuses = breaker_statuses()
+    for name in ("llm:openai", "llm:anthropic", "news:newsapi", "news:newsdata", "embeddings"):
+        assert statuses[name]["state"] == "closed"
+    assert not container.is_built("llm_client")
@@ -0,0 +1,78 @@
+"""Tests for per-request deadlines."""
+
+import contextvars
+import threading
+
+import pytest
+
+from services import deadline
+from services.deadline import DeadlineExceeded
+
+
+def test_no_deadline_by_default(clock):
+    assert deadline.remaining() is None
+    assert deadline.timeout(10.0) == 10.0
+    deadline.check("fetch")
+
+
+def test_deadline_counts_down_and_resets(clock):
+    with deadline.deadline(5) as left:
+        assert left == 5
+        clock.advance(2)
+        assert deadline.remaining() == 3
+        assert deadline.timeout(10.0) == 3
+        assert deadline.timeout(1.0) == 1.0
+    assert deadline.remaining() is None
+
+
+def test_nested_deadlines_only_narrow(clock):
+    with deadline.deadline(10):
+        with deadline.deadline(30) as left:
+            assert left == 10
+        with deadline.deadline(4) as left:
+            assert left == 4
+        with deadline.deadline() as left:
+            assert left == 10
+        assert deadline.remaining() == 10
+
+
+def test_reserve_holds_back_time_for_later_stages(clock):
+    with deadline.deadline(10):
+        with deadline.deadline(reserve=3) as left:
+            assert left == 7
+        with deadline.deadline(5, reserve=3) as left:
+            assert left == 5
+        with deadline.deadline(2, reserve=3) as left:
+            assert left == 2
+    # Without an enclosing deadline there is nothing to reserve from
+    with deadline.deadline(reserve=3) as left:
+        assert left is None
+
+
+def test_check_raises_once_the_deadline_passes(clock):
+    with deadline.deadline(1):
+        deadline.check("fetch")
+        clock.advance(1)
+        with pytest.raises(DeadlineExceeded, match="before LLM call"):
+            deadline.check("LLM call")
+        assert isinstance(DeadlineExceeded(), TimeoutError)
+
+
+def test_timeout_floor_applies_after_the_deadline(clock):
+    with deadline.deadline(1):
+        clock.advance(3)
+        assert deadline.remaining() == -2
+        assert deadline.timeout(10.0) == 0
+        assert deadline.timeout(10.0, floor=2.0) == 2.0
+
+
+def test_deadline_follows_copied_context_into_threads(clock):
+    seen = []
+    with deadline.deadline(5):
+        context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(lambda: seen.append(deadline.remaining()),))
+    thread.start()
+    thread.join()
+
+    assert seen == [5]
+    assert deadline.remaining() is None
@@ -0,0 +1,117 @@
+"""Tests for near-duplicate headline clustering."""
+
+import pytest
+
+from services.dedup import cluster_articles, normalize_title
+
+# Wire rewrites of the same story from different outlets
+SAME_STORY = [
+    [
+        ("China's exports rise 8% in March", "Reuters"),
+        ("China exports rise 8% in March, beating forecasts", "SCMP"),
+        ("China's March exports rise 8%, topping expectations", "AP"),
+    ],
+    [
+        ("Fed holds interest rates steady, signals two cuts this year", "Reuters"),
+        ("Federal Reserve holds rates steady and signals two cuts in 2024", "BBC"),
+        ("Fed keeps interest rates unchanged, still sees two cuts this year", "AP"),
+    ],
+    [
+        ("Hong Kong raises typhoon signal No. 8 as Saola approaches", "HKFP"),
+        ("Hong Kong issues typhoon signal No. 8 as Super Typhoon Saola nears", "SCMP"),
+        ("Typhoon Saola: Hong Kong raises No. 8 signal", "RTHK"),
+    ],
+    [
+        ("Tesla recalls 2 million vehicles over Autopilot", "Reuters"),
+        ("Tesla recalls over 2 million vehicles to fix Autopilot", "CNN"),
+        ("Tesla to recall 2 million cars over Autopilot safety", "BBC"),
+    ],
+]
+
+# Different stories that share a subject, country or verb with the ones above
+DIFFERENT_STORIES = [
+    "China's imports fall 2% in March",
+    "Japan's exports rise for third month",
+    "Fed raises interest rates by a quarter point",
+    "Hong Kong stocks rise as tech shares rally",
+    "Tesla cuts prices in China again",
+    "Samsung recalls 1 million washing machines",
+    "China's factory activity expands in March",
+    "Oil prices rise 2% on supply worries",
+]
+
+
+def _article(title: str, source: str = "Reuters") -> dict:
+    return {"title": title, "source": source, "url": f"https://example.com/{abs(hash(title))}"}
+
+
+def test_normalize_title_drops_case_punctuation_possessives_and_stopwords():
+    assert normalize_title("China's Exports Rise 8% in March") == "china exports rise 8 march"
+
+
+@pytest.mark.parametrize("group", SAME_STORY, ids=lambda group: group[0][0])
+def test_rewrites_of_one_story_are_merged(group):
+    stories = cluster_articles([_article(title, source) for title, source in group])
+
+    assert len(stories) == 1
+    assert stories[0]["title"] == group[0][0]
+    assert stories[0]["sources"] == [source for _, source in group]
+
+
+def test_different_stories_are_kept_apart():
+    stories = cluster_articles([_article(title) for title in DIFFERENT_STORIES])
+
+    assert [story["title"] for story in stories] == DIFFERENT_STORIES
+
+
+def test_mixed_feed_collapses_to_one_story_each():
+    articles = [_article(title, source) for group in SAME_STORY for title, source in group]
+    articles += [_article(title) for title in DIFFERENT_STORIES]
+
+    stories = cluster_articles(articles)
+
+    assert len(stories) == len(SAME_STORY) + len(DIFFERENT_STORIES)
+    merged = {story["title"]: story["sources"] for story in stories if len(story["sources"]) > 1}
+    assert set(merged) == {group[0][0] for group in SAME_STORY}
+
+
+EXPORTS_LEDE = (
+    "China's exports grew 8% in March from a year earlier, customs data showed on Friday, "
+    "beating analysts' forecasts."
+)
+
+
+def test_rewritten_headlines_with_the_same_lede_are_merged():
+    articles = [
+        {**_article("Chinese shipments abroad beat forecasts", "Reuters"), "description": EXPORTS_LEDE},
+        {**_article("Beijing's trade surplus widens as global demand recovers", "SCMP"), "description": EXPORTS_LEDE},
+    ]
+
+    stories = cluster_articles(articles)
+
+    assert len(stories) == 1
+    assert stories[0]["sources"] == ["Reuters", "SCMP"]
+
+
+def test_templated_ledes_for_different_stories_are_kept_apart():
+    articles = [
+        {**_article("China's exports rise 8% in March"), "description": EXPORTS_LEDE},
+        {
+            **_article("China's imports fall 2% in March"),
+            "description": (
+                "China's imports fell 2% in March from a year earlier, customs data showed on Friday, "
+                "missing analysts' forecasts."
+            ),
+        },
+    ]
+
+    assert len(cluster_articles(articles)) == 2
+
+
+def test_short_boilerplate_descriptions_are_ignored():
+    articles = [
+        {**_article("Fed holds interest rates steady"), "description": "Click here to read more."},
+        {**_article("Tesla cuts prices in China again"), "description": "Click here to read more."},
+    ]
+
+    assert len(cluster_articles(articles)) == 2
@@ -0,0 +1,87 @@
+"""Tests for the digest history store."""
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from config.settings import settings
+from services.digest_history import DigestHistory, digest_date
+
+DAY_ONE = datetime(2026, 10, 18, 7, 30, tzinfo=timezone.utc).timestamp()
+DAY_TWO = datetime(2026, 10, 19, 7, 30, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture(autouse=True)
+def utc_day_one(monkeypatch, clock):
+    monkeypatch.setattr(settings, "scheduler_timezone", "UTC")
+    clock.now = DAY_ONE
+
+
+@pytest.fixture
+def history(tmp_path):
+    return DigestHistory(str(tmp_path / "state.db"))
+
+
+def _prepared(summary: str, degraded: bool = False) -> dict:
+    return {
+        "summary": summary,
+        "headlines": [{"title": "Fed holds rates", "url": "https://example.com/fed", "source": "Reuters"}],
+        "headlines_count": 1,
+        "degraded": degraded,
+        "prompt": {"input_tokens": 120},
+        "timings": {"fetch_seconds": 0.4, "summarize_seconds": 2.1},
+    }
+
+
+def test_digest_date_uses_scheduler_timezone(monkeypatch):
+    late_evening_utc = datetime(2026, 10, 18, 23, 0, tzinfo=timezone.utc).timestamp()
+    monkeypatch.setattr(settings, "scheduler_timezone", "UTC")
+    assert digest_date(late_evening_utc) == "2026-10-18"
+    monkeypatch.setattr(settings, "scheduler_timezone", "Asia/Hong_Kong")
+    assert digest_date(late_evening_utc) == "2026-10-19"
+
+
+def test_append_and_query_round_trip(clock, history):
+    digest_id = history.append(_prepared("first"), "general")
+    [digest] = history.query()
+
+    assert digest["id"] == digest_id
+    assert digest["category"] == "general"
+    assert digest["date"] == "2026-10-18"
+    assert digest["summary"] == "first"
+    assert digest["headlines"] == [{"title": "Fed holds rates", "url": "https://example.com/fed", "sources": ["Reuters"]}]
+    assert digest["timings"] == {"fetch_seconds": 0.4, "summarize_seconds": 2.1, "prompt_tokens": 120}
+    assert digest["degraded"] is False
+
+
+def test_query_filters_newest_first(clock, history):
+    history.append(_prepared("day one"), "general")
+    history.append(_prepared("business"), "business")
+    clock.now = DAY_TWO
+    history.append(_prepared("day two"), "general")
+
+    assert [d["summary"] for d in history.query()] == ["day two", "business", "day one"]
+    assert [d["summary"] for d in history.query(category="general")] == ["day two", "day one"]
+    assert [d["summary"] for d in history.query(on_date=date(2026, 10, 18))] == ["business", "day one"]
+    assert [d["summary"] for d in history.query(limit=1)] == ["day two"]
+    assert history.query(on_date=date(2026, 10, 17)) == []
+
+
+def test_latest_prefers_a_digest_that_is_not_degraded(clock, history):
+    history.append(_prepared("good"), "general")
+    clock.advance(60)
+    history.append(_prepared("fallback", degraded=True), "general")
+
+    assert history.latest(date(2026, 10, 18), "general")["summary"] == "good"
+    assert history.latest(date(2026, 10, 19), "general") is None
+
+
+def test_latest_falls_back_to_a_degraded_digest(clock, history):
+    history.append(_prepared("fallback", degraded=True), "general")
+    assert history.latest(date(2026, 10, 18), "general")["summary"] == "fallback"
+
+
+def test_history_persists_across_instances(clock, tmp_path):
+    db_path = str(tmp_path / "state.db")
+    DigestHistory(db_path).append(_prepared("kept"), "general")
+    assert DigestHistory(db_path).latest(date(2026, 10, 18), "general")["summary"] == "kept"
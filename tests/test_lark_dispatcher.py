@@ -0,0 +1,132 @@
+"""Tests for the outbound Lark dispatcher."""
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from config.settings import settings
+from services.lark_dispatcher import PRIORITY_HIGH, PRIORITY_LOW, LarkDeliveryError, LarkDispatcher
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "lark_retry_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "lark_retry_max_seconds", 0.02)
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = LarkDispatcher(workers=1, max_queue=10, app_rate=1000, chat_rate=1000, max_attempts=3)
+    yield dispatcher
+    dispatcher.stop()
+
+
+class FakeTransport:
+    """Returns (or raises) the scripted outcomes in order, recording when each attempt was made."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.attempts = []
+
+    def __call__(self) -> httpx.Response:
+        self.attempts.append(time.monotonic())
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _ok(message_id: str = "om_1") -> httpx.Response:
+    return httpx.Response(200, json={"code": 0, "data": {"message_id": message_id}})
+
+
+def test_rate_limited_message_waits_for_retry_after(dispatcher):
+    transport = FakeTransport(httpx.Response(429, headers={"Retry-After": "0.2"}, json={"code": 99991400}), _ok())
+
+    result = dispatcher.send(transport, chat_key="oc_1", timeout=5)
+
+    assert result["data"]["message_id"] == "om_1"
+    assert len(transport.attempts) == 2
+    assert transport.attempts[1] - transport.attempts[0] >= 0.19
+
+
+def test_lark_frequency_code_is_retried(dispatcher):
+    transport = FakeTransport(httpx.Response(200, json={"code": 11232, "msg": "frequency limited"}), _ok())
+
+    assert dispatcher.send(transport, chat_key="hook", timeout=5)["code"] == 0
+    assert len(transport.attempts) == 2
+
+
+def test_gives_up_after_max_attempts(dispatcher):
+    transport = FakeTransport(*[httpx.Response(503) for _ in range(3)])
+
+    with pytest.raises(LarkDeliveryError, match="after 3 attempts"):
+        dispatcher.send(transport, chat_key="oc_1", timeout=5)
+
+
+def test_client_error_is_not_retried(dispatcher):
+    transport = FakeTransport(httpx.Response(400, json={"code": 230001, "msg": "bad request"}))
+
+    with pytest.raises(LarkDeliveryError, match="rejected"):
+        dispatcher.send(transport, chat_key="oc_1", timeout=5)
+    assert len(transport.attempts) == 1
+
+
+def test_read_timeout_not_retried_unless_idempotent(dispatcher):
+    webhook = FakeTransport(httpx.ReadTimeout("timed out"), _ok())
+    with pytest.raises(LarkDeliveryError, match="duplicate"):
+        dispatcher.send(webhook, chat_key="hook", timeout=5)
+    assert len(webhook.attempts) == 1
+
+    bot = FakeTransport(httpx.ReadTimeout("timed out"), _ok())
+    assert dispatcher.send(bot, chat_key="oc_1", timeout=5, idempotent=True)["code"] == 0
+    assert len(bot.attempts) == 2
+
+
+def test_connect_error_is_retried_for_any_request(dispatcher):
+    transport = FakeTransport(httpx.ConnectError("refused"), _ok())
+
+    assert dispatcher.send(transport, chat_key="hook", timeout=5)["code"] == 0
+    assert len(transport.attempts) == 2
+
+
+def test_timed_out_message_is_not_retried_later(dispatcher):
+    transport = FakeTransport(httpx.Response(429, headers={"Retry-After": "0.3"}), _ok())
+
+    with pytest.raises(LarkDeliveryError, match="Timed out"):
+        dispatcher.send(transport, chat_key="oc_1", timeout=0.1)
+    time.sleep(0.5)
+
+    assert len(transport.attempts) == 1
+
+
+def test_full_queue_evicts_lower_priority_message():
+    dispatcher = LarkDispatcher(workers=1, max_queue=1, app_rate=1000, chat_rate=1000)
+    blocker = threading.Event()
+    try:
+        # Occupy the only worker so the next messages stay queued
+        dispatcher.submit(lambda: blocker.wait(5) and _ok(), chat_key="oc_0")
+        time.sleep(0.1)
+        low = dispatcher.submit(_ok, chat_key="oc_1", priority=PRIORITY_LOW)
+        high = dispatcher.submit(_ok, chat_key="oc_2", priority=PRIORITY_HIGH)
+        rejected = dispatcher.submit(_ok, chat_key="oc_3", priority=PRIORITY_LOW)
+
+        with pytest.raises(LarkDeliveryError, match="higher-priority"):
+            low.result(1)
+        with pytest.raises(LarkDeliveryError, match="full"):
+            rejected.result(1)
+        blocker.set()
+        assert high.result(5)["code"] == 0
+    finally:
+        blocker.set()
+        dispatcher.stop()
+
+
+def test_chat_buckets_are_bounded(dispatcher):
+    dispatcher.max_chat_buckets = 3
+    for i in range(10):
+        dispatcher.send(_ok, chat_key=f"oc_{i}", timeout=5)
+
+    assert list(dispatcher._chat_buckets) == ["oc_7", "oc_8", "oc_9"]
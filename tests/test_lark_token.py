@@ -0,0 +1,116 @@
+"""Tests for the Lark tenant token manager."""
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from services import lark_token as token_module
+from services.lark_token import TenantTokenManager
+
+
+class FakeLark:
+    """Token endpoint that issues numbered tokens."""
+
+    def __init__(self, expire=7200, delay=0.0, code=0):
+        self.expire = expire
+        self.delay = delay
+        self.code = code
+        self.fetches = 0
+        self._lock = threading.Lock()
+
+    def handler(self, request):
+        with self._lock:
+            self.fetches += 1
+            number = self.fetches
+        time.sleep(self.delay)
+        return httpx.Response(
+            200,
+            json={"code": self.code, "msg": "ok", "tenant_access_token": f"t-{number}", "expire": self.expire},
+        )
+
+
+@pytest.fixture
+def lark(monkeypatch):
+    lark = FakeLark()
+    client = httpx.Client(transport=httpx.MockTransport(lark.handler))
+    monkeypatch.setattr(token_module, "get_http_client", lambda: client)
+    yield lark
+    client.close()
+
+
+@pytest.fixture
+def managers():
+    created = []
+
+    def make(**kwargs):
+        kwargs.setdefault("refresh_margin", 300)
+        kwargs.setdefault("shared_cache", False)
+        manager = TenantTokenManager("app", "secret", **kwargs)
+        created.append(manager)
+        return manager
+
+    yield make
+    for manager in created:
+        manager.stop()
+
+
+def test_concurrent_callers_share_one_fetch(lark, managers):
+    lark.delay = 0.2
+    manager = managers()
+    tokens = []
+
+    def get():
+        tokens.append(manager.get_token())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert lark.fetches == 1
+    assert tokens == ["t-1"] * 8
+
+
+def test_cached_token_is_reused_until_the_refresh_margin(lark, managers, clock):
+    manager = managers()
+
+    assert manager.get_token() == "t-1"
+    assert manager.expires_at == clock.now + 7200
+
+    clock.advance(7200 - 301)
+    assert manager.refresh() == "t-1"
+    assert lark.fetches == 1
+
+    clock.advance(2)
+    assert manager.refresh() == "t-2"
+    assert manager.get_token() == "t-2"
+    assert lark.fetches == 2
+
+
+def test_forced_refresh_fetches(lark, managers):
+    manager = managers()
+    manager.get_token()
+    assert manager.refresh(force=True) == "t-2"
+
+
+def test_shared_cache_reuses_another_workers_token(lark, managers, tmp_path):
+    db_path = str(tmp_path / "state.db")
+    first = managers(shared_cache=True, db_path=db_path)
+    second = managers(shared_cache=True, db_path=db_path)
+
+    assert first.get_token() == "t-1"
+    assert second.get_token() == "t-1"
+    assert lark.fetches == 1
+
+
+def test_error_response_raises_and_next_call_retries(lark, managers):
+    lark.code = 99991663
+    manager = managers()
+    with pytest.raises(Exception, match="Failed to get access token"):
+        manager.get_token()
+
+    lark.code = 0
+    assert manager.get_token() == "t-2"
@@ -0,0 +1,61 @@
+"""Tests for SQLite lease-based leader election."""
+
+import pytest
+
+from services.leader import LeaderElector
+
+
+@pytest.fixture
+def workers(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    return [LeaderElector(db_path=db_path, lease_seconds=30, heartbeat_seconds=10) for _ in range(2)]
+
+
+def test_one_leader_at_a_time(clock, workers):
+    first, second = workers
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert first.is_leader and not second.is_leader
+    assert second.status()["leader"] == first.worker_id
+
+
+def test_renewal_keeps_leadership(clock, workers):
+    first, second = workers
+    first.try_acquire()
+    acquired_at = first.current_leader()["acquired_at"]
+
+    for _ in range(5):
+        clock.advance(20)
+        assert first.try_acquire()
+        assert not second.try_acquire()
+    assert first.current_leader()["acquired_at"] == acquired_at
+
+
+def test_expired_lease_hands_over(clock, workers):
+    first, second = workers
+    first.try_acquire()
+
+    clock.advance(29)
+    assert not second.try_acquire()
+    clock.advance(2)
+    assert not first.is_leader
+    assert first.current_leader() is None
+
+    assert second.try_acquire()
+    assert second.current_leader()["acquired_at"] == clock.now
+    # The old leader's late heartbeat doesn't take the lease back
+    assert not first.try_acquire()
+    assert not first.is_leader
+
+
+def test_release_hands_over_at_once(clock, workers):
+    first, second = workers
+    first.try_acquire()
+    first.release()
+    assert not first.is_leader
+    assert second.try_acquire()
+
+
+def test_heartbeat_must_be_shorter_than_lease(tmp_path):
+    with pytest.raises(ValueError):
+        LeaderElector(db_path=str(tmp_path / "state.db"), lease_seconds=10, heartbeat_seconds=10)
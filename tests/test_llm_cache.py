@@ -0,0 +1,83 @@
+"""Tests for the LLM response cache."""
+
+import sqlite3
+
+import pytest
+
+from services.llm_cache import LLMResponseCache, cache_key
+from services.llm_client import LLMClient
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "state.db")
+
+
+def test_key_covers_every_generation_argument():
+    base = ("openai", "gpt-4o-mini", "system", "prompt", 0.7, 500)
+    keys = {cache_key(*base)}
+    for index, value in enumerate(("anthropic", "gpt-4o", None, "prompt 2", 0.0, 600)):
+        args = list(base)
+        args[index] = value
+        keys.add(cache_key(*args))
+    assert len(keys) == 7
+    assert cache_key(*base) == cache_key(*base)
+
+
+def test_hit_miss_and_ttl(clock, db_path):
+    cache = LLMResponseCache(db_path=db_path, max_entries=10, ttl_seconds=60)
+    assert cache.get("k") is None
+
+    cache.put("k", "response")
+    assert cache.get("k") == "response"
+
+    clock.advance(30)
+    assert cache.get("k", ttl_seconds=10) is None
+    assert cache.get("k") == "response"
+    clock.advance(31)
+    assert cache.get("k") is None
+
+
+def test_store_is_shared_and_survives_restarts(clock, db_path):
+    LLMResponseCache(db_path=db_path, ttl_seconds=60).put("k", "response")
+    assert LLMResponseCache(db_path=db_path, ttl_seconds=60).get("k") == "response"
+
+
+def test_memory_lru_is_bounded_but_store_keeps_evicted_entries(clock, db_path):
+    cache = LLMResponseCache(db_path=db_path, max_entries=2, ttl_seconds=60)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+
+    assert list(cache._memory) == ["a", "c"]
+    assert cache.get("b") == "2"
+    assert len(cache._memory) == 2
+
+
+def test_prune_deletes_expired_entries(clock, db_path):
+    cache = LLMResponseCache(db_path=db_path, ttl_seconds=60)
+    cache.put("old", "1")
+    clock.advance(61)
+    cache.put("new", "2")
+
+    assert cache.prune() == 1
+    assert "old" not in cache._memory
+    assert LLMResponseCache(db_path=db_path, ttl_seconds=3600).get("old") is None
+    assert cache.get("new") == "2"
+
+
+class BrokenCache:
+    def get(self, key, ttl_seconds=None):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, key, response):
+        raise sqlite3.OperationalError("database or disk is full")
+
+
+def test_client_returns_the_response_when_the_cache_fails(monkeypatch):
+    client = LLMClient(provider="openai", api_key="test", cache=BrokenCache())
+    monkeypatch.setattr(client, "_generate", lambda *args: "answer")
+
+    assert client.generate("prompt") == "answer"
+    assert client.cached("prompt") is None
@@ -0,0 +1,123 @@
+"""Tests for hedged, failover LLM calls."""
+
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from config.settings import settings
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.llm_client import RollingLatency
+from services.llm_failover import FailoverLLMClient
+
+
+class FakeLLM:
+    """Provider client stand-in: answers after `delay`, or raises `error`."""
+
+    def __init__(self, provider, delay=0.0, error=None, cached=None):
+        self.provider = provider
+        self.model = f"{provider}-model"
+        self.delay = delay
+        self.error = error
+        self._cached = cached
+        self.calls = 0
+        self.latency = RollingLatency(window=10)
+        self.breaker = CircuitBreaker(f"test-llm:{provider}", failure_threshold=1, recovery_seconds=60)
+        self._gate = threading.Event()
+
+    def cached(self, prompt, temperature, max_tokens, system_prompt, cache_ttl=None):
+        return self._cached
+
+    def generate(self, prompt, use_cache=True, **kwargs):
+        self.calls += 1
+        self._gate.wait(self.delay)
+        if self.error:
+            raise self.error
+        return f"{self.provider}: {prompt}"
+
+    def finish(self):
+        self._gate.set()
+
+
+def _outcomes(outcome, provider):
+    return REGISTRY.get_sample_value("llm_hedges_total", {"outcome": outcome, "provider": provider}) or 0.0
+
+
+@pytest.fixture(autouse=True)
+def hedge_settings(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 1000)
+    monkeypatch.setattr(settings, "llm_hedge_default_delay_seconds", 0.05)
+
+
+@pytest.fixture
+def make_client():
+    created = []
+
+    def make(primary, secondary, hedge=True):
+        client = FailoverLLMClient(primary=primary, secondary=secondary, hedge=hedge, max_workers=4)
+        created.append((client, primary, secondary))
+        return client
+
+    yield make
+    for client, primary, secondary in created:
+        primary.finish()
+        secondary.finish()
+        client.close()
+
+
+def test_fast_primary_answers_alone(make_client):
+    primary, secondary = FakeLLM("openai"), FakeLLM("anthropic")
+    before = _outcomes("primary", "openai")
+    assert make_client(primary, secondary).generate("hi") == "openai: hi"
+    assert (primary.calls, secondary.calls) == (1, 0)
+    assert _outcomes("primary", "openai") == before + 1
+
+
+def test_primary_error_fails_over(make_client):
+    primary, secondary = FakeLLM("openai", error=RuntimeError("500")), FakeLLM("anthropic")
+    assert make_client(primary, secondary, hedge=False).generate("hi") == "anthropic: hi"
+    assert secondary.calls == 1
+
+
+def test_slow_primary_is_hedged(make_client):
+    primary, secondary = FakeLLM("openai", delay=5), FakeLLM("anthropic")
+    before = _outcomes("hedge_won", "anthropic")
+    assert make_client(primary, secondary).generate("hi") == "anthropic: hi"
+    assert (primary.calls, secondary.calls) == (1, 1)
+    assert _outcomes("hedge_won", "anthropic") == before + 1
+
+
+def test_hedge_delay_uses_the_primarys_p95(make_client, monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 5)
+    primary, secondary = FakeLLM("openai"), FakeLLM("anthropic")
+    client = make_client(primary, secondary)
+    assert client.hedge_delay(primary) == 0.05
+    for seconds in range(1, 11):
+        primary.latency.record(float(seconds))
+    assert client.hedge_delay(primary) == 10.0
+
+
+def test_open_circuit_skips_the_provider(make_client):
+    primary, secondary = FakeLLM("openai"), FakeLLM("anthropic")
+    primary.breaker.record_failure()
+    before = _outcomes("failover", "anthropic")
+    assert make_client(primary, secondary).generate("hi") == "anthropic: hi"
+    assert primary.calls == 0
+    assert _outcomes("failover", "anthropic") == before + 1
+
+    secondary.breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        make_client(primary, secondary).generate("hi")
+
+
+def test_both_providers_failing_raises_the_last_error(make_client):
+    primary = FakeLLM("openai", error=RuntimeError("primary down"))
+    secondary = FakeLLM("anthropic", error=RuntimeError("secondary down"))
+    with pytest.raises(RuntimeError, match="secondary down"):
+        make_client(primary, secondary, hedge=False).generate("hi")
+
+
+def test_cached_response_skips_both_providers(make_client):
+    primary, secondary = FakeLLM("openai"), FakeLLM("anthropic", cached="from cache")
+    assert make_client(primary, secondary).generate("hi") == "from cache"
+    assert (primary.calls, secondary.calls) == (0, 0)
@@ -0,0 +1,209 @@
+"""Tests for paginated news fetching."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from config.settings import settings
+from services import news_fetcher as fetcher_module
+from services.async_utils import run_sync
+from services.circuit_breaker import CircuitBreaker
+from services.news_fetcher import NewsFetcher
+
+
+class FakeNewsAPI:
+    """NewsAPI top-headlines endpoint serving `total` numbered articles."""
+
+    def __init__(self, total=50, delays=None):
+        self.total = total
+        self.delays = delays or {}
+        self.requested = []
+        self.cancelled = []
+
+    async def handler(self, request):
+        page = int(request.url.params["page"])
+        size = int(request.url.params["pageSize"])
+        self.requested.append(page)
+        try:
+            await asyncio.sleep(self.delays.get(page, 0.0))
+        except asyncio.CancelledError:
+            self.cancelled.append(page)
+            raise
+        start = (page - 1) * size
+        articles = [
+            {"title": f"Story {i}", "url": f"https://example.com/{i}", "source": {"name": "Reuters"}}
+            for i in range(start, min(start + size, self.total))
+        ]
+        return httpx.Response(200, json={"status": "ok", "totalResults": self.total, "articles": articles})
+
+
+class RecordingStore:
+    def __init__(self):
+        self.threads = []
+        self.urls = []
+
+    def record(self, articles, provider):
+        self.threads.append(threading.current_thread().name)
+        self.urls.extend(article["url"] for article in articles)
+
+
+@pytest.fixture
+def newsapi(monkeypatch):
+    monkeypatch.setattr(settings, "news_fetch_page_size", 10)
+    monkeypatch.setattr(settings, "news_fetch_max_pages", 5)
+    monkeypatch.setattr(settings, "news_fetch_concurrency", 4)
+    api = FakeNewsAPI()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    monkeypatch.setattr(fetcher_module, "get_async_http_client", lambda: client)
+    yield api
+    run_sync(client.aclose())
+
+
+def _fetcher(**kwargs) -> NewsFetcher:
+    fetcher = NewsFetcher(newsapi_key="key", **kwargs)
+    # Fresh breakers, so failures in one test don't open circuits for the next
+    fetcher.breakers = {provider: CircuitBreaker(f"test-news:{provider}") for provider in fetcher.breakers}
+    return fetcher
+
+
+def test_articles_are_recorded_off_the_io_loop(newsapi):
+    store = RecordingStore()
+
+    articles = _fetcher(article_store=store).fetch_from_newsapi(target=25)
+
+    assert len(articles) == 25
+    assert {article["url"] for article in articles} <= set(store.urls)
+    assert store.threads and "io-loop" not in store.threads
+
+
+class FakeNewsData:
+    """NewsData endpoint serving pages of 10 linked by a nextPage cursor."""
+
+    def __init__(self, pages=4, delays=None):
+        self.pages = pages
+        self.delays = delays or {}
+        self.requested = []
+        self.cancelled = []
+
+    async def handler(self, request):
+        page = int(request.url.params.get("page", "1"))
+        self.requested.append(page)
+        try:
+            await asyncio.sleep(self.delays.get(page, 0.0))
+        except asyncio.CancelledError:
+            self.cancelled.append(page)
+            raise
+        results = [
+            {"title": f"Item {page}-{i}", "link": f"https://example.com/{page}/{i}", "source_name": "SCMP"}
+            for i in range(10)
+        ]
+        next_page = str(page + 1) if page < self.pages else None
+        return httpx.Response(200, json={"status": "success", "results": results, "nextPage": next_page})
+
+
+def test_newsapi_stops_at_target_and_cancels_outstanding_pages(newsapi):
+    newsapi.delays = {3: 5.0}
+
+    articles = _fetcher().fetch_from_newsapi(target=15)
+
+    assert [article["title"] for article in articles] == [f"Story {i}" for i in range(15)]
+    # 15 articles at 10 a page need pages 1-2, plus one spare
+    assert sorted(newsapi.requested) == [1, 2, 3]
+    assert newsapi.cancelled == [3]
+
+
+def test_newsapi_page_count_is_capped(newsapi):
+    newsapi.total = 500
+
+    articles = _fetcher().fetch_from_newsapi(target=500)
+
+    assert len(articles) == 50
+    assert sorted(newsapi.requested) == [1, 2, 3, 4, 5]
+
+
+def test_newsapi_skips_a_failed_page(newsapi, monkeypatch):
+    handler = newsapi.handler
+
+    async def flaky(request):
+        if request.url.params["page"] == "2":
+            return httpx.Response(500)
+        return await handler(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(flaky))
+    monkeypatch.setattr(fetcher_module, "get_async_http_client", lambda: client)
+
+    articles = _fetcher().fetch_from_newsapi(target=30)
+
+    assert [article["title"] for article in articles] == [f"Story {i}" for i in [*range(10), *range(20, 40)]]
+    run_sync(client.aclose())
+
+
+def test_consumer_stopping_cancels_outstanding_pages(newsapi):
+    newsapi.delays = {3: 5.0, 4: 5.0}
+    fetcher = _fetcher()
+
+    async def first_from_page_two():
+        stream = fetcher.aiter_newsapi(target=40)
+        try:
+            async for article in stream:
+                if article["title"] == "Story 10":
+                    return article
+        finally:
+            await stream.aclose()
+
+    assert run_sync(first_from_page_two())["title"] == "Story 10"
+    assert sorted(newsapi.cancelled) == [3, 4]
+
+
+@pytest.fixture
+def newsdata(monkeypatch):
+    monkeypatch.setattr(settings, "news_fetch_max_pages", 3)
+    api = FakeNewsData(pages=10)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    monkeypatch.setattr(fetcher_module, "get_async_http_client", lambda: client)
+    yield api
+    run_sync(client.aclose())
+
+
+def _newsdata_fetcher() -> NewsFetcher:
+    fetcher = NewsFetcher(newsdata_key="key")
+    fetcher.breakers = {provider: CircuitBreaker(f"test-news:{provider}") for provider in fetcher.breakers}
+    return fetcher
+
+
+def test_newsdata_stops_following_the_cursor_at_target(newsdata):
+    newsdata.delays = {3: 5.0}
+
+    articles = _newsdata_fetcher().fetch_from_newsdata(target=20)
+
+    assert len(articles) == 20
+    # Page 3 was queued with page 2's articles, then cancelled before it was sent
+    assert newsdata.requested == [1, 2]
+
+
+def test_newsdata_page_count_is_capped(newsdata):
+    articles = _newsdata_fetcher().fetch_from_newsdata(target=100)
+
+    assert len(articles) == 30
+    assert newsdata.requested == [1, 2, 3]
+
+
+def test_newsdata_prefetches_while_the_consumer_works_and_cancels_on_stop(newsdata):
+    newsdata.delays = {3: 5.0}
+    fetcher = _newsdata_fetcher()
+
+    async def consume_page_two():
+        stream = fetcher.aiter_newsdata(target=100)
+        try:
+            async for article in stream:
+                await asyncio.sleep(0.001)  # work on each article lets the next page start
+                if article["title"] == "Item 2-9":
+                    return article
+        finally:
+            await stream.aclose()
+
+    assert run_sync(consume_page_two())["title"] == "Item 2-9"
+    assert newsdata.requested == [1, 2, 3]
+    assert newsdata.cancelled == [3]
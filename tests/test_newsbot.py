@@ -0,0 +1,90 @@
+"""Tests for NewsBot delivery and the "only new articles" mark."""
+
+import time
+
+import pytest
+
+from agents.newsbot import NewsBot
+from services import deadline
+from services.article_store import ArticleStore
+
+
+class FakeLarkClient:
+    def __init__(self, webhook_url="https://open.larksuite.com/open-apis/bot/v2/hook/default", ok=True):
+        self.webhook_url = webhook_url
+        self.ok = ok
+        self.sent = []
+
+    def send_markdown(self, text, title=None):
+        self.sent.append((text, title))
+        return self.ok
+
+
+def _prepared(category=None) -> dict:
+    return {
+        "summary": "s",
+        "headlines_count": 1,
+        "category": category,
+        "prepared_at": "2026-10-19T07:30:00",
+        "seen_until": time.time(),
+        "degraded": False,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArticleStore(str(tmp_path / "state.db"))
+
+
+@pytest.fixture
+def newsbot(store):
+    return NewsBot(llm_client=None, lark_client=FakeLarkClient(), news_fetcher=object(), article_store=store)
+
+
+def test_adhoc_delivery_does_not_advance_mark(newsbot, store):
+    assert newsbot.deliver(_prepared())
+    assert store.last_digest("general") == 0.0
+
+
+def test_scheduled_delivery_advances_mark(newsbot, store):
+    prepared = _prepared("business")
+    assert newsbot.deliver(prepared, scheduled=True)
+    assert store.last_digest("business") == pytest.approx(prepared["seen_until"])
+    assert store.last_digest("general") == 0.0
+
+
+def test_failed_scheduled_delivery_does_not_advance_mark(store):
+    newsbot = NewsBot(llm_client=None, lark_client=FakeLarkClient(ok=False), news_fetcher=object(), article_store=store)
+    assert not newsbot.deliver(_prepared(), scheduled=True)
+    assert store.last_digest("general") == 0.0
+
+
+def test_broadcast_marks_only_when_scheduled(newsbot, store, monkeypatch):
+    monkeypatch.setattr(newsbot, "_webhook_client", lambda url: FakeLarkClient(url))
+    urls = ["https://open.larksuite.com/open-apis/bot/v2/hook/other"]
+
+    results = newsbot.broadcast(_prepared(), webhook_urls=urls)
+    assert [result["success"] for result in results] == [True]
+    assert store.last_digest("general") == 0.0
+
+    prepared = _prepared()
+    newsbot.broadcast(prepared, webhook_urls=urls, scheduled=True)
+    assert store.last_digest("general") == pytest.approx(prepared["seen_until"])
+
+
+def test_broadcast_sends_run_under_the_callers_deadline(newsbot, monkeypatch):
+    seen = []
+
+    class DeadlineRecorder(FakeLarkClient):
+        def send_markdown(self, text, title=None):
+            seen.append(deadline.remaining())
+            return True
+
+    monkeypatch.setattr(newsbot, "_webhook_client", DeadlineRecorder)
+    urls = [f"https://open.larksuite.com/open-apis/bot/v2/hook/{i}" for i in range(3)]
+
+    with deadline.deadline(30):
+        newsbot.broadcast(_prepared(), webhook_urls=urls)
+
+    assert len(seen) == 3
+    assert all(remaining is not None and 0 < remaining <= 30 for remaining in seen)
@@ -0,0 +1,114 @@
+"""Tests for token-budgeted prompt story lists."""
+
+import pytest
+
+from services import prompt_builder as builder_module
+from services.prompt_builder import PromptBuilder, clean_text, story_line
+
+
+class WordEncoding:
+    """Tokenizer stand-in: one token per space-separated word."""
+
+    def encode(self, text):
+        return text.split(" ")
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    monkeypatch.setattr(builder_module, "get_encoding", WordEncoding)
+
+
+def _article(title, source="Reuters", description="", published_at=None):
+    return {"title": title, "source": source, "description": description, "published_at": published_at}
+
+
+def _builder(budget=1000, description_tokens=50):
+    return PromptBuilder(
+        budget_tokens=budget,
+        description_tokens=description_tokens,
+        source_priority=["Reuters", "BBC"],
+    )
+
+
+def test_clean_text_strips_markup_and_boilerplate():
+    assert clean_text("Fed &amp; ECB <b>hold</b>\n rates [+1234 chars]") == "Fed & ECB hold rates"
+    assert clean_text("Typhoon nears Hong Kong. Read more at example.com") == "Typhoon nears Hong Kong."
+    assert clean_text("Stocks rally...") == "Stocks rally"
+    assert clean_text(None) == ""
+
+
+def test_stories_are_ranked_by_source_then_recency():
+    articles = [
+        _article("Unranked", source="Blog", published_at="2026-10-19T09:00:00"),
+        _article("BBC older", source="BBC", published_at="2026-10-19T06:00:00"),
+        _article("Reuters", source="Reuters", published_at="2026-10-18T06:00:00"),
+        _article("BBC newer", source="BBC", published_at="2026-10-19T08:00:00"),
+        {**_article("Clustered", source="Blog", published_at="2026-10-19T07:00:00"), "sources": ["Blog", "BBC"]},
+    ]
+
+    stories, _ = _builder().fit(articles)
+
+    assert [story["title"] for story in stories] == ["Reuters", "BBC newer", "Clustered", "BBC older", "Unranked"]
+
+
+def test_long_descriptions_are_trimmed_at_a_word_boundary():
+    description = " ".join(f"word{i}" for i in range(20))
+
+    stories, stats = _builder(description_tokens=5).fit([_article("Story", description=description)])
+
+    # The last kept token may be part of a word, so the cut backs off to the previous space
+    assert stories[0]["description"] == "word0 word1 word2 word3…"
+    assert stats["descriptions_trimmed"] == 1
+
+
+def test_budget_drops_descriptions_before_stories():
+    description = " ".join(["detail"] * 10)
+    articles = [
+        _article("First story", description=description, published_at="2026-10-19T09:00:00"),
+        _article("Second story", description=description, published_at="2026-10-19T08:00:00"),
+        _article("Third story", description=description, published_at="2026-10-19T07:00:00"),
+    ]
+    # "- First story (Reuters): detail x10" is 14 words plus the newline
+    full = 15
+    title_only = 5
+
+    stories, stats = _builder(budget=full + title_only + 2).fit(articles)
+
+    assert [story["title"] for story in stories] == ["First story", "Second story"]
+    assert stories[0]["description"] == description
+    assert stories[1]["description"] == ""
+    assert stats == {
+        "input_tokens": full + title_only,
+        "budget_tokens": full + title_only + 2,
+        "stories_included": 2,
+        "stories_dropped": 1,
+        "descriptions_trimmed": 0,
+        "descriptions_dropped": 1,
+    }
+
+
+def test_smaller_later_stories_still_fill_the_budget():
+    articles = [
+        _article("A long headline that does not fit the remaining budget", published_at="2026-10-19T09:00:00"),
+        _article("Short one", published_at="2026-10-19T08:00:00"),
+    ]
+
+    stories, stats = _builder(budget=6).fit(articles)
+
+    assert [story["title"] for story in stories] == ["Short one"]
+    assert stats["stories_dropped"] == 1
+    assert stats["input_tokens"] == len(story_line(stories[0]).split(" ")) + 1
+
+
+def test_token_counts_are_estimated_without_an_encoding(monkeypatch):
+    def unavailable():
+        raise OSError("encoding download failed")
+
+    monkeypatch.setattr(builder_module, "get_encoding", unavailable)
+    builder = _builder()
+
+    assert builder.count_tokens("x" * 9) == 3
+    assert builder.trim("abcd efgh ijkl", 2) == ("abcd…", True)
@@ -0,0 +1,22 @@
+"""Tests for the request router's error responses."""
+
+from types import SimpleNamespace
+
+from app.main import NewsResponse
+from app.router import Router
+from services.deadline import DeadlineExceeded
+
+
+class FailingAgents:
+    def run(self, name, func, *args, **kwargs):
+        raise DeadlineExceeded("Deadline exceeded before news fetch")
+
+
+def test_failed_news_request_is_a_valid_response():
+    router = Router(container=SimpleNamespace(agent_pools=FailingAgents(), newsbot=SimpleNamespace(run=None)))
+
+    result = router.handle_news_request()
+
+    response = NewsResponse(**result)
+    assert response.success is False
+    assert "Deadline exceeded" in response.error
@@ -0,0 +1,143 @@
+"""Tests for the scheduler's shared digest preparation."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from config.settings import settings
+from services import scheduler as scheduler_module
+from services.agent_pool import AgentBusyError
+from services.jobs import DigestJob
+from services.scheduler import NewsScheduler
+
+
+def _digest(age_seconds: float = 0.0, degraded: bool = False) -> dict:
+    prepared_at = datetime.now() - timedelta(seconds=age_seconds)
+    return {"summary": "s", "headlines_count": 1, "degraded": degraded, "prepared_at": prepared_at.isoformat()}
+
+
+class FakeNewsBot:
+    def __init__(self, prepare):
+        self._prepare = prepare
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, category=None):
+        with self._lock:
+            self.calls += 1
+        return self._prepare(category)
+
+
+class FakeAgents:
+    """Runs inline; raises AgentBusyError for the first `busy` runs."""
+
+    def __init__(self, busy: int = 0, retry_after: int = 1):
+        self.busy = busy
+        self.retry_after = retry_after
+
+    def run(self, name, func, *args, **kwargs):
+        if self.busy:
+            self.busy -= 1
+            raise AgentBusyError(name, self.retry_after)
+        return func(*args, **kwargs)
+
+
+class FakeRouter:
+    def __init__(self, newsbot, agents=None):
+        self.newsbot = newsbot
+        self.agents = agents or FakeAgents()
+
+
+def _scheduler(router) -> NewsScheduler:
+    return NewsScheduler(router, jobs=[DigestJob(id="job", deliver_time="07:30")])
+
+
+def test_concurrent_callers_share_one_prepare():
+    release = threading.Event()
+
+    def prepare(category):
+        release.wait(5)
+        return _digest()
+
+    newsbot = FakeNewsBot(prepare)
+    scheduler = _scheduler(FakeRouter(newsbot))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(scheduler._get_digest(None))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert newsbot.calls == 1
+    assert len(results) == 4 and all(result is results[0] for result in results)
+
+
+def test_waiter_does_not_reuse_stale_digest_when_owner_fails(monkeypatch):
+    monkeypatch.setattr(settings, "newsbot_digest_max_age_seconds", 3600)
+    started = threading.Event()
+    release = threading.Event()
+    fresh = _digest()
+
+    def prepare(category):
+        if not started.is_set():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("provider down")
+        return fresh
+
+    scheduler = _scheduler(FakeRouter(FakeNewsBot(prepare)))
+    # Yesterday's digest is still cached
+    scheduler._digests[None] = _digest(age_seconds=86400)
+
+    owner_error = []
+
+    def owner():
+        try:
+            scheduler._get_digest(None, reuse=False)
+        except RuntimeError as e:
+            owner_error.append(e)
+
+    owner_thread = threading.Thread(target=owner)
+    owner_thread.start()
+    started.wait(5)
+    waiter_result = []
+    waiter = threading.Thread(target=lambda: waiter_result.append(scheduler._get_digest(None)))
+    waiter.start()
+    time.sleep(0.2)
+    release.set()
+    owner_thread.join(5)
+    waiter.join(5)
+
+    assert owner_error
+    assert waiter_result == [fresh]
+
+
+def test_waiter_skips_degraded_digest():
+    scheduler = _scheduler(FakeRouter(FakeNewsBot(lambda category: _digest())))
+    scheduler._digests[None] = _digest(degraded=True)
+
+    assert scheduler._fresh_digest(None) is None
+    assert scheduler._get_digest(None)["degraded"] is False
+
+
+def test_prepare_retries_while_pool_is_busy(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(scheduler_module.time, "sleep", sleeps.append)
+    newsbot = FakeNewsBot(lambda category: _digest())
+    scheduler = _scheduler(FakeRouter(newsbot, FakeAgents(busy=2, retry_after=3)))
+
+    assert scheduler._prepare(None)["summary"] == "s"
+    assert sleeps == [3, 3]
+    assert newsbot.calls == 1
+
+
+def test_prepare_gives_up_after_wait(monkeypatch):
+    monkeypatch.setattr(settings, "newsbot_prepare_wait_seconds", 0)
+    scheduler = _scheduler(FakeRouter(FakeNewsBot(lambda category: _digest()), FakeAgents(busy=1)))
+
+    with pytest.raises(AgentBusyError):
+        scheduler._prepare(None)
@@ -0,0 +1,100 @@
+"""Tests for map-reduce news summarization."""
+
+import threading
+
+import pytest
+
+from services.summarizer import MapReduceSummarizer, section_title
+
+
+class FakeLLM:
+    """Answers each map call with one bullet per story; fails prompts containing `fail_on`."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = fail_on
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, temperature=0.7, max_tokens=None, system_prompt=None):
+        with self._lock:
+            self.prompts.append(prompt)
+        if any(marker in prompt for marker in self.fail_on):
+            raise RuntimeError("provider error")
+        if prompt.startswith("From these news summaries"):
+            return "- merged headline"
+        titles = [line[2:].split(" (")[0] for line in prompt.splitlines() if line.startswith("- ")]
+        return "\n".join(f"- **{title}** summarized." for title in titles)
+
+
+def _article(title, category=None, source="Reuters"):
+    return {"title": title, "source": source, "url": f"https://example.com/{title}", "category": category}
+
+
+def test_section_titles():
+    assert section_title(None) == "Top Stories"
+    assert section_title("BUSINESS") == "Business"
+    assert section_title("climate_change") == "Climate Change"
+
+
+def test_groups_by_category_in_order_and_splits_large_groups():
+    summarizer = MapReduceSummarizer(FakeLLM(), group_size=2, max_workers=2, merge="template")
+    articles = [
+        _article("b1", "business"),
+        _article("t1"),
+        _article("b2", "business"),
+        _article("b3", "business"),
+        _article("t2", "top"),
+    ]
+
+    groups = summarizer.group(articles)
+
+    assert [(title, [a["title"] for a in group]) for title, group in groups] == [
+        ("Business", ["b1", "b2"]),
+        ("Business", ["b3"]),
+        ("Top Stories", ["t1", "t2"]),
+    ]
+
+
+def test_summary_has_one_section_per_category():
+    llm = FakeLLM()
+    summarizer = MapReduceSummarizer(llm, group_size=2, max_workers=3, merge="template")
+    articles = [_article("b1", "business"), _article("b2", "business"), _article("b3", "business"), _article("t1")]
+
+    summary = summarizer.summarize(articles)
+
+    assert len(llm.prompts) == 3
+    assert summary.count("## Business") == 1
+    assert "- **b1** summarized.\n- **b2** summarized.\n- **b3** summarized." in summary
+    assert "## Top Headlines\n\n- b1 (Reuters)" in summary
+    assert "- [t1](https://example.com/t1) - Reuters" in summary
+
+
+def test_failed_group_falls_back_to_its_headlines():
+    summarizer = MapReduceSummarizer(FakeLLM(fail_on=["b1"]), group_size=5, merge="template")
+    articles = [_article("b1", "business", source="BBC"), _article("t1")]
+
+    summary = summarizer.summarize(articles)
+
+    assert "## Business\n\n- b1 (BBC)\n" in summary
+    assert "- **t1** summarized." in summary
+
+
+def test_every_group_failing_raises():
+    summarizer = MapReduceSummarizer(FakeLLM(fail_on=["Stories:"]), merge="template")
+    with pytest.raises(RuntimeError, match="provider error"):
+        summarizer.summarize([_article("b1", "business"), _article("t1")])
+
+
+def test_llm_merge_falls_back_to_the_template():
+    articles = [_article("b1", "business"), _article("t1")]
+
+    merged = MapReduceSummarizer(FakeLLM(), merge="llm").summarize(articles)
+    assert "## Top Headlines\n\n- merged headline" in merged
+
+    fallback = MapReduceSummarizer(FakeLLM(fail_on=["From these news summaries"]), merge="llm").summarize(articles)
+    assert "## Top Headlines\n\n- b1 (Reuters)\n- t1 (Reuters)" in fallback
+
+
+def test_unknown_merge_mode_is_rejected():
+    with pytest.raises(ValueError):
+        MapReduceSummarizer(FakeLLM(), merge="fancy")